@@ -0,0 +1,81 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.database import DATABASE_URL, Base
+import app.models  # noqa: F401  (register all models on Base.metadata)
+
+config = context.config
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def is_db_only(obj, type_) -> bool:
+    """Reflected columns (and their indexes) a model lists in info["db_only_columns"]"""
+    table = target_metadata.tables.get(obj.table.name)
+    db_only = set(table.info.get("db_only_columns", ())) if table is not None else set()
+    if type_ == "column":
+        return obj.name in db_only
+    if type_ == "index":
+        return bool(db_only) and {column.name for column in obj.columns} <= db_only
+    return False
+
+
+def include_object_for(dialect_name: str):
+    """Skip indexes declared with Index.ddl_if(dialect=...) on other backends, and db-only columns"""
+    def include_object(obj, name, type_, reflected, compare_to):
+        if reflected and compare_to is None and type_ in ("column", "index") and is_db_only(obj, type_):
+            return False
+        ddl_if = getattr(obj, "_ddl_if", None)
+        if type_ == "index" and ddl_if is not None and ddl_if.dialect:
+            dialects = ddl_if.dialect if isinstance(ddl_if.dialect, (list, tuple)) else [ddl_if.dialect]
+            return dialect_name in dialects
+        return True
+    return include_object
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout without a live database connection"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=DATABASE_URL.startswith("sqlite"),
+        include_object=include_object_for(DATABASE_URL.split(":", 1)[0].split("+", 1)[0]),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the configured database"""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite cannot ALTER constraints in place
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object_for(connection.dialect.name),
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,83 @@
+"""show members json
+
+Convert shows.show_members from a JSON string in a Text column to a native
+JSON column (JSONB on Postgres, with a GIN index for containment queries).
+Rows that held invalid or non-list JSON become empty lists, matching what the
+API used to return for them.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 03:05:12.418906
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MEMBERS_JSON = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+
+def _decode(raw):
+    if raw is None or raw == '':
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return []
+    return [str(name) for name in value if name is not None] if isinstance(value, list) else []
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    old = sa.table('shows', sa.column('id', sa.Integer), sa.column('show_members', sa.Text))
+    rows = bind.execute(sa.select(old.c.id, old.c.show_members)).all()
+
+    with op.batch_alter_table('shows', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('show_members_json', MEMBERS_JSON, nullable=True))
+
+    new = sa.table('shows', sa.column('id', sa.Integer), sa.column('show_members_json', MEMBERS_JSON))
+    for show_id, raw in rows:
+        members = _decode(raw)
+        if members is not None:
+            bind.execute(new.update().where(new.c.id == show_id).values(show_members_json=members))
+
+    with op.batch_alter_table('shows', schema=None) as batch_op:
+        batch_op.drop_column('show_members')
+        batch_op.alter_column('show_members_json', new_column_name='show_members')
+
+    if bind.dialect.name == 'postgresql':
+        op.create_index(
+            'ix_shows_show_members', 'shows', ['show_members'],
+            postgresql_using='gin', postgresql_ops={'show_members': 'jsonb_path_ops'}
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_shows_show_members', table_name='shows')
+
+    current = sa.table('shows', sa.column('id', sa.Integer), sa.column('show_members', MEMBERS_JSON))
+    rows = bind.execute(sa.select(current.c.id, current.c.show_members)).all()
+
+    with op.batch_alter_table('shows', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('show_members_text', sa.Text(), nullable=True))
+
+    old = sa.table('shows', sa.column('id', sa.Integer), sa.column('show_members_text', sa.Text))
+    for show_id, members in rows:
+        if members is not None:
+            bind.execute(old.update().where(old.c.id == show_id).values(show_members_text=json.dumps(members)))
+
+    with op.batch_alter_table('shows', schema=None) as batch_op:
+        batch_op.drop_column('show_members')
+        batch_op.alter_column('show_members_text', new_column_name='show_members')
@@ -0,0 +1,56 @@
+"""song search
+
+Full-text song search on Postgres: a generated, weighted tsvector over title,
+lyrics, description and chord structure with a GIN index, plus a pg_trgm GIN
+index on title for fuzzy matches. Other backends search an in-memory index
+instead, so this revision is a no-op there.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 09:12:40.516203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Weights follow app.utils.search.SEARCH_FIELDS; 'simple' avoids English-only stemming of lyrics
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(lyrics, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(chord_structure, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('songs', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_DOCUMENT, persisted=True), nullable=True
+    ))
+    op.create_index('ix_songs_search_vector', 'songs', ['search_vector'], postgresql_using='gin')
+    op.create_index(
+        'ix_songs_title_trgm', 'songs', ['title'],
+        postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_songs_title_trgm', table_name='songs')
+    op.drop_index('ix_songs_search_vector', table_name='songs')
+    op.drop_column('songs', 'search_vector')
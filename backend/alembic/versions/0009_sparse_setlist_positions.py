@@ -0,0 +1,65 @@
+"""sparse setlist positions
+
+Renumbers setlist_songs.position from dense 0..n-1 (with the duplicates and
+holes removals used to leave) to 1024, 2048, ... per setlist, so inserts
+and moves can take a midpoint instead of shifting later rows.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 03:05:12.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSITION_GAP = 1024
+
+
+def _renumber(first: int, step: int) -> None:
+    """Set every row's position to first + step * (its rank within the setlist)"""
+    bind = op.get_bind()
+    setlist_songs = sa.table(
+        'setlist_songs', sa.column('id', sa.Integer), sa.column('setlist_id', sa.Integer),
+        sa.column('position', sa.Integer)
+    )
+    # Ranks are computed up front: SQLite evaluates a correlated UPDATE row by
+    # row against rows it has already rewritten
+    rows = bind.execute(
+        sa.select(setlist_songs.c.id, setlist_songs.c.setlist_id).order_by(
+            setlist_songs.c.setlist_id,
+            sa.func.coalesce(setlist_songs.c.position, 0),
+            setlist_songs.c.id
+        )
+    ).all()
+    
+    updates = []
+    rank, current_setlist = 0, None
+    for row_id, setlist_id in rows:
+        rank = rank + 1 if setlist_id == current_setlist else 0
+        current_setlist = setlist_id
+        updates.append({'row_id': row_id, 'new_position': first + step * rank})
+    
+    if updates:
+        bind.execute(
+            setlist_songs.update()
+            .where(setlist_songs.c.id == sa.bindparam('row_id'))
+            .values(position=sa.bindparam('new_position')),
+            updates
+        )
+
+
+def upgrade() -> None:
+    _renumber(POSITION_GAP, POSITION_GAP)
+
+
+def downgrade() -> None:
+    _renumber(0, 1)
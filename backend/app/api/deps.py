@@ -0,0 +1,103 @@
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.database import SessionRunner
+from app.services.band import BandService
+from app.utils.auth import decode_access_token
+from app.utils.cache import token_cache
+from app.utils.http_cache import make_etag, etag_matches, not_modified, REVALIDATE_CACHE_CONTROL
+from app.utils.response_cache import response_cache
+from app.utils.sql_metrics import set_query_budget
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Optional
+import time
+
+security = HTTPBearer()
+
+
+def get_token_claims(token: str) -> dict:
+    """Verify a JWT, reusing the claims of recently verified tokens until they expire"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    
+    payload = decode_access_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+    
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(token, payload, ttl=exp - time.time())
+    return payload
+
+
+async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
+    """Extract user ID from token"""
+    payload = get_token_claims(credentials.credentials)
+    
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+    
+    return int(user_id)
+
+
+def query_budget(max_queries: int):
+    """
+    Route dependency capping the statements one request may run. Overruns are
+    logged, or fail the request when SQL_QUERY_BUDGET_MODE is "raise" (tests).
+    """
+    async def apply_budget() -> None:
+        set_query_budget(max_queries)
+    return apply_budget
+
+
+async def check_band_etag(scope: str, band_id: int, user_id: int, request: Request,
+                          response: Response, db: SessionRunner) -> Optional[Response]:
+    """
+    Validate a band-scoped GET against Band.data_version. Returns a 304 response
+    when the client's copy is current; otherwise sets ETag on the response and
+    returns None so the handler builds the full payload.
+    """
+    version = await db.run(lambda session: BandService(session).get_data_version(band_id, user_id))
+    etag = make_etag(scope, band_id, version, request)
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+    return None
+
+
+async def cached_band_response(scope: str, band_id: int, user_id: int, request: Request,
+                               db: SessionRunner, build: Callable[[Session], Any],
+                               response_type: Any) -> Response:
+    """
+    Serve a band-scoped read from the response cache. The ETag doubles as the
+    cache key, so a 304, a cache hit and a rebuild all hang off one version read.
+    """
+    version = await db.run(lambda session: BandService(session).get_data_version(band_id, user_id))
+    etag = make_etag(scope, band_id, version, request)
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    
+    body = response_cache.get(etag)
+    cache_status = "HIT"
+    if body is None:
+        data = await db.run(build)
+        body = response_cache.serialize(response_type, data)
+        response_cache.set(etag, body)
+        cache_status = "MISS"
+    
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL, "X-Cache": cache_status}
+    )
@@ -6,6 +6,7 @@ from app.api.v1.band_member import router as band_member_router
 from app.api.v1.show_payment import router as show_payment_router
 from app.api.v1.master_setlist import router as master_setlist_router
 from app.api.v1.song import router as song_router
+from app.api.v1.media import router as media_router
 
 api_router = APIRouter(prefix="/api/v1")
 
@@ -16,4 +17,5 @@ api_router.include_router(show_router)
 api_router.include_router(band_member_router)
 api_router.include_router(show_payment_router)
 api_router.include_router(master_setlist_router)
-api_router.include_router(song_router)
\ No newline at end of file
+api_router.include_router(song_router)
+api_router.include_router(media_router)
\ No newline at end of file
@@ -1,16 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.api.deps import get_current_user_id
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db_runner, SessionRunner
 from app.schemas.auth import UserSignup, UserLogin, Token, UserResponse, GoogleAuthCallback
-from app.services.auth import AuthService
-from app.utils.auth import decode_access_token
+from app.services.auth import AuthService, signup as signup_user, login as login_user
+from app.utils.cache import current_user_cache
 from app.config import settings
 import httpx
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
-security = HTTPBearer()
 
 # Google OAuth URLs
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
@@ -19,43 +17,28 @@ GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 
 
 @router.post("/signup", response_model=Token)
-def signup(signup_data: UserSignup, db: Session = Depends(get_db)):
+async def signup(signup_data: UserSignup, db: SessionRunner = Depends(get_db_runner)):
     """Register a new user"""
-    auth_service = AuthService(db)
-    return auth_service.signup(signup_data)
+    return await signup_user(db, signup_data)
 
 
 @router.post("/login", response_model=Token)
-def login(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, db: SessionRunner = Depends(get_db_runner)):
     """Login with email and password"""
-    auth_service = AuthService(db)
-    return auth_service.login(login_data)
+    return await login_user(db, login_data)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get current authenticated user"""
-    token = credentials.credentials
-    payload = decode_access_token(token)
+    cached = current_user_cache.get(user_id)
+    if cached is not None:
+        return cached
     
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
-    
-    auth_service = AuthService(db)
-    return auth_service.get_current_user(int(user_id))
+    return await db.run(lambda session: AuthService(session).get_current_user(user_id))
 
 
 @router.get("/google")
@@ -77,7 +60,7 @@ def google_login():
 
 
 @router.get("/google/callback")
-async def google_callback(code: str, db: Session = Depends(get_db)):
+async def google_callback(code: str, db: SessionRunner = Depends(get_db_runner)):
     """Handle Google OAuth callback"""
     try:
         # Exchange code for tokens
@@ -117,12 +100,11 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
             google_user = userinfo_response.json()
         
         # Process Google user (login or signup)
-        auth_service = AuthService(db)
-        token = auth_service.google_auth(
+        token = await db.run(lambda session: AuthService(session).google_auth(
             google_id=google_user.get("id"),
             email=google_user.get("email"),
             name=google_user.get("name")
-        )
+        ))
         
         # Redirect to frontend with token
         frontend_callback_url = f"{settings.FRONTEND_URL}/auth/google/callback?token={token.access_token}"
@@ -136,7 +118,7 @@ async def google_callback(code: str, db: Session = Depends(get_db)):
 
 
 @router.post("/google/token", response_model=Token)
-async def google_token_auth(callback_data: GoogleAuthCallback, db: Session = Depends(get_db)):
+async def google_token_auth(callback_data: GoogleAuthCallback, db: SessionRunner = Depends(get_db_runner)):
     """Alternative: Exchange Google auth code for app token (for mobile/SPA flows)"""
     try:
         async with httpx.AsyncClient() as client:
@@ -176,12 +158,11 @@ async def google_token_auth(callback_data: GoogleAuthCallback, db: Session = Dep
             google_user = userinfo_response.json()
         
         # Process Google user (login or signup)
-        auth_service = AuthService(db)
-        return auth_service.google_auth(
+        return await db.run(lambda session: AuthService(session).google_auth(
             google_id=google_user.get("id"),
             email=google_user.get("email"),
             name=google_user.get("name")
-        )
+        ))
         
     except httpx.RequestError as e:
         raise HTTPException(
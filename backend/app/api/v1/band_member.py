@@ -1,91 +1,58 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from app.api.deps import get_current_user_id
+from app.database import get_db_runner, SessionRunner
 from app.schemas.band_member import BandMemberCreate, BandMemberUpdate, BandMemberResponse
 from app.services.band_member import BandMemberService
-from app.utils.auth import decode_access_token
+from app.services.upload import media_uploads
+from app.services.image import image_pipeline
 from typing import List
 from fastapi import UploadFile, File
-import os
-import uuid
-from pathlib import Path
 
 router = APIRouter(prefix="/bands/{band_id}/members", tags=["Band Members"])
-security = HTTPBearer()
-
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
-UPLOAD_DIR = BASE_DIR / "uploads" / "profiles"
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
-
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
-    """Extract user ID from token"""
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
-    
-    return int(user_id)
 
 
 @router.post("/", response_model=BandMemberResponse)
-def create_member(
+async def create_member(
     band_id: int,
     member_data: BandMemberCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Add a new member to the band (admin only)"""
-    service = BandMemberService(db)
-    return service.create_member(band_id, member_data, user_id)
+    return await db.run(lambda session: BandMemberService(session).create_member(band_id, member_data, user_id))
 
 
 @router.get("/", response_model=List[BandMemberResponse])
-def get_members(
+async def get_members(
     band_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get all members of a band"""
-    service = BandMemberService(db)
-    return service.get_band_members(band_id, user_id)
+    return await db.run(lambda session: BandMemberService(session).get_band_members(band_id, user_id))
 
 
 @router.put("/{member_id}", response_model=BandMemberResponse)
-def update_member(
+async def update_member(
     band_id: int,
     member_id: int,
     member_data: BandMemberUpdate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Update a band member (admin only)"""
-    service = BandMemberService(db)
-    return service.update_member(member_id, member_data, user_id)
+    return await db.run(lambda session: BandMemberService(session).update_member(member_id, member_data, user_id))
 
 
 @router.delete("/{member_id}")
-def delete_member(
+async def delete_member(
     band_id: int,
     member_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Remove a member from the band (admin only)"""
-    service = BandMemberService(db)
-    success = service.delete_member(member_id, user_id)
+    success = await db.run(lambda session: BandMemberService(session).delete_member(member_id, user_id))
     if success:
         return {"message": "Member removed successfully"}
     raise HTTPException(
@@ -94,32 +61,26 @@ def delete_member(
     )
 
 @router.post("/{member_id}/profile-picture")
-def upload_profile_picture(
+async def upload_profile_picture(
     band_id: int,
     member_id: int,
     file: UploadFile = File(...),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Upload profile picture for a band member"""
-    service = BandMemberService(db)
-    service._check_admin_access(band_id, user_id)
+    await db.run(lambda session: BandMemberService(session).access.require_admin(band_id, user_id))
     
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File type not allowed. Use jpg, jpeg, png, gif, or webp"
-        )
+    stored = await media_uploads.save(file)
     
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
+    try:
+        member = await db.run(
+            lambda session: BandMemberService(session).replace_profile_picture(band_id, member_id, stored, user_id)
+        )
+    finally:
+        media_uploads.discard(stored)
     
-    from app.repositories.band_member import BandMemberRepository
-    member_repo = BandMemberRepository(db)
-    member = member_repo.update_member(member_id, profile_picture=f"/uploads/profiles/{unique_filename}")
+    # Render thumbnail / WebP variants in the background
+    image_pipeline.schedule(stored.sha256, stored.url)
     
     return {"profile_picture": member.profile_picture}
\ No newline at end of file
@@ -1,105 +1,103 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from app.api.deps import get_current_user_id, cached_band_response, query_budget
+from app.database import get_db_runner, SessionRunner
 from app.schemas.master_setlist import (
     MasterSetlistCreate, MasterSetlistUpdate, MasterSetlistResponse,
     MasterSetlistWithSongsResponse
 )
+from app.schemas.setlist_song import SetlistSongReorder, SetlistSongUpdatePosition
 from app.services.master_setlist import MasterSetlistService
-from app.utils.auth import decode_access_token
 from typing import List
 
 router = APIRouter(prefix="/setlists", tags=["Master Setlists"])
-security = HTTPBearer()
-
-
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
-    """Extract user ID from token"""
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
-    
-    return int(user_id)
 
 
 @router.post("/", response_model=MasterSetlistResponse)
-def create_setlist(
+async def create_setlist(
     setlist_data: MasterSetlistCreate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Create a new master setlist"""
-    service = MasterSetlistService(db)
-    return service.create_setlist(setlist_data, user_id)
+    return await db.run(lambda session: MasterSetlistService(session).create_setlist(setlist_data, user_id))
 
 
-@router.get("/band/{band_id}", response_model=List[MasterSetlistResponse])
-def get_band_setlists(
+@router.get("/band/{band_id}", response_model=List[MasterSetlistResponse], dependencies=[Depends(query_budget(5))])
+async def get_band_setlists(
     band_id: int,
+    request: Request,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get all setlists for a band"""
-    service = MasterSetlistService(db)
-    return service.get_band_setlists(band_id, user_id)
+    return await cached_band_response(
+        "setlists", band_id, user_id, request, db,
+        build=lambda session: MasterSetlistService(session).get_band_setlists(band_id, user_id),
+        response_type=List[MasterSetlistResponse]
+    )
 
 
 @router.get("/{setlist_id}", response_model=MasterSetlistResponse)
-def get_setlist(
+async def get_setlist(
     setlist_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get a specific setlist"""
-    service = MasterSetlistService(db)
-    return service.get_setlist(setlist_id, user_id)
+    return await db.run(lambda session: MasterSetlistService(session).get_setlist(setlist_id, user_id))
 
 
-@router.get("/{setlist_id}/songs", response_model=MasterSetlistWithSongsResponse)
-def get_setlist_with_songs(
+@router.get("/{setlist_id}/songs", response_model=MasterSetlistWithSongsResponse, dependencies=[Depends(query_budget(5))])
+async def get_setlist_with_songs(
     setlist_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get a setlist with all its songs"""
-    service = MasterSetlistService(db)
-    return service.get_setlist_with_songs(setlist_id, user_id)
+    return await db.run(lambda session: MasterSetlistService(session).get_setlist_with_songs(setlist_id, user_id))
 
 
 @router.put("/{setlist_id}", response_model=MasterSetlistResponse)
-def update_setlist(
+async def update_setlist(
     setlist_id: int,
     setlist_data: MasterSetlistUpdate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Update a setlist"""
-    service = MasterSetlistService(db)
-    return service.update_setlist(setlist_id, setlist_data, user_id)
+    return await db.run(lambda session: MasterSetlistService(session).update_setlist(setlist_id, setlist_data, user_id))
+
+
+@router.put("/{setlist_id}/order", response_model=MasterSetlistWithSongsResponse)
+async def reorder_setlist(
+    setlist_id: int,
+    order: SetlistSongReorder,
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """Reorder a setlist's songs. Send the setlist version you reordered; 409 if it has moved on."""
+    return await db.run(lambda session: MasterSetlistService(session).reorder_setlist(setlist_id, order, user_id))
+
+
+@router.put("/{setlist_id}/songs/move", response_model=MasterSetlistWithSongsResponse)
+async def move_setlist_song(
+    setlist_id: int,
+    move: SetlistSongUpdatePosition,
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """Move one song to a 0-based slot in a setlist. Send the setlist version you moved from; 409 if it has moved on."""
+    return await db.run(lambda session: MasterSetlistService(session).move_song(setlist_id, move, user_id))
 
 
 @router.delete("/{setlist_id}")
-def delete_setlist(
+async def delete_setlist(
     setlist_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Delete a setlist"""
-    service = MasterSetlistService(db)
-    success = service.delete_setlist(setlist_id, user_id)
+    success = await db.run(lambda session: MasterSetlistService(session).delete_setlist(setlist_id, user_id))
     if success:
         return {"message": "Setlist deleted successfully"}
     raise HTTPException(
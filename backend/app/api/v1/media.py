@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from app.database import get_db_runner, SessionRunner
+from app.services.image import IMAGE_VARIANTS, derivative_path, image_pipeline
+from app.services.media import MediaService
+from app.utils.http_cache import IMMUTABLE_CACHE_CONTROL
+import re
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+@router.get("/{variant}/{sha256}.webp")
+async def get_image_variant(
+    variant: str,
+    sha256: str,
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """Serve a resized WebP variant (thumb, card or large) of an uploaded image"""
+    if variant not in IMAGE_VARIANTS or not SHA256_PATTERN.fullmatch(sha256):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+    
+    path = derivative_path(sha256, variant)
+    if not path.exists():
+        source = await db.run(lambda session: MediaService(session).get_original_path(sha256))
+        path = await image_pipeline.ensure(sha256, variant, source)
+    
+    return FileResponse(path, media_type="image/webp", headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
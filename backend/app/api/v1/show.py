@@ -1,104 +1,120 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.show import ShowCreate, ShowUpdate, ShowResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, UploadFile, File
+from app.api.deps import get_current_user_id, check_band_etag, query_budget
+from app.database import get_db_runner, SessionRunner
+from app.schemas.show import ShowCreate, ShowUpdate, ShowResponse, ShowStatus
+from app.schemas.pagination import Page
+from app.schemas.show_payment import BandFinanceSummary, BandEarnings
 from app.services.show import ShowService
-from app.utils.auth import decode_access_token
-from typing import List
-import os
-import uuid
-from pathlib import Path
+from app.services.show_payment import ShowPaymentService
+from app.services.upload import media_uploads
+from app.services.image import image_pipeline
+from typing import Optional
+from datetime import date
 
 router = APIRouter(prefix="/shows", tags=["Shows"])
-security = HTTPBearer()
 
-# Get the base directory (where main.py is located)
-BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
-UPLOAD_DIR = BASE_DIR / "uploads" / "posters"
 
-# Create upload directory if it doesn't exist
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-# Allowed file extensions
-ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+@router.post("/", response_model=ShowResponse)
+async def create_show(
+    show_data: ShowCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """Create a new show"""
+    return await db.run(lambda session: ShowService(session).create_show(show_data, user_id))
 
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
-    """Extract user ID from token"""
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
+@router.get("/band/{band_id}", response_model=Page[ShowResponse], dependencies=[Depends(query_budget(5))])
+async def get_band_shows(
+    band_id: int,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    show_status: Optional[ShowStatus] = Query(None, alias="status"),
+    member: Optional[str] = None,
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """
+    Get a page of a band's shows, newest first. Filters: ?start=&end= (show date),
+    ?status=, ?member=<name> (shows that member played). Pass next_cursor back as ?cursor=.
+    """
+    cached = await check_band_etag("shows", band_id, user_id, request, response, db)
+    if cached is not None:
+        return cached
     
-    return int(user_id)
+    return await db.run(lambda session: ShowService(session).get_band_shows(
+        band_id, user_id, limit=limit, cursor=cursor, start_date=start, end_date=end,
+        show_status=show_status, member_name=member
+    ))
 
 
-@router.post("/", response_model=ShowResponse)
-def create_show(
-    show_data: ShowCreate,
+@router.get("/band/{band_id}/finance", response_model=BandFinanceSummary)
+async def get_band_finance(
+    band_id: int,
+    request: Request,
+    response: Response,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
-    """Create a new show"""
-    show_service = ShowService(db)
-    return show_service.create_show(show_data, user_id)
+    """Get band finances: per-show totals, per-member payouts and outstanding balances"""
+    cached = await check_band_etag("finance", band_id, user_id, request, response, db)
+    if cached is not None:
+        return cached
+    
+    return await db.run(lambda session: ShowPaymentService(session).get_band_finance_summary(band_id, user_id))
 
 
-@router.get("/band/{band_id}", response_model=List[ShowResponse])
-def get_band_shows(
+@router.get("/band/{band_id}/earnings", response_model=BandEarnings)
+async def get_band_earnings(
     band_id: int,
+    request: Request,
+    response: Response,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
-    """Get all shows for a band"""
-    show_service = ShowService(db)
-    return show_service.get_band_shows(band_id, user_id)
+    """Get per-member earnings by month, optionally limited to the months between start and end"""
+    cached = await check_band_etag("earnings", band_id, user_id, request, response, db)
+    if cached is not None:
+        return cached
+    
+    return await db.run(lambda session: ShowPaymentService(session).get_band_earnings(band_id, user_id, start, end))
 
 
 @router.get("/{show_id}", response_model=ShowResponse)
-def get_show(
+async def get_show(
     show_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get a specific show"""
-    show_service = ShowService(db)
-    return show_service.get_show(show_id, user_id)
+    return await db.run(lambda session: ShowService(session).get_show(show_id, user_id))
 
 
 @router.put("/{show_id}", response_model=ShowResponse)
-def update_show(
+async def update_show(
     show_id: int,
     show_data: ShowUpdate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Update show details"""
-    show_service = ShowService(db)
-    return show_service.update_show(show_id, show_data, user_id)
+    return await db.run(lambda session: ShowService(session).update_show(show_id, show_data, user_id))
 
 
 @router.delete("/{show_id}")
-def delete_show(
+async def delete_show(
     show_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Delete a show"""
-    show_service = ShowService(db)
-    success = show_service.delete_show(show_id, user_id)
+    success = await db.run(lambda session: ShowService(session).delete_show(show_id, user_id))
     if success:
         return {"message": "Show deleted successfully"}
     else:
@@ -109,69 +125,48 @@ def delete_show(
 
 
 @router.post("/{show_id}/poster")
-def upload_poster(
+async def upload_poster(
     show_id: int,
     file: UploadFile = File(...),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Upload poster for a show"""
-    show_service = ShowService(db)
-    
-    # Verify show access
-    show = show_service.get_show(show_id, user_id)
+    # Verify show access before reading the upload
+    await db.run(lambda session: ShowService(session).get_show(show_id, user_id))
     
-    # Check file extension
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # Save file
+    # Stream file to disk
     try:
-        with file_path.open("wb") as buffer:
-            content = file.file.read()
-            buffer.write(content)
+        stored = await media_uploads.save(file)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save file: {str(e)}"
         )
     
-    # Delete old poster if exists
-    if show.poster:
-        old_file_path = BASE_DIR / show.poster.lstrip('/')
-        if old_file_path.exists():
-            try:
-                old_file_path.unlink()
-            except Exception as e:
-                print(f"Error deleting old poster: {str(e)}")
+    # Swap the poster reference; the old file is collected once nothing points at it
+    try:
+        updated_show = await db.run(lambda session: ShowService(session).replace_poster(show_id, stored, user_id))
+    finally:
+        media_uploads.discard(stored)
     
-    # Update show with new poster path
-    poster_url = f"/uploads/posters/{unique_filename}"
-    show_update = ShowUpdate(poster=poster_url)
-    updated_show = show_service.update_show(show_id, show_update, user_id)
+    # Render thumbnail / WebP variants in the background
+    image_pipeline.schedule(stored.sha256, stored.url)
     
     return {"poster": updated_show.poster}
 
 
 @router.delete("/{show_id}/poster")
-def delete_poster(
+async def delete_poster(
     show_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Delete poster for a show"""
-    show_service = ShowService(db)
-    
     # Verify show access
-    show = show_service.get_show(show_id, user_id)
+    show = await db.run(lambda session: ShowService(session).get_show(show_id, user_id))
     
     if not show.poster:
         raise HTTPException(
@@ -179,16 +174,7 @@ def delete_poster(
             detail="Show has no poster"
         )
     
-    # Delete file
-    file_path = BASE_DIR / show.poster.lstrip('/')
-    if file_path.exists():
-        try:
-            file_path.unlink()
-        except Exception as e:
-            print(f"Error deleting poster file: {str(e)}")
-    
-    # Update show to remove poster
-    show_update = ShowUpdate(poster=None)
-    show_service.update_show(show_id, show_update, user_id)
+    # Remove poster and release its file
+    await db.run(lambda session: ShowService(session).replace_poster(show_id, None, user_id))
     
     return {"message": "Poster deleted successfully"}
\ No newline at end of file
@@ -1,93 +1,172 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File
+from fastapi.responses import StreamingResponse
+from app.api.deps import get_current_user_id, cached_band_response, query_budget
+from app.database import get_db_runner, SessionRunner
 from app.schemas.song import (
-    SongCreate, SongUpdate, SongResponse, SongWithSetlistsResponse
+    SongCreate, SongUpdate, SongWithSetlistsResponse,
+    SongSummaryWithSetlistsResponse, SongSearchResult, SongImportResult
 )
 from app.services.song import SongService
-from app.utils.auth import decode_access_token
-from typing import List
+from app.services.song_search import SongSearchService
+from app.services.song_import import SongImportService, import_songs, stream_song_export
+from app.config import settings
+from app.utils.song_formats import EXPORT_WRITERS, format_for_filename
+from app.utils.metrics import upload_bytes, upload_duration_seconds, uploads_rejected_total
+from app.schemas.pagination import Page
+from typing import List, Literal, Optional, Union
+import time
 
 router = APIRouter(prefix="/songs", tags=["Songs"])
-security = HTTPBearer()
 
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
-    """Extract user ID from token"""
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    
-    if not payload:
+@router.post("/", response_model=SongWithSetlistsResponse)
+async def create_song(
+    song_data: SongCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """Create a new song, optionally adding to setlists"""
+    return await db.run(lambda session: SongService(session).create_song(song_data, user_id))
+
+
+@router.get(
+    "/band/{band_id}",
+    response_model=Page[Union[SongSummaryWithSetlistsResponse, SongWithSetlistsResponse]],
+    dependencies=[Depends(query_budget(5))]
+)
+async def get_band_songs(
+    band_id: int,
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    genre: Optional[str] = None,
+    scale: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    view: Literal["summary", "full"] = "summary",
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """
+    Get a page of a band's songs ordered by title. Filters: ?genre=, ?scale=,
+    ?is_active=. Pass next_cursor back as ?cursor=. Rows are summaries without
+    lyrics, chords or description unless ?view=full; GET /songs/{id} has the full song.
+    """
+    summary = view == "summary"
+    return await cached_band_response(
+        "songs", band_id, user_id, request, db,
+        build=lambda session: SongService(session).get_band_songs(
+            band_id, user_id, limit=limit, cursor=cursor, genre=genre, scale=scale,
+            is_active=is_active, summary=summary
+        ),
+        response_type=Page[SongSummaryWithSetlistsResponse] if summary else Page[SongWithSetlistsResponse]
+    )
+
+
+@router.post("/band/{band_id}/import", response_model=SongImportResult)
+async def import_band_songs(
+    band_id: int,
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "json", "chordpro"]] = None,
+    dry_run: bool = False,
+    user_id: int = Depends(get_current_user_id),
+    db: SessionRunner = Depends(get_db_runner)
+):
+    """
+    Create songs in bulk from a CSV, JSON (array or JSON Lines) or ChordPro
+    file; ?format= overrides the file extension. Invalid records are listed
+    in `errors` and skipped. ?dry_run=true only validates.
+    """
+    import_format = format or format_for_filename(file.filename)
+    if import_format is None:
+        uploads_rejected_total.inc("song_import", "400")
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file type; pass ?format=csv, json or chordpro"
         )
-    
-    user_id = payload.get("sub")
-    if not user_id:
+    if file.size is not None and file.size > settings.SONG_IMPORT_MAX_SIZE_MB * 1024 * 1024:
+        uploads_rejected_total.inc("song_import", "413")
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size: {settings.SONG_IMPORT_MAX_SIZE_MB}MB"
         )
     
-    return int(user_id)
-
-
-@router.post("/", response_model=SongWithSetlistsResponse)
-def create_song(
-    song_data: SongCreate,
+    start = time.perf_counter()
+    try:
+        result = await import_songs(db, band_id, user_id, file.file, import_format, dry_run=dry_run)
+    except HTTPException as e:
+        if e.status_code == status.HTTP_400_BAD_REQUEST:
+            uploads_rejected_total.inc("song_import", "400")  # Unreadable file
+        raise
+    upload_bytes.observe(file.size or 0, "song_import")
+    upload_duration_seconds.observe(time.perf_counter() - start, "song_import")
+    return result
+
+
+@router.get("/band/{band_id}/export")
+async def export_band_songs(
+    band_id: int,
+    format: Literal["csv", "json", "chordpro"] = "csv",
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
-    """Create a new song, optionally adding to setlists"""
-    service = SongService(db)
-    return service.create_song(song_data, user_id)
+    """Download a band's whole catalog as CSV, JSON or ChordPro, streamed in batches"""
+    await db.run(lambda session: SongImportService(session).check_export(band_id, user_id))
+    
+    writer = EXPORT_WRITERS[format]()
+    return StreamingResponse(
+        stream_song_export(band_id, writer),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="band-{band_id}-songs.{writer.extension}"'}
+    )
 
 
-@router.get("/band/{band_id}", response_model=List[SongWithSetlistsResponse])
-def get_band_songs(
+@router.get("/band/{band_id}/search", response_model=List[SongSearchResult], dependencies=[Depends(query_budget(6))])
+async def search_songs(
     band_id: int,
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: Optional[int] = None,
+    is_active: Optional[bool] = None,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
-    """Get all songs for a band"""
-    service = SongService(db)
-    return service.get_band_songs(band_id, user_id)
+    """Search a band's songs by title, lyrics, description and chords (ranked, with snippets)"""
+    return await cached_band_response(
+        "song-search", band_id, user_id, request, db,
+        build=lambda session: SongSearchService(session).search(band_id, user_id, q, limit, is_active),
+        response_type=List[SongSearchResult]
+    )
 
 
 @router.get("/{song_id}", response_model=SongWithSetlistsResponse)
-def get_song(
+async def get_song(
     song_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Get a specific song"""
-    service = SongService(db)
-    return service.get_song(song_id, user_id)
+    return await db.run(lambda session: SongService(session).get_song(song_id, user_id))
 
 
 @router.put("/{song_id}", response_model=SongWithSetlistsResponse)
-def update_song(
+async def update_song(
     song_id: int,
     song_data: SongUpdate,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Update a song"""
-    service = SongService(db)
-    return service.update_song(song_id, song_data, user_id)
+    return await db.run(lambda session: SongService(session).update_song(song_id, song_data, user_id))
 
 
 @router.delete("/{song_id}")
-def delete_song(
+async def delete_song(
     song_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Delete a song"""
-    service = SongService(db)
-    success = service.delete_song(song_id, user_id)
+    success = await db.run(lambda session: SongService(session).delete_song(song_id, user_id))
     if success:
         return {"message": "Song deleted successfully"}
     raise HTTPException(
@@ -97,28 +176,27 @@ def delete_song(
 
 
 @router.post("/{song_id}/setlists/{setlist_id}")
-def add_song_to_setlist(
+async def add_song_to_setlist(
     song_id: int,
     setlist_id: int,
+    position: Optional[int] = Query(None, ge=0),
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
-    """Add a song to a setlist"""
-    service = SongService(db)
-    service.add_song_to_setlist(song_id, setlist_id, user_id)
+    """Add a song to a setlist, at the 0-based ?position= slot or at the end"""
+    await db.run(lambda session: SongService(session).add_song_to_setlist(song_id, setlist_id, user_id, position))
     return {"message": "Song added to setlist successfully"}
 
 
 @router.delete("/{song_id}/setlists/{setlist_id}")
-def remove_song_from_setlist(
+async def remove_song_from_setlist(
     song_id: int,
     setlist_id: int,
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Remove a song from a setlist"""
-    service = SongService(db)
-    success = service.remove_song_from_setlist(song_id, setlist_id, user_id)
+    success = await db.run(lambda session: SongService(session).remove_song_from_setlist(song_id, setlist_id, user_id))
     if success:
         return {"message": "Song removed from setlist successfully"}
     raise HTTPException(
@@ -128,12 +206,11 @@ def remove_song_from_setlist(
 
 
 @router.put("/{song_id}/setlists", response_model=SongWithSetlistsResponse)
-def update_song_setlists(
+async def update_song_setlists(
     song_id: int,
     setlist_ids: List[int],
     user_id: int = Depends(get_current_user_id),
-    db: Session = Depends(get_db)
+    db: SessionRunner = Depends(get_db_runner)
 ):
     """Update which setlists a song belongs to"""
-    service = SongService(db)
-    return service.update_song_setlists(song_id, setlist_ids, user_id)
\ No newline at end of file
+    return await db.run(lambda session: SongService(session).update_song_setlists(song_id, setlist_ids, user_id))
\ No newline at end of file
@@ -6,12 +6,22 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DATABASE_URL_DOCKER: Optional[str] = None
+    DB_ASYNC: bool = False  # Use AsyncSession + asyncpg for request handling
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_WARMUP: bool = True  # Open DB_POOL_SIZE connections and prime hot statements at startup
+    DB_WARMUP_TIMEOUT_SECONDS: float = 15.0
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # Changing this rehashes passwords on next login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Running + queued; beyond this logins get 503
+    
     # Google OAuth
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
@@ -22,6 +32,66 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     FRONTEND_URL: str = "http://localhost:5173"
     
+    # List endpoints (keyset pagination)
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+    
+    # Song search
+    SEARCH_DEFAULT_LIMIT: int = 20
+    # In-memory indexes (non-Postgres backends), one per band. Each holds ~13 KiB
+    # per song (benchmarks/song_search.py), so worst case is this many of the largest catalogs.
+    SEARCH_INDEX_CACHE_SIZE: int = 16
+    SEARCH_INDEX_CACHE_TTL_SECONDS: int = 600
+    
+    # Song import/export
+    SONG_IMPORT_MAX_SIZE_MB: int = 20
+    SONG_IMPORT_MAX_ROWS: int = 5000
+    SONG_IMPORT_BATCH_SIZE: int = 500
+    SONG_EXPORT_BATCH_SIZE: int = 200
+    
+    # Readiness (GET /health/ready)
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_MIN_FREE_DISK_MB: int = 500  # Below this the upload volume is reported not ready
+    HEALTH_MAX_POOL_SATURATION: float = 1.0  # Checked-out share of pool_size + max_overflow that fails readiness
+    HEALTH_DRAIN_SECONDS: float = 5.0  # After SIGTERM, readiness fails this long before the server stops accepting
+    
+    # Prometheus text-format metrics at GET /metrics (in-process, no exporter needed)
+    METRICS_ENABLED: bool = True
+    
+    # Per-request SQL instrumentation (Server-Timing header, N+1 and budget warnings)
+    SQL_INSTRUMENTATION: bool = True
+    SQL_LOG_REQUESTS: bool = False  # Log every request's SQL summary, not just flagged ones
+    SQL_REPEAT_THRESHOLD: int = 5  # Same statement shape this often in one request is flagged
+    SQL_SLOWEST_STATEMENTS: int = 3
+    SQL_QUERY_BUDGET: Optional[int] = None  # Default per-request budget; endpoints may set their own
+    SQL_QUERY_BUDGET_MODE: str = "warn"  # "warn" logs overruns, "raise" fails the request (tests)
+    SQL_DEBUG_ENDPOINT: bool = False  # GET /health/sql lists recent requests' SQL
+    SQL_RECENT_REQUESTS: int = 100
+    
+    # Uploads
+    MAX_UPLOAD_SIZE_MB: int = 10
+    MEDIA_GC_INTERVAL_SECONDS: int = 3600
+    MEDIA_GC_GRACE_SECONDS: int = 3600
+    IMAGE_WORKERS: int = 2
+    IMAGE_WEBP_QUALITY: int = 80
+    IMAGE_MAX_PIXELS: int = 50_000_000  # Width x height; larger images are refused before decoding
+    
+    # Band access cache (per process)
+    BAND_ACCESS_CACHE_SIZE: int = 1024
+    BAND_ACCESS_CACHE_TTL_SECONDS: int = 60
+    
+    # Verified JWT claims and /auth/me user cache (per process)
+    TOKEN_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    CURRENT_USER_CACHE_SIZE: int = 1024
+    CURRENT_USER_CACHE_TTL_SECONDS: int = 30
+    
+    # Serialized catalog responses (songs, setlists) keyed by band data_version
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared)
+    RESPONSE_CACHE_URL: Optional[str] = None  # redis://host:6379/0 when the backend is redis
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_TTL_SECONDS: int = 600
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
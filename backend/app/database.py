@@ -1,28 +1,150 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.utils.metrics import InstrumentedQueuePool, InstrumentedAsyncQueuePool
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, List, TypeVar
 import os
 
+T = TypeVar("T")
+
 # Determine which database URL to use
 DATABASE_URL = settings.DATABASE_URL_DOCKER if os.getenv("DOCKER_ENV") else settings.DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after the unit of work commits; repositories flush and
+# already hold every column they wrote
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (asyncpg / aiosqlite)"""
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+# Async engine is only created when enabled so asyncpg stays optional for the sync path
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    
+    ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+    # aiosqlite (test runs) does not use a sized connection pool
+    pool_options = {} if ASYNC_DATABASE_URL.startswith("sqlite") else {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+    
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        **pool_options
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# Session.info key for callbacks waiting on the current transaction's commit
+AFTER_COMMIT_KEY = "after_commit"
+
+
+def after_commit(session: Session, callback: Callable[[], Any]) -> None:
+    """Run a callback once the session's current transaction commits; a rollback drops it"""
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    callbacks: List[Callable[[], Any]] = session.info.pop(AFTER_COMMIT_KEY, [])
+    for callback in callbacks:
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+def run_unit_of_work(session: Session, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Call fn(session, ...) as one transaction: repositories only flush, so its
+    writes are committed together here, or all rolled back if it raises.
+    """
     try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+        result = fn(session, *args, **kwargs)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return result
+
+
+class SessionRunner(ABC):
+    """
+    Runs synchronous repository/service code against a request-scoped session
+    from an async route handler. Each run() is one unit of work.
+    """
+    
+    @abstractmethod
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call fn(session, *args, **kwargs) and commit, or roll back if it raises"""
+
+
+class ThreadpoolSessionRunner(SessionRunner):
+    """Sync Session; each call runs on the Starlette threadpool"""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_in_threadpool(run_unit_of_work, self.session, fn, *args, **kwargs)
+
+
+class AsyncSessionRunner(SessionRunner):
+    """AsyncSession; each call runs on the event loop via run_sync, I/O goes through the async driver"""
+    
+    def __init__(self, session):
+        self.session = session
+    
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self.session.run_sync(run_unit_of_work, fn, *args, **kwargs)
+
+
+@asynccontextmanager
+async def open_db_runner() -> AsyncIterator[SessionRunner]:
+    """Session runner with its own session; DB_ASYNC switches between the two runners"""
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as session:
+            yield AsyncSessionRunner(session)
+    else:
+        db = SessionLocal()
+        try:
+            yield ThreadpoolSessionRunner(db)
+        finally:
+            await run_in_threadpool(db.close)
+
+
+# Dependency used by the v1 routers. Streaming responses that outlive the
+# request scope open their own runner with open_db_runner().
+async def get_db_runner():
+    async with open_db_runner() as runner:
+        yield runner
@@ -1,13 +1,28 @@
-from app.database import engine, Base
-from app.models import User, Band, BandMember, MasterSetlist, Song
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from app.database import engine
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+INITIAL_REVISION = "0001"
 
 
 def init_db():
-    """Initialize database tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    """Bring the database schema up to date by running Alembic migrations"""
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    
+    # Databases created by Base.metadata.create_all have no version table yet
+    tables = inspect(engine).get_table_names()
+    if "bands" in tables and "alembic_version" not in tables:
+        print("Stamping existing schema at the initial revision...")
+        command.stamp(config, INITIAL_REVISION)
+    
+    print("Running database migrations...")
+    command.upgrade(config, "head")
+    print("Database is up to date!")
 
 
 if __name__ == "__main__":
-    init_db()   
\ No newline at end of file
+    init_db()
@@ -1,22 +1,51 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.config import settings
 from app.api.v1 import api_router
-from app.database import engine, Base
-from app.models import User, Band, BandMember, MasterSetlist, Song, SetlistSong, Show
+from app.database import engine, async_engine
+from app.services.media import run_media_gc
+from app.services.image import image_pipeline
+from app.services.health import lifecycle, readiness_report, warm_up, install_drain_handler
+from app.utils.http_cache import UploadStaticFiles
+from app.utils.cache import membership_cache, token_cache, current_user_cache, search_index_cache
+from app.utils.response_cache import response_cache
+from app.utils.sql_metrics import SqlInstrumentationMiddleware, instrument_engine, recent_requests
+from app.utils.metrics import MetricsMiddleware, Counter, Gauge, registry, pool_metrics, cache_metrics, CONTENT_TYPE
+from app.utils.auth import password_hasher
 from pathlib import Path
+import asyncio
 
 # Create uploads directory
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-# Initialize database tables if they don't exist
-Base.metadata.create_all(bind=engine)
+# Database schema is managed by Alembic migrations (python -m app.init_db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sweep unreferenced media and files left behind by failed uploads
+    media_gc = asyncio.create_task(
+        run_media_gc(settings.MEDIA_GC_INTERVAL_SECONDS, settings.MEDIA_GC_GRACE_SECONDS)
+    )
+    if settings.DB_WARMUP:
+        lifecycle.warmup = await warm_up(settings.DB_WARMUP_TIMEOUT_SECONDS)
+    lifecycle.started = True
+    # SIGTERM fails readiness for HEALTH_DRAIN_SECONDS before uvicorn stops accepting connections
+    install_drain_handler(settings.HEALTH_DRAIN_SECONDS)
+    yield
+    # Shutdowns that did not start with SIGTERM (SIGINT, a supervisor) drain from here
+    lifecycle.draining = True
+    media_gc.cancel()
+    image_pipeline.shutdown()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -28,8 +57,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Statement count and DB time per request
+if settings.SQL_INSTRUMENTATION:
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    app.add_middleware(SqlInstrumentationMiddleware)
+
+# Request latency, in-flight and error counts for /metrics (outermost, so it times everything)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Serve uploaded files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", UploadStaticFiles(directory="uploads"), name="uploads")
 
 # Include API routes
 app.include_router(api_router)
@@ -42,4 +82,58 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/health/live")
+def liveness():
+    """The process is up and serving; checks no dependencies, so a DB outage does not restart pods"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Database, upload volume and pool checks; 503 takes this instance out of the load balancer"""
+    report = await readiness_report()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
+
+@app.get("/health/caches")
+def cache_stats():
+    return {
+        "responses": response_cache.stats(),
+        "band_access": membership_cache.stats(),
+        "tokens": token_cache.stats(),
+        "current_user": current_user_cache.stats(),
+        "search_indexes": search_index_cache.stats(),
+    }
+
+
+def _password_hasher_metrics():
+    stats = password_hasher.stats()
+    in_flight = Gauge("password_hash_in_flight", "bcrypt operations running or queued")
+    in_flight.set(value=stats["in_flight"])
+    queued = Gauge("password_hash_queue_depth", "bcrypt operations waiting for a worker")
+    queued.set(value=stats["queue_depth"])
+    rejected = Counter("password_hash_rejected_total", "Logins refused with 503 because the bcrypt queue was full")
+    rejected.inc(amount=stats["rejected_total"])
+    return [in_flight, queued, rejected]
+
+
+registry.add_collector(_password_hasher_metrics)
+registry.add_collector(lambda: cache_metrics(cache_stats()))
+registry.add_collector(lambda: pool_metrics(
+    {"sync": engine.pool, **({"async": async_engine.sync_engine.pool} if async_engine is not None else {})}
+))
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+if settings.SQL_DEBUG_ENDPOINT:
+    @app.get("/health/sql")
+    def sql_stats():
+        return {"requests": list(recent_requests)}
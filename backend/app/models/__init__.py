@@ -9,6 +9,11 @@ from app.models.song import Song
 from app.models.setlist_song import SetlistSong
 from app.models.show import Show
 from app.models.show_payment import ShowPayment
+from app.models.media_object import MediaObject
+from app.models.member_earning import MemberEarning
 
+# Registers the flush and commit hooks that keep Band.data_version current
+from app.models import versioning
 
-__all__ = ["Base", "User", "Band", "BandMember", "MasterSetlist", "Song", "Show", "ShowPayment", "SetlistSong"]
\ No newline at end of file
+
+__all__ = ["Base", "User", "Band", "BandMember", "MasterSetlist", "Song", "Show", "ShowPayment", "SetlistSong", "MediaObject", "MemberEarning"]
\ No newline at end of file
@@ -12,6 +12,10 @@ class Band(Base):
     logo = Column(String, nullable=True)
     established_date = Column(Date, nullable=True)
     description = Column(Text, nullable=True)
+    
+    # Bumped on every write to the band or its songs, setlists, shows and members (see app.models.versioning)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
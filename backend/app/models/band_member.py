@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -7,6 +7,12 @@ from app.database import Base
 class BandMember(Base):
     __tablename__ = "band_members"
     
+    __table_args__ = (
+        # Membership checks look up (user, band); member lists filter by band
+        Index("ix_band_members_user_id_band_id", "user_id", "band_id"),
+        Index("ix_band_members_band_id", "band_id"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     band_id = Column(Integer, ForeignKey("bands.id", ondelete="CASCADE"), nullable=False)
     
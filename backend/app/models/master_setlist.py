@@ -1,15 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
 class MasterSetlist(Base):
     __tablename__ = "master_setlists"
+    
+    # Setlist listing filters by band and active flag, ordered by name
+    __table_args__ = (
+        Index("ix_master_setlists_band_id_is_active_name", "band_id", "is_active", "name"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)  # This was missing!
     band_id = Column(Integer, ForeignKey("bands.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    
+    # Bumped whenever the setlist's songs or their order change; clients send it
+    # back with a reorder so concurrent edits fail instead of interleaving
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
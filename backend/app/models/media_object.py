@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+
+class MediaObject(Base):
+    __tablename__ = "media_objects"
+    
+    # The garbage collector scans for unreferenced objects older than a cutoff
+    __table_args__ = (
+        Index("ix_media_objects_ref_count_updated_at", "ref_count", "updated_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Content address (SHA-256 of the file bytes) and the public URL it is served from
+    sha256 = Column(String(64), nullable=False, unique=True)
+    url = Column(String, nullable=False, unique=True)
+    content_type = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    
+    # Number of bands, shows and members pointing at this file
+    ref_count = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Date, Numeric, ForeignKey, Index, UniqueConstraint
+from datetime import datetime
+from app.database import Base
+
+
+class MemberEarning(Base):
+    """Ledger of member payouts per band and month (month of the show date)"""
+    __tablename__ = "member_earnings"
+    
+    __table_args__ = (
+        UniqueConstraint("band_id", "member_name", "month", name="uq_member_earnings_band_id_member_name_month"),
+        # Earnings are read per band over a month range
+        Index("ix_member_earnings_band_id_month", "band_id", "month"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    band_id = Column(Integer, ForeignKey("bands.id", ondelete="CASCADE"), nullable=False)
+    member_name = Column(String, nullable=False)
+    month = Column(Date, nullable=False)  # First day of the month
+    
+    # Running totals, maintained incrementally by payment and show writes
+    total_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    payment_count = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -7,11 +7,19 @@ from app.database import Base
 class SetlistSong(Base):
     __tablename__ = "setlist_songs"
     
+    __table_args__ = (
+        # A song appears at most once per setlist
+        UniqueConstraint("setlist_id", "song_id", name="uq_setlist_songs_setlist_id_song_id"),
+        Index("ix_setlist_songs_setlist_id_position", "setlist_id", "position"),
+        Index("ix_setlist_songs_song_id", "song_id"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     setlist_id = Column(Integer, ForeignKey("master_setlists.id", ondelete="CASCADE"), nullable=False)
     song_id = Column(Integer, ForeignKey("songs.id", ondelete="CASCADE"), nullable=False)
     
-    # Position for ordering songs within a setlist
+    # Sparse sort key within the setlist (see app.repositories.setlist_song.POSITION_GAP);
+    # only the order matters, the API reports 0-based slots
     position = Column(Integer, default=0)
     
     # Timestamps
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, Time, Numeric, ForeignKey, Text, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Date, Time, Numeric, ForeignKey, Text, Enum, Index, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from app.database import Base
 import enum
 
@@ -15,6 +17,18 @@ class ShowStatus(str, enum.Enum):
 class Show(Base):
     __tablename__ = "shows"
     
+    # Show listing filters by band and orders by date
+    __table_args__ = (
+        Index("ix_shows_band_id_show_date", "band_id", "show_date"),
+        # "Shows member X played" (show_members @> '["X"]') on Postgres
+        Index(
+            "ix_shows_show_members",
+            "show_members",
+            postgresql_using="gin",
+            postgresql_ops={"show_members": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     band_id = Column(Integer, ForeignKey("bands.id", ondelete="CASCADE"), nullable=False)
     
@@ -25,7 +39,7 @@ class Show(Base):
     event_manager = Column(String, nullable=True)  # Can be created on the go
     
     # Band Members for this show (JSON array of names - can be from band_members or free text)
-    show_members = Column(Text, nullable=True)  # Stored as JSON string: ["Member1", "Member2", "Guest Artist"]
+    show_members = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # ["Member1", "Member2", "Guest Artist"]
     
     # Financial
     payment = Column(Numeric(10, 2), nullable=True)  # Total amount received for the show
@@ -50,5 +64,11 @@ class Show(Base):
     # Relationships
     band = relationship("Band", back_populates="shows")
     member_payments = relationship("ShowPayment", back_populates="show", cascade="all, delete-orphan")
+    
+    @validates("payment", "band_fund_amount")
+    def _round_amount(self, key, value):
+        # Store what Numeric(10, 2) reads back, since flushed rows are not refreshed
+        return None if value is None else Decimal(value).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    
     # We'll add setlist relationship later
     # setlists = relationship("ShowSetlist", back_populates="show", cascade="all, delete-orphan")
\ No newline at end of file
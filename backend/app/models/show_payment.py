@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from app.database import Base
 
 
 class ShowPayment(Base):
     __tablename__ = "show_payments"
     
+    # Payments are listed per show, newest first
+    __table_args__ = (
+        Index("ix_show_payments_show_id_created_at", "show_id", "created_at"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     show_id = Column(Integer, ForeignKey("shows.id", ondelete="CASCADE"), nullable=False)
     
@@ -24,4 +30,9 @@ class ShowPayment(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    show = relationship("Show", back_populates="member_payments")
\ No newline at end of file
+    show = relationship("Show", back_populates="member_payments")
+    
+    @validates("amount")
+    def _round_amount(self, key, value):
+        # Store what Numeric(10, 2) reads back, since flushed rows are not refreshed
+        return Decimal(value).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -7,6 +7,21 @@ from app.database import Base
 class Song(Base):
     __tablename__ = "songs"
     
+    # Catalog listing filters by band and orders by title
+    __table_args__ = (
+        Index("ix_songs_band_id_title", "band_id", "title"),
+        # Fuzzy title search (title % 'query') on Postgres, via pg_trgm
+        Index(
+            "ix_songs_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        # Postgres also has a generated tsvector column for full-text search
+        # (migration 0007). It is never read or written through the ORM.
+        {"info": {"db_only_columns": ("search_vector",)}},
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     band_id = Column(Integer, ForeignKey("bands.id", ondelete="CASCADE"), nullable=False)
     
@@ -0,0 +1,127 @@
+from sqlalchemy import event, update, select, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.band import Band
+from app.models.band_member import BandMember
+from app.models.master_setlist import MasterSetlist
+from app.models.song import Song
+from app.models.setlist_song import SetlistSong
+from app.models.show import Show
+from app.models.show_payment import ShowPayment
+from typing import Iterable, Set
+
+# Models that carry band_id directly
+BAND_SCOPED_MODELS = (BandMember, MasterSetlist, Song, Show)
+
+
+# Session.info key for the bands whose data changed in the current transaction
+PENDING_BUMPS_KEY = "pending_band_bumps"
+
+
+def bump_band_versions(session: Session, band_ids: Iterable[int] = (),
+                       setlist_ids: Iterable[int] = (), show_ids: Iterable[int] = ()) -> None:
+    """
+    Mark the given bands (or the bands owning the given setlists/shows) as
+    changed in the session's current transaction. Their Band.data_version is
+    incremented once, just before the transaction commits, so however many
+    flushes a unit of work runs the bands rows are updated, and locked, only
+    at commit. Bulk UPDATE/DELETE statements bypass the flush hook and must
+    call this directly.
+    """
+    pending = session.info.setdefault(PENDING_BUMPS_KEY, {"bands": set(), "setlists": set(), "shows": set()})
+    pending["bands"].update(band_ids)
+    pending["setlists"].update(setlist_ids)
+    pending["shows"].update(show_ids)
+
+
+def _apply_band_bumps(session: Session) -> None:
+    """Increment data_version of every band marked in this transaction, in one UPDATE"""
+    pending = session.info.pop(PENDING_BUMPS_KEY, None)
+    if not pending:
+        return
+    
+    conditions = []
+    if pending["bands"]:
+        conditions.append(Band.id.in_(pending["bands"]))
+    if pending["setlists"]:
+        conditions.append(Band.id.in_(
+            select(MasterSetlist.band_id).where(MasterSetlist.id.in_(pending["setlists"]))
+        ))
+    if pending["shows"]:
+        conditions.append(Band.id.in_(
+            select(Show.band_id).where(Show.id.in_(pending["shows"]))
+        ))
+    if not conditions:
+        return
+    
+    table = Band.__table__
+    session.connection().execute(
+        update(table).where(or_(*conditions)).values(data_version=table.c.data_version + 1)
+    )
+
+
+def bump_setlist_versions(session: Session, setlist_ids: Iterable[int]) -> None:
+    """
+    Increment MasterSetlist.version for setlists whose songs were added, removed
+    or moved. The new versions come back through RETURNING and are written into
+    setlists already loaded in the session, which are not refreshed after commit.
+    """
+    setlist_ids = set(setlist_ids)
+    if not setlist_ids:
+        return
+    
+    table = MasterSetlist.__table__
+    rows = session.connection().execute(
+        update(table).where(table.c.id.in_(setlist_ids))
+        .values(version=table.c.version + 1)
+        .returning(table.c.id, table.c.version)
+    )
+    for setlist_id, version in rows:
+        setlist = session.identity_map.get(session.identity_key(MasterSetlist, setlist_id))
+        if setlist is not None:
+            set_committed_value(setlist, "version", version)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_versions_before_flush(session: Session, flush_context, instances) -> None:
+    band_ids: Set[int] = set()
+    setlist_ids: Set[int] = set()
+    show_ids: Set[int] = set()
+    
+    changed = list(session.new) + list(session.deleted)
+    changed += [obj for obj in session.dirty if session.is_modified(obj, include_collections=False)]
+    
+    for obj in changed:
+        if isinstance(obj, Band):
+            # New bands start at version 0; deleted bands take their version with them
+            if obj in session.dirty:
+                band_ids.add(obj.id)
+        elif isinstance(obj, BAND_SCOPED_MODELS):
+            band_ids.add(obj.band_id)
+        elif isinstance(obj, SetlistSong):
+            setlist_ids.add(obj.setlist_id)
+        elif isinstance(obj, ShowPayment):
+            show_ids.add(obj.show_id)
+    
+    band_ids.discard(None)
+    setlist_ids.discard(None)
+    show_ids.discard(None)
+    if band_ids or setlist_ids or show_ids:
+        bump_band_versions(session, band_ids, setlist_ids, show_ids)
+    bump_setlist_versions(session, setlist_ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions_before_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return  # Releasing a savepoint; the outer transaction commits later
+    # before_commit runs ahead of the final flush, so flush now to collect its changes
+    session.flush()
+    _apply_band_bumps(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_band_bumps(session: Session, previous_transaction) -> None:
+    # A rolled-back savepoint leaves the outer transaction, and its marks, in place
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_BUMPS_KEY, None)
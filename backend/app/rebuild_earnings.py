@@ -0,0 +1,48 @@
+import argparse
+from decimal import Decimal
+from app.database import SessionLocal
+from app.repositories.earnings import EarningsRepository
+
+
+def rebuild_earnings(band_id=None, check_only=False) -> int:
+    """
+    Recompute the member earnings ledger from show payments. With check_only the
+    ledger is left untouched and differences are reported. Returns the number of
+    ledger rows that disagreed with the payments.
+    """
+    db = SessionLocal()
+    try:
+        repo = EarningsRepository(db)
+        expected = repo.compute_from_payments(band_id)
+        current = repo.get_ledger(band_id)
+        
+        mismatches = 0
+        for key in sorted(set(expected) | set(current), key=lambda k: (k[0], k[1], k[2])):
+            want = expected.get(key, (Decimal("0"), 0))
+            have = current.get(key, (Decimal("0"), 0))
+            if want != have:
+                mismatches += 1
+                band, member, month = key
+                print(f"Mismatch band={band} member={member!r} month={month:%Y-%m}: "
+                      f"ledger={have[0]}/{have[1]} payments={want[0]}/{want[1]}")
+        
+        if check_only:
+            print(f"Earnings ledger check: {len(expected)} rows expected, {mismatches} mismatched")
+        else:
+            repo.replace_ledger(expected, band_id)
+            db.commit()
+            print(f"Earnings ledger rebuilt: {len(expected)} rows written, {mismatches} corrected")
+        return mismatches
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the member earnings ledger from show payments")
+    parser.add_argument("--band-id", type=int, help="Only rebuild this band's ledger")
+    parser.add_argument("--check", action="store_true", help="Report mismatches without writing")
+    args = parser.parse_args()
+    
+    mismatches = rebuild_earnings(args.band_id, args.check)
+    if args.check and mismatches:
+        raise SystemExit(1)
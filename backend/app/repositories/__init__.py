@@ -32,8 +32,7 @@ class AuthRepository:
             google_id=google_id
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
         return user
     
     def create_band_with_member(self, band_name: str, user: User) -> Band:
@@ -51,7 +50,6 @@ class AuthRepository:
             is_active=True
         )
         self.db.add(band_member)
-        self.db.commit()
-        self.db.refresh(band)
+        self.db.flush()
         
         return band
\ No newline at end of file
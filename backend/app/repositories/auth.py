@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.models.user import User
 from app.models.band import Band
 from app.models.band_member import BandMember
+from app.utils.cache import forget_current_user
 from typing import Optional
 
 
@@ -32,8 +33,13 @@ class AuthRepository:
             google_id=google_id
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.flush()
+        return user
+    
+    def update_password_hash(self, user: User, hashed_password: str) -> User:
+        """Replace a user's password hash (e.g. after a work factor change)"""
+        user.hashed_password = hashed_password
+        self.db.flush()
         return user
     
     def create_band_with_member(self, band_name: str, user: User) -> Band:
@@ -51,7 +57,7 @@ class AuthRepository:
             is_active=True
         )
         self.db.add(band_member)
-        self.db.commit()
-        self.db.refresh(band)
+        self.db.flush()
+        forget_current_user(self.db, user.id)
         
         return band
\ No newline at end of file
@@ -1,8 +1,11 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import exists
 from app.models.band import Band
 from app.models.band_member import BandMember
 from app.models.user import User
+from app.repositories.earnings import EarningsRepository
 from app.schemas.band import BandUpdate
+from app.utils.cache import forget_membership, forget_current_user
 from typing import Optional, List
 from datetime import datetime
 
@@ -29,8 +32,8 @@ class BandRepository:
             is_active=True
         )
         self.db.add(band_member)
-        self.db.commit()
-        self.db.refresh(band)
+        self.db.flush()
+        forget_current_user(self.db, user.id)
         
         return band
     
@@ -38,6 +41,14 @@ class BandRepository:
         """Get band by ID"""
         return self.db.query(Band).filter(Band.id == band_id).first()
     
+    def band_exists(self, band_id: int) -> bool:
+        """Check whether a band exists without loading it"""
+        return self.db.query(exists().where(Band.id == band_id)).scalar()
+    
+    def get_data_version(self, band_id: int) -> Optional[int]:
+        """Get the band's data version without loading the band"""
+        return self.db.query(Band.data_version).filter(Band.id == band_id).scalar()
+    
     def get_user_bands(self, user_id: int) -> List[Band]:
         """Get all bands for a user"""
         return self.db.query(Band).join(BandMember).filter(
@@ -56,14 +67,27 @@ class BandRepository:
                 setattr(band, field, value)
             
             band.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(band)
+            self.db.flush()
             print(f"DEBUG: band after update = {band.name}, {band.description}, {band.logo}")  # Add this
         return band
     
+    def set_logo(self, band_id: int, logo: Optional[str]) -> Optional[Band]:
+        """Set or clear the band logo URL"""
+        band = self.get_band_by_id(band_id)
+        if band:
+            band.logo = logo
+            band.updated_at = datetime.utcnow()
+            self.db.flush()
+        return band
+    
     def delete_band(self, band_id: int) -> None:
         """Delete a band"""
         band = self.get_band_by_id(band_id)
         if band:
+            user_ids = [m.user_id for m in band.members if m.user_id]
+            EarningsRepository(self.db).delete_band_ledger(band_id)
             self.db.delete(band)
-            self.db.commit()
\ No newline at end of file
+            self.db.flush()
+            forget_membership(self.db, band_id)
+            for user_id in user_ids:
+                forget_current_user(self.db, user_id)
\ No newline at end of file
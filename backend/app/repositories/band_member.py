@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from app.models.band_member import BandMember
+from app.utils.cache import forget_membership, forget_current_user
 from typing import Optional, List
 
 
@@ -22,14 +23,25 @@ class BandMemberRepository:
             is_active=True
         )
         self.db.add(member)
-        self.db.commit()
-        self.db.refresh(member)
+        self.db.flush()
         return member
     
     def get_member_by_id(self, member_id: int) -> Optional[BandMember]:
         """Get member by ID"""
         return self.db.query(BandMember).filter(BandMember.id == member_id).first()
     
+    def get_active_role(self, band_id: int, user_id: int) -> Optional[str]:
+        """Get a registered user's role in a band ("admin" or "member"), or None if not an active member"""
+        row = self.db.query(BandMember.is_admin).filter(
+            BandMember.band_id == band_id,
+            BandMember.user_id == user_id,
+            BandMember.is_active == True
+        ).order_by(BandMember.is_admin.desc()).first()
+        
+        if row is None:
+            return None
+        return "admin" if row.is_admin else "member"
+    
     def get_band_members(self, band_id: int) -> List[BandMember]:
         """Get all members for a band"""
         return self.db.query(BandMember).filter(
@@ -59,8 +71,9 @@ class BandMemberRepository:
             for key, value in kwargs.items():
                 if value is not None and hasattr(member, key):
                     setattr(member, key, value)
-            self.db.commit()
-            self.db.refresh(member)
+            self.db.flush()
+            if member.user_id:
+                forget_membership(self.db, member.band_id, member.user_id)
         return member
     
     def link_user_to_member(self, member_id: int, user_id: int) -> Optional[BandMember]:
@@ -68,8 +81,9 @@ class BandMemberRepository:
         member = self.get_member_by_id(member_id)
         if member:
             member.user_id = user_id
-            self.db.commit()
-            self.db.refresh(member)
+            self.db.flush()
+            forget_membership(self.db, member.band_id, user_id)
+            forget_current_user(self.db, user_id)
         return member
     
     def delete_member(self, member_id: int) -> bool:
@@ -77,6 +91,8 @@ class BandMemberRepository:
         member = self.get_member_by_id(member_id)
         if member:
             member.is_active = False
-            self.db.commit()
+            self.db.flush()
+            if member.user_id:
+                forget_membership(self.db, member.band_id, member.user_id)
             return True
         return False
\ No newline at end of file
@@ -0,0 +1,164 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.member_earning import MemberEarning
+from app.models.show import Show
+from app.models.show_payment import ShowPayment
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
+from decimal import Decimal
+
+LedgerKey = Tuple[int, str, date]
+
+
+def month_start(day: date) -> date:
+    """First day of the month a show date falls in"""
+    return day.replace(day=1)
+
+
+class EarningsRepository:
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def apply(self, band_id: int, member_name: str, month: date, amount: Decimal, count: int) -> None:
+        """Add (or with negative values, subtract) payouts to a ledger row; the caller commits"""
+        self.apply_many(band_id, month, [(member_name, amount, count)])
+    
+    def apply_many(self, band_id: int, month: date, entries: List[Tuple[str, Decimal, int]]) -> None:
+        """Apply (member_name, amount, count) deltas for one band and month in a single upsert"""
+        if not entries:
+            return
+        table = MemberEarning.__table__
+        dialect = self.db.get_bind().dialect.name
+        now = datetime.utcnow()
+        values = [
+            {
+                "band_id": band_id,
+                "member_name": member_name,
+                "month": month,
+                "total_amount": amount,
+                "payment_count": count,
+                "updated_at": now,
+            }
+            for member_name, amount, count in entries
+        ]
+        
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = insert(table).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["band_id", "member_name", "month"],
+                set_={
+                    "total_amount": table.c.total_amount + stmt.excluded.total_amount,
+                    "payment_count": table.c.payment_count + stmt.excluded.payment_count,
+                    "updated_at": stmt.excluded.updated_at,
+                }
+            )
+            self.db.execute(stmt)
+        else:
+            for row in values:
+                updated = self.db.execute(
+                    table.update().where(
+                        table.c.band_id == band_id,
+                        table.c.member_name == row["member_name"],
+                        table.c.month == month
+                    ).values(
+                        total_amount=table.c.total_amount + row["total_amount"],
+                        payment_count=table.c.payment_count + row["payment_count"],
+                        updated_at=now
+                    )
+                ).rowcount
+                if not updated:
+                    self.db.execute(table.insert().values(**row))
+        
+        emptied = [member_name for member_name, _, count in entries if count < 0]
+        if emptied:
+            self.db.execute(
+                delete(MemberEarning).where(
+                    MemberEarning.band_id == band_id,
+                    MemberEarning.member_name.in_(emptied),
+                    MemberEarning.month == month,
+                    MemberEarning.payment_count <= 0
+                )
+            )
+    
+    def apply_show(self, show_id: int, band_id: int, show_date: date, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) every payment of a show from the ledger"""
+        rows = self.db.query(
+            ShowPayment.member_name,
+            func.sum(ShowPayment.amount).label("amount"),
+            func.count(ShowPayment.id).label("count")
+        ).filter(
+            ShowPayment.show_id == show_id
+        ).group_by(ShowPayment.member_name).all()
+        
+        self.apply_many(band_id, month_start(show_date), [
+            (row.member_name, Decimal(row.amount) * sign, row.count * sign) for row in rows
+        ])
+    
+    def get_band_earnings(self, band_id: int, start: Optional[date] = None,
+                          end: Optional[date] = None) -> List[MemberEarning]:
+        """Ledger rows for a band, optionally limited to the months overlapping [start, end]"""
+        query = self.db.query(MemberEarning).filter(MemberEarning.band_id == band_id)
+        if start is not None:
+            query = query.filter(MemberEarning.month >= month_start(start))
+        if end is not None:
+            query = query.filter(MemberEarning.month <= end)
+        return query.order_by(MemberEarning.member_name, MemberEarning.month).all()
+    
+    def compute_from_payments(self, band_id: Optional[int] = None) -> Dict[LedgerKey, Tuple[Decimal, int]]:
+        """Recompute ledger totals from show_payments (used by the rebuild command)"""
+        query = self.db.query(
+            Show.band_id,
+            ShowPayment.member_name,
+            Show.show_date,
+            func.sum(ShowPayment.amount).label("amount"),
+            func.count(ShowPayment.id).label("count")
+        ).join(
+            Show, Show.id == ShowPayment.show_id
+        ).group_by(Show.band_id, ShowPayment.member_name, Show.show_date)
+        if band_id is not None:
+            query = query.filter(Show.band_id == band_id)
+        
+        totals: Dict[LedgerKey, Tuple[Decimal, int]] = {}
+        for row in query.yield_per(1000):
+            key = (row.band_id, row.member_name, month_start(row.show_date))
+            amount, count = totals.get(key, (Decimal("0"), 0))
+            totals[key] = (amount + Decimal(row.amount), count + row.count)
+        return totals
+    
+    def get_ledger(self, band_id: Optional[int] = None) -> Dict[LedgerKey, Tuple[Decimal, int]]:
+        """Current ledger contents keyed by (band_id, member_name, month)"""
+        query = self.db.query(MemberEarning)
+        if band_id is not None:
+            query = query.filter(MemberEarning.band_id == band_id)
+        return {
+            (row.band_id, row.member_name, row.month): (Decimal(row.total_amount), row.payment_count)
+            for row in query.all()
+        }
+    
+    def replace_ledger(self, totals: Dict[LedgerKey, Tuple[Decimal, int]], band_id: Optional[int] = None) -> None:
+        """Replace the ledger (for one band, or all) with the given totals"""
+        stmt = delete(MemberEarning)
+        if band_id is not None:
+            stmt = stmt.where(MemberEarning.band_id == band_id)
+        self.db.execute(stmt)
+        
+        now = datetime.utcnow()
+        self.db.add_all([
+            MemberEarning(
+                band_id=key[0],
+                member_name=key[1],
+                month=key[2],
+                total_amount=amount,
+                payment_count=count,
+                updated_at=now
+            )
+            for key, (amount, count) in totals.items()
+        ])
+        self.db.flush()
+    
+    def delete_band_ledger(self, band_id: int) -> None:
+        """Drop a band's ledger rows; the caller commits"""
+        self.db.execute(delete(MemberEarning).where(MemberEarning.band_id == band_id))
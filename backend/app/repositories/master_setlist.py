@@ -19,8 +19,7 @@ class MasterSetlistRepository:
             description=description
         )
         self.db.add(setlist)
-        self.db.commit()
-        self.db.refresh(setlist)
+        self.db.flush()
         return setlist
     
     def get_setlist_by_id(self, setlist_id: int) -> Optional[MasterSetlist]:
@@ -37,6 +36,16 @@ class MasterSetlistRepository:
             MasterSetlist.is_active == True
         ).order_by(MasterSetlist.name).all()
     
+    def get_band_setlists_by_ids(self, band_id: int, setlist_ids: List[int]) -> List[MasterSetlist]:
+        """Those of the given setlists that are active setlists of a band, in one query"""
+        if not setlist_ids:
+            return []
+        return self.db.query(MasterSetlist).filter(
+            MasterSetlist.id.in_(setlist_ids),
+            MasterSetlist.band_id == band_id,
+            MasterSetlist.is_active == True
+        ).all()
+    
     def get_setlist_with_song_count(self, setlist_id: int) -> Optional[tuple]:
         """Get setlist with song count"""
         result = self.db.query(
@@ -69,8 +78,7 @@ class MasterSetlistRepository:
             if description is not None:
                 setlist.description = description
             setlist.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(setlist)
+            self.db.flush()
         return setlist
     
     def delete_setlist(self, setlist_id: int) -> bool:
@@ -79,6 +87,6 @@ class MasterSetlistRepository:
         if setlist:
             setlist.is_active = False
             setlist.updated_at = datetime.utcnow()
-            self.db.commit()
+            self.db.flush()
             return True
         return False
\ No newline at end of file
@@ -0,0 +1,94 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from app.models.media_object import MediaObject
+from typing import Callable, Iterable, List, Optional, Set
+from datetime import datetime
+
+
+class MediaRepository:
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_by_sha256(self, sha256: str) -> Optional[MediaObject]:
+        """Get a stored media object by its content hash"""
+        return self.db.query(MediaObject).filter(MediaObject.sha256 == sha256).first()
+    
+    def get_by_url(self, url: str) -> Optional[MediaObject]:
+        """Get a stored media object by its public URL"""
+        return self.db.query(MediaObject).filter(MediaObject.url == url).first()
+    
+    def acquire(self, sha256: str, url: str, content_type: str, size: int) -> None:
+        """Add a reference to a media object, creating it on first use"""
+        if self._increment(sha256):
+            return
+        
+        try:
+            with self.db.begin_nested():
+                self.db.add(MediaObject(
+                    sha256=sha256,
+                    url=url,
+                    content_type=content_type,
+                    size=size,
+                    ref_count=1
+                ))
+        except IntegrityError:
+            # Another request stored the same content first; only the savepoint is undone
+            self._increment(sha256)
+    
+    def release(self, url: str) -> bool:
+        """Drop a reference to a media object; returns False if the URL is not tracked"""
+        updated = self.db.query(MediaObject).filter(
+            MediaObject.url == url,
+            MediaObject.ref_count > 0
+        ).update({
+            MediaObject.ref_count: MediaObject.ref_count - 1,
+            MediaObject.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        
+        return updated > 0 or self.get_by_url(url) is not None
+    
+    def get_unreferenced(self, cutoff: datetime) -> List[MediaObject]:
+        """Get media objects nobody has pointed at since the cutoff"""
+        return self.db.query(MediaObject).filter(
+            MediaObject.ref_count <= 0,
+            MediaObject.updated_at < cutoff
+        ).all()
+    
+    def purge(self, media_id: int, cutoff: datetime, remove_file: Callable[[str], None]) -> bool:
+        """
+        Delete an unreferenced media object and its file. The file is removed while
+        the row delete is still uncommitted, so a concurrent acquire of the same
+        content waits for this transaction and then stores the file again. The
+        caller commits, or rolls back if removing the file raised.
+        """
+        media = self.db.query(MediaObject).filter(
+            MediaObject.id == media_id,
+            MediaObject.ref_count <= 0,
+            MediaObject.updated_at < cutoff
+        ).first()
+        if not media:
+            return False
+        
+        url = media.url
+        self.db.delete(media)
+        self.db.flush()
+        remove_file(url)
+        return True
+    
+    def get_known_urls(self, urls: Iterable[str]) -> Set[str]:
+        """Return which of the given URLs are tracked media objects"""
+        urls = list(urls)
+        if not urls:
+            return set()
+        rows = self.db.query(MediaObject.url).filter(MediaObject.url.in_(urls)).all()
+        return {row.url for row in rows}
+    
+    def _increment(self, sha256: str) -> bool:
+        updated = self.db.query(MediaObject).filter(
+            MediaObject.sha256 == sha256
+        ).update({
+            MediaObject.ref_count: MediaObject.ref_count + 1,
+            MediaObject.updated_at: datetime.utcnow()
+        }, synchronize_session=False)
+        return updated > 0
@@ -1,7 +1,19 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import update, case, func, insert, delete
+from app.models.master_setlist import MasterSetlist
 from app.models.setlist_song import SetlistSong
 from app.models.song import Song
-from typing import Optional, List
+from app.models.versioning import bump_band_versions, bump_setlist_versions
+from typing import Optional, List, Dict, Iterable
+
+# Spacing between neighbouring positions. A song inserted or moved between two
+# others takes the midpoint, so about log2(GAP) moves into the same spot fit
+# before the rows around that spot have to be spread out again.
+POSITION_GAP = 1024
+
+# When a spot runs out of midpoints, the rows around it are spread until
+# neighbours are at least this far apart again
+MIN_RESPACE_STEP = 16
 
 
 class SetlistSongRepository:
@@ -10,24 +22,37 @@ class SetlistSongRepository:
         self.db = db
     
     def add_song_to_setlist(self, setlist_id: int, song_id: int, position: Optional[int] = None) -> SetlistSong:
-        """Add a song to a setlist"""
-        # If no position provided, add to end
-        if position is None:
-            max_position = self.db.query(SetlistSong).filter(
-                SetlistSong.setlist_id == setlist_id
-            ).count()
-            position = max_position
-        
+        """Add a song to a setlist at a 0-based slot (default: the end)"""
         setlist_song = SetlistSong(
             setlist_id=setlist_id,
             song_id=song_id,
-            position=position
+            position=self._position_for_slot(setlist_id, position)
         )
         self.db.add(setlist_song)
-        self.db.commit()
-        self.db.refresh(setlist_song)
+        self.db.flush()
         return setlist_song
     
+    def append_songs(self, song_ids_by_setlist: Dict[int, List[int]]) -> None:
+        """
+        Append songs to the end of several setlists with one multi-row INSERT.
+        Does not bump versions; bulk callers do that once at the end.
+        """
+        song_ids_by_setlist = {k: v for k, v in song_ids_by_setlist.items() if v}
+        if not song_ids_by_setlist:
+            return
+        
+        last_positions = dict(self.db.query(SetlistSong.setlist_id, func.max(SetlistSong.position)).filter(
+            SetlistSong.setlist_id.in_(list(song_ids_by_setlist))
+        ).group_by(SetlistSong.setlist_id).all())
+        
+        rows = []
+        for setlist_id, song_ids in song_ids_by_setlist.items():
+            position = last_positions.get(setlist_id) or 0
+            for song_id in song_ids:
+                position += POSITION_GAP
+                rows.append({"setlist_id": setlist_id, "song_id": song_id, "position": position})
+        self.db.execute(insert(SetlistSong), rows)
+    
     def remove_song_from_setlist(self, setlist_id: int, song_id: int) -> bool:
         """Remove a song from a setlist"""
         setlist_song = self.db.query(SetlistSong).filter(
@@ -37,17 +62,39 @@ class SetlistSongRepository:
         
         if setlist_song:
             self.db.delete(setlist_song)
-            self.db.commit()
+            self.db.flush()
             return True
         return False
     
+    def set_song_setlists(self, song_id: int, add_setlist_ids: Iterable[int], remove_setlist_ids: Iterable[int]) -> None:
+        """
+        Change a song's setlist memberships with set-based statements: one DELETE for
+        the setlists it leaves and one multi-row INSERT appending it to the
+        tail of the setlists it joins.
+        """
+        add_setlist_ids, remove_setlist_ids = list(add_setlist_ids), list(remove_setlist_ids)
+        if not add_setlist_ids and not remove_setlist_ids:
+            return
+        
+        if remove_setlist_ids:
+            self.db.execute(
+                delete(SetlistSong)
+                .where(SetlistSong.song_id == song_id, SetlistSong.setlist_id.in_(remove_setlist_ids))
+            )
+        self.append_songs({setlist_id: [song_id] for setlist_id in add_setlist_ids})
+        
+        # Core statements bypass the flush hook that versions band data
+        changed = add_setlist_ids + remove_setlist_ids
+        bump_band_versions(self.db, setlist_ids=changed)
+        bump_setlist_versions(self.db, changed)
+    
     def get_setlist_songs(self, setlist_id: int) -> List[tuple]:
             """Get all songs in a setlist with their positions"""
             results = self.db.query(Song, SetlistSong.position).join(
                 SetlistSong, Song.id == SetlistSong.song_id
             ).filter(
                 SetlistSong.setlist_id == setlist_id
-            ).order_by(SetlistSong.position).all()
+            ).order_by(SetlistSong.position, SetlistSong.id).all()
             
             return results
     
@@ -62,24 +109,136 @@ class SetlistSongRepository:
         """Check if a song is already in a setlist"""
         return self.get_song_setlist_entry(setlist_id, song_id) is not None
     
-    def update_song_position(self, setlist_id: int, song_id: int, position: int) -> Optional[SetlistSong]:
-        """Update a song's position in a setlist"""
-        setlist_song = self.get_song_setlist_entry(setlist_id, song_id)
-        if setlist_song:
-            setlist_song.position = position
-            self.db.commit()
-            self.db.refresh(setlist_song)
-        return setlist_song
+    def move_song(self, setlist_id: int, song_id: int, slot: int, expected_version: int) -> bool:
+        """
+        Move a song to a 0-based slot among the setlist's other songs, rewriting
+        only its row. Compare-and-swaps the setlist's version like reorder_songs;
+        returns False (changing nothing) if another edit moved it past expected_version.
+        """
+        if not self._claim_version(setlist_id, expected_version):
+            return False
+        
+        self._write_positions(setlist_id, {
+            song_id: self._position_for_slot(setlist_id, slot, moving_song_id=song_id)
+        })
+        bump_band_versions(self.db, setlist_ids=[setlist_id])
+        return True
     
-    def reorder_songs(self, setlist_id: int, song_ids: List[int]) -> bool:
-        """Reorder all songs in a setlist based on provided order"""
-        for position, song_id in enumerate(song_ids):
-            setlist_song = self.get_song_setlist_entry(setlist_id, song_id)
-            if setlist_song:
-                setlist_song.position = position
-        self.db.commit()
+    def _position_for_slot(self, setlist_id: int, slot: Optional[int], moving_song_id: Optional[int] = None) -> int:
+        """
+        Position value that sorts a song into `slot` (None or past the end:
+        last) from the neighbouring rows alone. When the neighbours have no
+        gap left, the setlist is renumbered first.
+        """
+        query = self.db.query(SetlistSong.position).filter(SetlistSong.setlist_id == setlist_id)
+        if moving_song_id is not None:
+            query = query.filter(SetlistSong.song_id != moving_song_id)
+        ordered = query.order_by(SetlistSong.position, SetlistSong.id)
+        
+        lower = upper = None
+        if slot is not None and slot <= 0:
+            first = ordered.first()
+            upper = first[0] if first else None
+        elif slot is not None:
+            neighbours = [row[0] for row in ordered.offset(slot - 1).limit(2).all()]
+            if neighbours:
+                lower = neighbours[0]
+                upper = neighbours[1] if len(neighbours) > 1 else None
+        
+        if upper is None:
+            if lower is None:
+                lower = query.with_entities(func.max(SetlistSong.position)).scalar()
+            return POSITION_GAP if lower is None else lower + POSITION_GAP
+        if lower is None:
+            return upper - POSITION_GAP
+        if upper - lower > 1:
+            return (lower + upper) // 2
+        
+        # Midpoints between these neighbours are used up
+        self._respace_around(setlist_id, slot, moving_song_id)
+        return self._position_for_slot(setlist_id, slot, moving_song_id)
+    
+    def _respace_around(self, setlist_id: int, slot: int, moving_song_id: Optional[int] = None) -> None:
+        """
+        Spread out the smallest run of rows around `slot` that can be spaced
+        at least MIN_RESPACE_STEP apart inside its outer neighbours, so a
+        crowded spot rewrites a few rows rather than the whole setlist.
+        Does not bump versions: the insert or move that ran out of room does
+        that when it flushes.
+        """
+        query = self.db.query(SetlistSong.song_id, SetlistSong.position).filter(
+            SetlistSong.setlist_id == setlist_id
+        )
+        if moving_song_id is not None:
+            query = query.filter(SetlistSong.song_id != moving_song_id)
+        rows = query.order_by(SetlistSong.position, SetlistSong.id).all()
+        
+        width = 1
+        while True:
+            start, end = max(0, slot - width), min(len(rows), slot + width)
+            count = end - start
+            lower = rows[start - 1].position if start > 0 else None
+            upper = rows[end].position if end < len(rows) else None
+            if lower is None and upper is None:
+                positions = [(i + 1) * POSITION_GAP for i in range(count)]
+            elif lower is None:
+                positions = [upper - (count - i) * POSITION_GAP for i in range(count)]
+            elif upper is None:
+                positions = [lower + (i + 1) * POSITION_GAP for i in range(count)]
+            elif (upper - lower) // (count + 1) >= MIN_RESPACE_STEP:
+                step = (upper - lower) // (count + 1)
+                positions = [lower + (i + 1) * step for i in range(count)]
+            else:
+                width *= 2
+                continue
+            break
+        
+        self._write_positions(setlist_id, {
+            row.song_id: position for row, position in zip(rows[start:end], positions)
+        })
+    
+    def _write_positions(self, setlist_id: int, positions: Dict[int, int]) -> None:
+        """Set the positions of several songs (song id -> position) with one CASE UPDATE"""
+        if not positions:
+            return
+        self.db.execute(
+            update(SetlistSong)
+            .where(SetlistSong.setlist_id == setlist_id, SetlistSong.song_id.in_(list(positions)))
+            .values(position=case(positions, value=SetlistSong.song_id))
+            .execution_options(synchronize_session=False)
+        )
+    
+    def get_setlist_song_ids(self, setlist_id: int) -> List[int]:
+        """Get the IDs of the songs in a setlist, in position order"""
+        results = self.db.query(SetlistSong.song_id).filter(
+            SetlistSong.setlist_id == setlist_id
+        ).order_by(SetlistSong.position, SetlistSong.id).all()
+        return [r[0] for r in results]
+    
+    def reorder_songs(self, setlist_id: int, song_ids: List[int], expected_version: int) -> bool:
+        """
+        Set every song's position from its index in song_ids with one CASE
+        UPDATE (positions come out evenly spaced again). The setlist's version is
+        compare-and-swapped first; returns False (changing nothing) if another
+        edit moved it past expected_version.
+        """
+        if not self._claim_version(setlist_id, expected_version):
+            return False
+        
+        self._write_positions(setlist_id, {
+            song_id: (index + 1) * POSITION_GAP for index, song_id in enumerate(song_ids)
+        })
+        bump_band_versions(self.db, setlist_ids=[setlist_id])
         return True
     
+    def _claim_version(self, setlist_id: int, expected_version: int) -> bool:
+        """Increment the setlist's version if it is still expected_version"""
+        return bool(self.db.execute(
+            update(MasterSetlist)
+            .where(MasterSetlist.id == setlist_id, MasterSetlist.version == expected_version)
+            .values(version=MasterSetlist.version + 1)
+        ).rowcount)
+    
     def get_setlists_for_song(self, song_id: int) -> List[int]:
         """Get all setlist IDs that contain a song"""
         results = self.db.query(SetlistSong.setlist_id).filter(
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, select, literal, type_coerce, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
 from app.models.show import Show, ShowStatus
-from typing import Optional, List
+from app.repositories.earnings import EarningsRepository, month_start
+from typing import Optional, List, Tuple
 from datetime import date, time
 from decimal import Decimal
-import json
 
 
 class ShowRepository:
@@ -16,88 +18,88 @@ class ShowRepository:
                    show_members: Optional[List[str]] = None, payment: Optional[Decimal] = None,
                    band_fund_amount: Optional[Decimal] = None,
                    piece_count: Optional[int] = None, status: Optional[ShowStatus] = ShowStatus.UPCOMING,
-                   poster: Optional[str] = None, description: Optional[str] = None) -> Show:
+                   description: Optional[str] = None) -> Show:
         """Create a new show"""
-        # Convert show_members list to JSON string
-        show_members_json = json.dumps(show_members) if show_members else None
-        
         show = Show(
             band_id=band_id,
             venue=venue,
             show_date=show_date,
             show_time=show_time,
             event_manager=event_manager,
-            show_members=show_members_json,
+            show_members=show_members or None,
             payment=payment,
             band_fund_amount=band_fund_amount,
             piece_count=piece_count,
             status=status,
-            poster=poster,
             description=description
         )
         self.db.add(show)
-        self.db.commit()
-        self.db.refresh(show)
-        
-        # Convert JSON string back to list for response
-        if show.show_members:
-            try:
-                parsed = json.loads(show.show_members)
-                show.show_members = parsed if isinstance(parsed, list) else []
-            except (json.JSONDecodeError, TypeError):
-                show.show_members = []
-        
+        self.db.flush()
         return show
     
     def get_show_by_id(self, show_id: int) -> Optional[Show]:
         """Get show by ID"""
-        show = self.db.query(Show).filter(Show.id == show_id).first()
-        if show and show.show_members:
-            try:
-                parsed = json.loads(show.show_members)
-                # Ensure it's a list, not a dict or other type
-                show.show_members = parsed if isinstance(parsed, list) else []
-            except (json.JSONDecodeError, TypeError):
-                show.show_members = []
-        return show
+        return self.db.query(Show).filter(Show.id == show_id).first()
     
-    def get_band_shows(self, band_id: int) -> List[Show]:
-        """Get all shows for a band, ordered by date descending"""
-        shows = self.db.query(Show).filter(
-            Show.band_id == band_id
-        ).order_by(Show.show_date.desc()).all()
+    def get_band_shows(self, band_id: int, limit: Optional[int] = None, after: Optional[Tuple[date, int]] = None,
+                        start_date: Optional[date] = None, end_date: Optional[date] = None,
+                        status: Optional[ShowStatus] = None, member_name: Optional[str] = None) -> List[Show]:
+        """
+        Get a band's shows ordered by date descending, filtered in SQL. Keyset
+        paged: `after` is the (show_date, id) of the last show already returned.
+        """
+        query = self.db.query(Show).filter(Show.band_id == band_id)
+        
+        if start_date is not None:
+            query = query.filter(Show.show_date >= start_date)
+        if end_date is not None:
+            query = query.filter(Show.show_date <= end_date)
+        if status is not None:
+            query = query.filter(Show.status == status)
+        if member_name:
+            query = query.filter(self._played_by(member_name))
+        if after is not None:
+            query = query.filter(tuple_(Show.show_date, Show.id) < tuple_(*after))
         
-        # Convert JSON strings to lists
-        for show in shows:
-            if show.show_members:
-                try:
-                    parsed = json.loads(show.show_members)
-                    # Ensure it's a list, not a dict or other type
-                    show.show_members = parsed if isinstance(parsed, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    show.show_members = []
+        query = query.order_by(Show.show_date.desc(), Show.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    def _played_by(self, member_name: str):
+        """Filter criterion for shows whose show_members include a name"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            # JSONB containment (show_members @> '["name"]'), served by the GIN index
+            return type_coerce(Show.show_members, JSONB).contains([member_name])
         
-        return shows
+        # SQLite: expand the array with json_each
+        members = func.json_each(Show.show_members).table_valued("value")
+        return select(literal(1)).select_from(members).where(members.c.value == member_name).exists()
     
     def update_show(self, show_id: int, venue: Optional[str] = None,
                    show_date: Optional[date] = None, show_time: Optional[time] = None,
                    event_manager: Optional[str] = None, show_members: Optional[List[str]] = None,
                    payment: Optional[Decimal] = None, band_fund_amount: Optional[Decimal] = None,
                    piece_count: Optional[int] = None, status: Optional[ShowStatus] = None,
-                   poster: Optional[str] = None, description: Optional[str] = None) -> Optional[Show]:
+                   description: Optional[str] = None) -> Optional[Show]:
         """Update show details"""
         show = self.db.query(Show).filter(Show.id == show_id).first()
         if show:
             if venue is not None:
                 show.venue = venue
             if show_date is not None:
+                if month_start(show_date) != month_start(show.show_date):
+                    # Move the show's payouts to the new month's ledger rows
+                    earnings = EarningsRepository(self.db)
+                    earnings.apply_show(show.id, show.band_id, show.show_date, -1)
+                    earnings.apply_show(show.id, show.band_id, show_date, 1)
                 show.show_date = show_date
             if show_time is not None:
                 show.show_time = show_time
             if event_manager is not None:
                 show.event_manager = event_manager
             if show_members is not None:
-                show.show_members = json.dumps(show_members)
+                show.show_members = show_members
             if payment is not None:
                 show.payment = payment
             if band_fund_amount is not None:
@@ -106,40 +108,34 @@ class ShowRepository:
                 show.piece_count = piece_count
             if status is not None:
                 show.status = status
-            if poster is not None:
-                show.poster = poster
             if description is not None:
                 show.description = description
             
-            self.db.commit()
-            self.db.refresh(show)
-            
-            # Convert JSON string back to list for response
-            if show.show_members:
-                try:
-                    parsed = json.loads(show.show_members)
-                    # Ensure it's a list, not a dict or other type
-                    show.show_members = parsed if isinstance(parsed, list) else []
-                except (json.JSONDecodeError, TypeError):
-                    show.show_members = []
+            self.db.flush()
         
         return show
     
+    def set_poster(self, show_id: int, poster: Optional[str]) -> Optional[Show]:
+        """Set or clear the show poster URL"""
+        show = self.get_show_by_id(show_id)
+        if show:
+            show.poster = poster
+            self.db.flush()
+        return show
+    
     def delete_show(self, show_id: int) -> bool:
         """Delete a show"""
         show = self.db.query(Show).filter(Show.id == show_id).first()
         if show:
+            EarningsRepository(self.db).apply_show(show.id, show.band_id, show.show_date, -1)
             self.db.delete(show)
-            self.db.commit()
+            self.db.flush()
             return True
         return False
     
     def get_total_band_fund(self, band_id: int) -> Decimal:
         """Get total band fund amount for a band (sum of all shows' band_fund_amount)"""
-        shows = self.db.query(Show).filter(
-            Show.band_id == band_id,
-            Show.band_fund_amount.isnot(None)
-        ).all()
-        
-        total = sum(show.band_fund_amount for show in shows if show.band_fund_amount)
-        return total if total else Decimal('0')
\ No newline at end of file
+        total = self.db.query(
+            func.coalesce(func.sum(Show.band_fund_amount), 0)
+        ).filter(Show.band_id == band_id).scalar()
+        return Decimal(total)
\ No newline at end of file
@@ -1,6 +1,10 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func, tuple_, Row
+from app.models.show import Show
 from app.models.show_payment import ShowPayment
-from typing import Optional, List
+from app.repositories.earnings import EarningsRepository, month_start
+from typing import Optional, List, Tuple
+from datetime import datetime
 from decimal import Decimal
 
 
@@ -8,6 +12,12 @@ class ShowPaymentRepository:
     
     def __init__(self, db: Session):
         self.db = db
+        self.earnings = EarningsRepository(db)
+    
+    def _ledger_month(self, show_id: int):
+        """(band_id, ledger month) a show's payments are booked under"""
+        show = self.db.query(Show.band_id, Show.show_date).filter(Show.id == show_id).one()
+        return show.band_id, month_start(show.show_date)
     
     def create_payment(
         self,
@@ -24,19 +34,28 @@ class ShowPaymentRepository:
             notes=notes
         )
         self.db.add(payment)
-        self.db.commit()
-        self.db.refresh(payment)
+        
+        band_id, month = self._ledger_month(show_id)
+        self.earnings.apply(band_id, member_name, month, Decimal(payment.amount), 1)
+        
+        self.db.flush()
         return payment
     
     def get_payment_by_id(self, payment_id: int) -> Optional[ShowPayment]:
         """Get payment by ID"""
         return self.db.query(ShowPayment).filter(ShowPayment.id == payment_id).first()
     
-    def get_show_payments(self, show_id: int) -> List[ShowPayment]:
-        """Get all payments for a show"""
-        return self.db.query(ShowPayment).filter(
-            ShowPayment.show_id == show_id
-        ).order_by(ShowPayment.created_at.desc()).all()
+    def get_show_payments(self, show_id: int, limit: Optional[int] = None,
+                          after: Optional[Tuple[datetime, int]] = None) -> List[ShowPayment]:
+        """Get payments for a show, newest first; keyset paged after a (created_at, id) key"""
+        query = self.db.query(ShowPayment).filter(ShowPayment.show_id == show_id)
+        if after is not None:
+            query = query.filter(tuple_(ShowPayment.created_at, ShowPayment.id) < tuple_(*after))
+        
+        query = query.order_by(ShowPayment.created_at.desc(), ShowPayment.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
     
     def update_payment(
         self,
@@ -48,6 +67,7 @@ class ShowPaymentRepository:
         """Update payment details"""
         payment = self.db.query(ShowPayment).filter(ShowPayment.id == payment_id).first()
         if payment:
+            old_member, old_amount = payment.member_name, Decimal(payment.amount)
             if member_name is not None:
                 payment.member_name = member_name
             if amount is not None:
@@ -55,20 +75,63 @@ class ShowPaymentRepository:
             if notes is not None:
                 payment.notes = notes
             
-            self.db.commit()
-            self.db.refresh(payment)
+            new_amount = Decimal(payment.amount)
+            if payment.member_name != old_member or new_amount != old_amount:
+                band_id, month = self._ledger_month(payment.show_id)
+                self.earnings.apply(band_id, old_member, month, -old_amount, -1)
+                self.earnings.apply(band_id, payment.member_name, month, new_amount, 1)
+            
+            self.db.flush()
         return payment
     
     def delete_payment(self, payment_id: int) -> bool:
         """Delete a payment record"""
         payment = self.db.query(ShowPayment).filter(ShowPayment.id == payment_id).first()
         if payment:
+            band_id, month = self._ledger_month(payment.show_id)
+            self.earnings.apply(band_id, payment.member_name, month, -Decimal(payment.amount), -1)
             self.db.delete(payment)
-            self.db.commit()
+            self.db.flush()
             return True
         return False
     
     def get_total_payments_for_show(self, show_id: int) -> Decimal:
         """Get total of all member payments for a show"""
-        payments = self.get_show_payments(show_id)
-        return sum(p.amount for p in payments) if payments else Decimal('0')
\ No newline at end of file
+        total = self.db.query(
+            func.coalesce(func.sum(ShowPayment.amount), 0)
+        ).filter(ShowPayment.show_id == show_id).scalar()
+        return Decimal(total)
+    
+    def get_band_show_totals(self, band_id: int) -> List[Row]:
+        """Per-show payment, band fund and member payout totals for a band, newest show first"""
+        payouts = func.coalesce(func.sum(ShowPayment.amount), 0)
+        return self.db.query(
+            Show.id.label("show_id"),
+            Show.venue,
+            Show.show_date,
+            Show.status,
+            func.coalesce(Show.payment, 0).label("total_payment"),
+            func.coalesce(Show.band_fund_amount, 0).label("band_fund_amount"),
+            payouts.label("member_payouts"),
+            func.count(ShowPayment.id).label("payment_count")
+        ).outerjoin(
+            ShowPayment, ShowPayment.show_id == Show.id
+        ).filter(
+            Show.band_id == band_id
+        ).group_by(
+            Show.id
+        ).order_by(Show.show_date.desc(), Show.id.desc()).all()
+    
+    def get_band_member_payouts(self, band_id: int) -> List[Row]:
+        """Total paid to each member across all of a band's shows"""
+        return self.db.query(
+            ShowPayment.member_name,
+            func.sum(ShowPayment.amount).label("total_paid"),
+            func.count(func.distinct(ShowPayment.show_id)).label("show_count")
+        ).join(
+            Show, Show.id == ShowPayment.show_id
+        ).filter(
+            Show.band_id == band_id
+        ).group_by(
+            ShowPayment.member_name
+        ).order_by(ShowPayment.member_name).all()
\ No newline at end of file
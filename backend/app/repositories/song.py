@@ -1,9 +1,24 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import tuple_, func, or_, literal_column, insert, Row
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.models.song import Song
 from app.models.setlist_song import SetlistSong
 from app.models.master_setlist import MasterSetlist
-from typing import Optional, List
+from typing import Iterator, Optional, List, Tuple, Dict
 from datetime import datetime
+from collections import defaultdict
+
+# Columns a catalog summary needs; the text bodies (lyrics, chords, description) stay on disk
+SUMMARY_COLUMNS = (
+    Song.id, Song.band_id, Song.title, Song.scale, Song.genre,
+    Song.is_active, Song.created_at, Song.updated_at
+)
+
+# Columns the in-memory search index tokenizes or returns (lyrics_with_chords is not searched)
+SEARCH_COLUMNS = (
+    Song.id, Song.title, Song.genre, Song.scale, Song.is_active, Song.updated_at,
+    Song.lyrics, Song.description, Song.chord_structure
+)
 
 
 class SongRepository:
@@ -28,22 +43,84 @@ class SongRepository:
             is_active=is_active
         )
         self.db.add(song)
-        self.db.commit()
-        self.db.refresh(song)
+        self.db.flush()
         return song
     
+    def insert_songs(self, rows: List[dict]) -> List[int]:
+        """Insert many songs with multi-row INSERT statements and return their IDs in row order"""
+        if not rows:
+            return []
+        return list(self.db.scalars(
+            insert(Song).returning(Song.id, sort_by_parameter_order=True),
+            rows
+        ))
+    
     def get_song_by_id(self, song_id: int) -> Optional[Song]:
         """Get song by ID (including inactive)"""
         return self.db.query(Song).filter(Song.id == song_id).first()
     
-    def get_band_songs(self, band_id: int, include_inactive: bool = True) -> List[Song]:
-        """Get all songs for a band"""
+    def get_band_songs(self, band_id: int, limit: Optional[int] = None, after: Optional[Tuple[str, int]] = None,
+                       genre: Optional[str] = None, scale: Optional[str] = None,
+                       is_active: Optional[bool] = None, summary: bool = False) -> List[Song]:
+        """
+        Get a band's songs ordered by title, filtered in SQL. Keyset paged:
+        `after` is the (title, id) of the last song already returned. With
+        summary=True only SUMMARY_COLUMNS are selected; touching any other
+        attribute raises instead of lazy-loading row by row.
+        """
         query = self.db.query(Song).filter(Song.band_id == band_id)
+        if summary:
+            query = query.options(load_only(*SUMMARY_COLUMNS, raiseload=True))
+        
+        if genre is not None:
+            query = query.filter(Song.genre == genre)
+        if scale is not None:
+            query = query.filter(Song.scale == scale)
+        if is_active is not None:
+            query = query.filter(Song.is_active == is_active)
+        if after is not None:
+            query = query.filter(tuple_(Song.title, Song.id) > tuple_(*after))
         
-        if not include_inactive:
-            query = query.filter(Song.is_active == True)
+        query = query.order_by(Song.title, Song.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    def get_band_song_stamps(self, band_id: int) -> Dict[int, Optional[datetime]]:
+        """(song id -> updated_at) for a band, without loading song bodies"""
+        return dict(self.db.query(Song.id, Song.updated_at).filter(Song.band_id == band_id).all())
+    
+    def iter_search_rows(self, band_id: int, song_ids: Optional[List[int]] = None,
+                         batch_size: int = 500) -> Iterator[Row]:
+        """
+        SEARCH_COLUMNS of a band's songs (or just song_ids) as plain rows,
+        fetched batch_size at a time so a catalog is never loaded all at once
+        """
+        query = self.db.query(*SEARCH_COLUMNS).filter(Song.band_id == band_id)
+        if song_ids is None:
+            yield from query.yield_per(batch_size)
+            return
+        for i in range(0, len(song_ids), batch_size):
+            yield from query.filter(Song.id.in_(song_ids[i:i + batch_size])).all()
+    
+    def search_songs(self, band_id: int, tsquery: Optional[str], text: str, limit: int,
+                     is_active: Optional[bool] = None) -> List[Row]:
+        """
+        Postgres full-text search over songs.search_vector plus trigram title
+        similarity, best matches first. Rows are (Song, score).
+        """
+        vector = literal_column("songs.search_vector", TSVECTOR)
+        score = func.similarity(Song.title, text)
+        matches = Song.title.op("%")(text)
+        if tsquery is not None:
+            query = func.to_tsquery("simple", tsquery)
+            score = func.ts_rank(vector, query) + score
+            matches = or_(vector.op("@@")(query), matches)
         
-        return query.order_by(Song.title).all()
+        search = self.db.query(Song, score.label("score")).filter(Song.band_id == band_id, matches)
+        if is_active is not None:
+            search = search.filter(Song.is_active == is_active)
+        return search.order_by(score.desc(), Song.title, Song.id).limit(limit).all()
     
     def get_song_with_setlists(self, song_id: int) -> Optional[tuple]:
         """Get song with its setlists"""
@@ -56,17 +133,29 @@ class SongRepository:
             return song, setlists
         return None
     
-    def get_band_songs_with_setlists(self, band_id: int, include_inactive: bool = True) -> List[tuple]:
-        """Get all songs for a band with their setlists"""
-        songs = self.get_band_songs(band_id, include_inactive)
-        result = []
-        for song in songs:
-            setlists = self.db.query(MasterSetlist).join(SetlistSong).filter(
-                SetlistSong.song_id == song.id,
-                MasterSetlist.is_active == True
-            ).all()
-            result.append((song, setlists))
-        return result
+    def get_band_songs_with_setlists(self, band_id: int, limit: Optional[int] = None,
+                                     after: Optional[Tuple[str, int]] = None, genre: Optional[str] = None,
+                                     scale: Optional[str] = None, is_active: Optional[bool] = None,
+                                     summary: bool = False) -> List[tuple]:
+        """Get a page of a band's songs with their setlists (two queries regardless of page size)"""
+        songs = self.get_band_songs(band_id, limit, after, genre, scale, is_active, summary)
+        if not songs:
+            return []
+        
+        # Load the page's active setlist memberships in one pass and group by song
+        memberships = self.db.query(SetlistSong.song_id, MasterSetlist).join(
+            MasterSetlist, MasterSetlist.id == SetlistSong.setlist_id
+        ).filter(
+            MasterSetlist.band_id == band_id,
+            MasterSetlist.is_active == True,
+            SetlistSong.song_id.in_([song.id for song in songs])
+        ).all()
+        
+        setlists_by_song = defaultdict(list)
+        for song_id, setlist in memberships:
+            setlists_by_song[song_id].append(setlist)
+        
+        return [(song, setlists_by_song.get(song.id, [])) for song in songs]
     
     def update_song(self, song_id: int, title: Optional[str] = None,
                     description: Optional[str] = None, scale: Optional[str] = None,
@@ -95,8 +184,7 @@ class SongRepository:
             if is_active is not None:
                 song.is_active = is_active
             song.updated_at = datetime.utcnow()
-            self.db.commit()
-            self.db.refresh(song)
+            self.db.flush()
         return song
     
     def delete_song(self, song_id: int) -> bool:
@@ -105,6 +193,6 @@ class SongRepository:
         if song:
             song.is_active = False
             song.updated_at = datetime.utcnow()
-            self.db.commit()
+            self.db.flush()
             return True
         return False
\ No newline at end of file
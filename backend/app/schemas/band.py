@@ -13,7 +13,6 @@ class BandCreate(BaseModel):
 
 class BandUpdate(BaseModel):
     name: Optional[str] = None
-    logo: Optional[str] = None
     established_date: Optional[date] = None
     description: Optional[str] = None
 
@@ -20,6 +20,7 @@ class MasterSetlistResponse(BaseModel):
     name: str
     description: Optional[str] = None
     is_active: bool
+    version: int = 0
     created_at: datetime
     updated_at: datetime
     song_count: Optional[int] = 0
@@ -38,7 +39,7 @@ class SongBriefResponse(BaseModel):
     title: str
     scale: Optional[str] = None
     genre: Optional[str] = None
-    position: Optional[int] = 0
+    position: Optional[int] = 0  # 0-based slot in the setlist, not the stored sort key
     
     class Config:
         from_attributes = True
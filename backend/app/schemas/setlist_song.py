@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List
 
@@ -14,11 +14,13 @@ class SetlistSongRemove(BaseModel):
 
 class SetlistSongUpdatePosition(BaseModel):
     song_id: int
-    position: int
+    position: int = Field(ge=0)  # 0-based slot among the setlist's other songs
+    version: int  # Setlist version the client moved from; a stale one is rejected with 409
 
 
 class SetlistSongReorder(BaseModel):
-    song_ids: List[int]  # Ordered list of song IDs
+    song_ids: List[int]  # Ordered list of song IDs, exactly the setlist's songs
+    version: int  # Setlist version the client reordered; a stale one is rejected with 409
 
 
 class SetlistSongResponse(BaseModel):
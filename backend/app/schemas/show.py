@@ -1,8 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime, date, time
 from typing import Optional, List
 from decimal import Decimal
 from enum import Enum
+import json
 
 
 class ShowStatus(str, Enum):
@@ -23,7 +24,6 @@ class ShowCreate(BaseModel):
     band_fund_amount: Optional[Decimal] = None  # Amount saved for band fund
     piece_count: Optional[int] = None
     status: Optional[ShowStatus] = ShowStatus.UPCOMING
-    poster: Optional[str] = None
     description: Optional[str] = None
 
 
@@ -37,7 +37,6 @@ class ShowUpdate(BaseModel):
     band_fund_amount: Optional[Decimal] = None  # Amount saved for band fund
     piece_count: Optional[int] = None
     status: Optional[ShowStatus] = None
-    poster: Optional[str] = None
     description: Optional[str] = None
 
 
@@ -58,5 +57,20 @@ class ShowResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
+    @field_validator("show_members", mode="before")
+    @classmethod
+    def decode_show_members(cls, value):
+        """Normalize stored show_members to a list of names (legacy rows may hold JSON text)"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return []
+        if not isinstance(value, list):
+            return []
+        return [str(name) for name in value if name is not None]
+    
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, date
+from typing import Optional, List
 from decimal import Decimal
+from app.schemas.show import ShowStatus
 
 
 class ShowPaymentCreate(BaseModel):
@@ -26,4 +27,53 @@ class ShowPaymentResponse(BaseModel):
     updated_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ShowFinanceSummary(BaseModel):
+    show_id: int
+    venue: str
+    show_date: date
+    status: ShowStatus
+    total_payment: Decimal
+    band_fund_amount: Decimal
+    member_payouts: Decimal
+    payment_count: int
+    outstanding: Decimal  # total_payment - band_fund_amount - member_payouts
+
+
+class MemberPayoutSummary(BaseModel):
+    member_name: str
+    total_paid: Decimal
+    show_count: int
+
+
+class BandFinanceSummary(BaseModel):
+    band_id: int
+    total_payment: Decimal
+    total_band_fund: Decimal
+    total_member_payouts: Decimal
+    total_outstanding: Decimal
+    shows: List[ShowFinanceSummary]
+    members: List[MemberPayoutSummary]
+
+
+class MonthlyEarning(BaseModel):
+    month: date  # First day of the month
+    total_amount: Decimal
+    payment_count: int
+
+
+class MemberEarningsSummary(BaseModel):
+    member_name: str
+    total_amount: Decimal
+    payment_count: int
+    months: List[MonthlyEarning]
+
+
+class BandEarnings(BaseModel):
+    band_id: int
+    start: Optional[date] = None
+    end: Optional[date] = None
+    total_amount: Decimal
+    members: List[MemberEarningsSummary]
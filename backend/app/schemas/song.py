@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 class SongCreate(BaseModel):
@@ -48,7 +48,50 @@ class SongWithSetlistsResponse(SongResponse):
     setlists: List["SetlistBriefResponse"] = []
 
 
+class SongSummaryResponse(BaseModel):
+    """Catalog row without the text bodies; full content comes from GET /songs/{id}"""
+    id: int
+    band_id: int
+    title: str
+    scale: Optional[str] = None
+    genre: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class SongSummaryWithSetlistsResponse(SongSummaryResponse):
+    setlists: List["SetlistBriefResponse"] = []
+
+
+class SongSearchResult(BaseModel):
+    id: int
+    title: str
+    genre: Optional[str] = None
+    scale: Optional[str] = None
+    is_active: bool
+    score: float
+    snippet_field: Optional[str] = None  # "lyrics", "description" or "chord_structure"; None for title-only matches
+    snippet: str = ""
+    highlights: List[Tuple[int, int]] = []  # [start, end) offsets of matched words within snippet
+
+
 # Brief setlist response for nested use
+class SongImportError(BaseModel):
+    row: int  # 1-based record number in the file (CSV: data row after the header)
+    title: Optional[str] = None
+    detail: str
+
+
+class SongImportResult(BaseModel):
+    created: int  # Songs inserted, or that would be with dry_run
+    dry_run: bool = False
+    errors: List[SongImportError] = []
+
+
 class SetlistBriefResponse(BaseModel):
     id: int
     name: str
@@ -58,4 +101,5 @@ class SetlistBriefResponse(BaseModel):
 
 
 # Update forward reference
-SongWithSetlistsResponse.model_rebuild()
\ No newline at end of file
+SongWithSetlistsResponse.model_rebuild()
+SongSummaryWithSetlistsResponse.model_rebuild()
\ No newline at end of file
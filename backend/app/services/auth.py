@@ -2,10 +2,11 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.auth import AuthRepository
 from app.schemas.auth import UserSignup, UserLogin, Token, UserResponse
-from app.utils.auth import verify_password, get_password_hash, create_access_token
-from datetime import timedelta
-from app.config import settings
+from app.database import SessionRunner
+from app.utils.auth import password_hasher, password_needs_rehash, PasswordHasherBusy, create_access_token
+from app.utils.cache import current_user_cache
 from app.repositories.band_member import BandMemberRepository
+from app.models.user import User
 
 
 class AuthService:
@@ -14,8 +15,8 @@ class AuthService:
         self.db = db
         self.auth_repo = AuthRepository(db)
     
-    def signup(self, signup_data: UserSignup) -> Token:
-        """Register a new user (without creating a band)"""
+    def signup(self, signup_data: UserSignup, hashed_password: str) -> Token:
+        """Register a new user (without creating a band) with an already hashed password"""
         # Check if user already exists
         existing_user = self.auth_repo.get_user_by_email(signup_data.email)
         if existing_user:
@@ -25,7 +26,6 @@ class AuthService:
             )
         
         # Create user
-        hashed_password = get_password_hash(signup_data.password)
         user = self.auth_repo.create_user(
             email=signup_data.email,
             name=signup_data.name,
@@ -46,37 +46,22 @@ class AuthService:
         
         return Token(access_token=access_token)
     
-    def login(self, login_data: UserLogin) -> Token:
-        """Login user with email and password"""
-        # Get user
-        user = self.auth_repo.get_user_by_email(login_data.email)
+    def get_password_user(self, email: str) -> User:
+        """The user logging in with a password, or 401"""
+        user = self.auth_repo.get_user_by_email(email)
         
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password"
-            )
-        
-        # Verify password
-        if not user.hashed_password or not verify_password(login_data.password, user.hashed_password):
+        if not user or not user.hashed_password:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
-        
-        # Check if user is active
-        if not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Account is inactive"
-            )
-        
-        # Create access token
-        access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email}
-        )
-        
-        return Token(access_token=access_token)
+        return user
+    
+    def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        """Store a rehashed password"""
+        user = self.auth_repo.get_user_by_id(user_id)
+        if user:
+            self.auth_repo.update_password_hash(user, hashed_password)
     
     def google_auth(self, google_id: str, email: str, name: str) -> Token:
         """
@@ -93,8 +78,7 @@ class AuthService:
             if user:
                 # User exists with email, link Google account
                 user.google_id = google_id
-                self.db.commit()
-                self.db.refresh(user)
+                self.db.flush()
             else:
                 # New user - create account
                 user = self.auth_repo.create_user(
@@ -143,4 +127,68 @@ class AuthService:
         user_response = UserResponse.model_validate(user)
         user_response.has_band = has_band
         
-        return user_response
\ No newline at end of file
+        current_user_cache.set(user_id, user_response)
+        return user_response
+
+
+async def hash_password(password: str) -> str:
+    """bcrypt on the hasher's own pool; 503 when its queue is full"""
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly"
+        )
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """bcrypt verify on the hasher's own pool; 503 when its queue is full"""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly"
+        )
+
+
+async def signup(db: SessionRunner, signup_data: UserSignup) -> Token:
+    """Hash first, then register in one unit of work, so bcrypt never runs inside db.run"""
+    hashed_password = await hash_password(signup_data.password)
+    return await db.run(lambda session: AuthService(session).signup(signup_data, hashed_password))
+
+
+async def login(db: SessionRunner, login_data: UserLogin) -> Token:
+    """
+    Login with email and password. bcrypt is awaited between units of work,
+    so a login waiting for a hasher worker holds neither a request thread
+    nor a database connection.
+    """
+    user = await db.run(lambda session: AuthService(session).get_password_user(login_data.email))
+    
+    # Verify password
+    if not await check_password(login_data.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password"
+        )
+    
+    # Check if user is active
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is inactive"
+        )
+    
+    # Upgrade the stored hash if the configured work factor changed
+    if password_needs_rehash(user.hashed_password):
+        hashed_password = await hash_password(login_data.password)
+        await db.run(lambda session: AuthService(session).update_password_hash(user.id, hashed_password))
+    
+    # Create access token
+    access_token = create_access_token(
+        data={"sub": str(user.id), "email": user.email}
+    )
+    
+    return Token(access_token=access_token)
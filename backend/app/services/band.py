@@ -2,8 +2,11 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.band import BandRepository
 from app.repositories.auth import AuthRepository
+from app.services.band_access import BandAccessService
+from app.services.media import MediaService
+from app.services.upload import StoredUpload
 from app.schemas.band import BandCreate, BandResponse, BandUpdate
-from typing import List
+from typing import List, Optional
 
 
 class BandService:
@@ -12,6 +15,8 @@ class BandService:
         self.db = db
         self.band_repo = BandRepository(db)
         self.auth_repo = AuthRepository(db)
+        self.access = BandAccessService(db)
+        self.media = MediaService(db)
     
     def create_band(self, band_data: BandCreate, user_id: int) -> BandResponse:
         """Create a new band for the user"""
@@ -35,6 +40,9 @@ class BandService:
     
     def get_band(self, band_id: int, user_id: int) -> BandResponse:
         """Get a specific band"""
+        # Check if user is a member of this band
+        self.access.require_member(band_id, user_id)
+        
         band = self.band_repo.get_band_by_id(band_id)
         
         if not band:
@@ -43,23 +51,34 @@ class BandService:
                 detail="Band not found"
             )
         
-        # Check if user is a member of this band
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
+        return BandResponse.model_validate(band)
+    
+    def get_data_version(self, band_id: int, user_id: int) -> int:
+        """Get the version counter used to validate cached band data"""
+        self.access.require_member(band_id, user_id)
         
-        if not is_member:
+        version = self.band_repo.get_data_version(band_id)
+        if version is None:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Band not found"
             )
         
-        return BandResponse.model_validate(band)
+        return version
     
     def update_band(self, band_id: int, band_data: BandUpdate, user_id: int) -> BandResponse:
         """Update band details"""
         # Check if user is a member
+        self.access.require_member(band_id, user_id)
+        
+        # Update band
+        updated_band = self.band_repo.update_band(band_id, band_data)
+        return BandResponse.model_validate(updated_band)
+    
+    def replace_logo(self, band_id: int, upload: Optional[StoredUpload], user_id: int) -> BandResponse:
+        """Point the band at a new logo (or none) and release the old one"""
+        self.access.require_member(band_id, user_id)
+        
         band = self.band_repo.get_band_by_id(band_id)
         if not band:
             raise HTTPException(
@@ -67,40 +86,26 @@ class BandService:
                 detail="Band not found"
             )
         
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
+        old_logo = band.logo
+        new_logo = self.media.acquire(upload) if upload else None
+        updated_band = self.band_repo.set_logo(band_id, new_logo)
+        self.media.release(old_logo)
         
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
-        
-        # Update band
-        updated_band = self.band_repo.update_band(band_id, band_data)
         return BandResponse.model_validate(updated_band)
     
     def delete_band(self, band_id: int, user_id: int) -> None:
         """Delete a band"""
-        band = self.band_repo.get_band_by_id(band_id)
+        self.access.require_member(band_id, user_id)
         
+        band = self.band_repo.get_band_by_id(band_id)
         if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
+            return
         
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        # Shows and members are deleted with the band, so their media goes too
+        media_urls = [band.logo]
+        media_urls += [show.poster for show in band.shows]
+        media_urls += [member.profile_picture for member in band.members]
         
-        self.band_repo.delete_band(band_id)
\ No newline at end of file
+        self.band_repo.delete_band(band_id)
+        for url in media_urls:
+            self.media.release(url)
\ No newline at end of file
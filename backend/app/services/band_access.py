@@ -0,0 +1,59 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from app.repositories.band_member import BandMemberRepository
+from app.repositories.band import BandRepository
+from app.utils.cache import membership_cache, MEMBERSHIP_MEMO_KEY
+from typing import Optional
+
+
+class BandAccessService:
+    """
+    Single place that answers "is this user an active member (or admin) of this band?".
+    Results are memoized on the session for the rest of the request and kept in a
+    small process-wide TTL cache, so repeated checks cost zero or one indexed lookup.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.member_repo = BandMemberRepository(db)
+        self.band_repo = BandRepository(db)
+        self._memo = db.info.setdefault(MEMBERSHIP_MEMO_KEY, {})
+    
+    def get_role(self, band_id: int, user_id: int) -> Optional[str]:
+        """Get the user's role in the band ("admin" or "member"), or None"""
+        key = (user_id, band_id)
+        if key in self._memo:
+            return self._memo[key]
+        
+        role = membership_cache.get(key)
+        if role is None:
+            role = self.member_repo.get_active_role(band_id, user_id)
+            if role is not None:
+                membership_cache.set(key, role)
+        
+        self._memo[key] = role
+        return role
+    
+    def require_member(self, band_id: int, user_id: int) -> str:
+        """Raise 404/403 unless the user is an active member of the band"""
+        role = self.get_role(band_id, user_id)
+        if role is None:
+            self._deny(band_id, "You are not a member of this band")
+        return role
+    
+    def require_admin(self, band_id: int, user_id: int) -> None:
+        """Raise 404/403 unless the user is an active admin of the band"""
+        if self.get_role(band_id, user_id) != "admin":
+            self._deny(band_id, "Only admins can manage band members")
+    
+    def _deny(self, band_id: int, detail: str) -> None:
+        # Only pay for the existence check on the failure path
+        if not self.band_repo.band_exists(band_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Band not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.band_member import BandMemberRepository
 from app.repositories.band import BandRepository
+from app.services.band_access import BandAccessService
+from app.services.media import MediaService
+from app.services.upload import StoredUpload
 from app.schemas.band_member import BandMemberCreate, BandMemberUpdate, BandMemberResponse
 from typing import List
 
@@ -12,50 +15,12 @@ class BandMemberService:
         self.db = db
         self.member_repo = BandMemberRepository(db)
         self.band_repo = BandRepository(db)
-    
-    def _check_admin_access(self, band_id: int, user_id: int) -> None:
-        """Check if user is an admin of the band"""
-        band = self.band_repo.get_band_by_id(band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_admin = any(
-            member.user_id == user_id and member.is_admin and member.is_active
-            for member in band.members
-        )
-        
-        if not is_admin:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only admins can manage band members"
-            )
-    
-    def _check_member_access(self, band_id: int, user_id: int) -> None:
-        """Check if user is a member of the band"""
-        band = self.band_repo.get_band_by_id(band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_member = any(
-            member.user_id == user_id and member.is_active
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access = BandAccessService(db)
+        self.media = MediaService(db)
     
     def create_member(self, band_id: int, member_data: BandMemberCreate, user_id: int) -> BandMemberResponse:
         """Create a new band member (admin only)"""
-        self._check_admin_access(band_id, user_id)
+        self.access.require_admin(band_id, user_id)
         
         # Check if email already exists in this band
         if member_data.email:
@@ -79,7 +44,7 @@ class BandMemberService:
     
     def get_band_members(self, band_id: int, user_id: int) -> List[BandMemberResponse]:
         """Get all members of a band"""
-        self._check_member_access(band_id, user_id)
+        self.access.require_member(band_id, user_id)
         
         members = self.member_repo.get_band_members(band_id)
         return [BandMemberResponse.model_validate(m) for m in members]
@@ -93,7 +58,7 @@ class BandMemberService:
                 detail="Member not found"
             )
         
-        self._check_admin_access(member.band_id, user_id)
+        self.access.require_admin(member.band_id, user_id)
         
         update_data = member_data.model_dump(exclude_unset=True)
         updated_member = self.member_repo.update_member(member_id, **update_data)
@@ -109,7 +74,7 @@ class BandMemberService:
                 detail="Member not found"
             )
         
-        self._check_admin_access(member.band_id, user_id)
+        self.access.require_admin(member.band_id, user_id)
         
         # Prevent deleting yourself if you're the only admin
         if member.user_id == user_id:
@@ -121,4 +86,23 @@ class BandMemberService:
                     detail="Cannot remove the only admin. Transfer admin rights first."
                 )
         
-        return self.member_repo.delete_member(member_id)
\ No newline at end of file
+        return self.member_repo.delete_member(member_id)
+    
+    def replace_profile_picture(self, band_id: int, member_id: int, upload: StoredUpload,
+                                user_id: int) -> BandMemberResponse:
+        """Set a member's profile picture (admin only) and release the old one"""
+        self.access.require_admin(band_id, user_id)
+        
+        member = self.member_repo.get_member_by_id(member_id)
+        if not member or member.band_id != band_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Member not found"
+            )
+        
+        old_picture = member.profile_picture
+        new_picture = self.media.acquire(upload)
+        updated_member = self.member_repo.update_member(member_id, profile_picture=new_picture)
+        self.media.release(old_picture)
+        
+        return BandMemberResponse.model_validate(updated_member)
\ No newline at end of file
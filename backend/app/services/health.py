@@ -0,0 +1,237 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session, configure_mappers
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import engine, async_engine, SessionLocal, AsyncSessionLocal
+from app.repositories.auth import AuthRepository
+from app.repositories.band import BandRepository
+from app.repositories.band_member import BandMemberRepository
+from app.repositories.master_setlist import MasterSetlistRepository
+from app.repositories.song import SongRepository
+from app.services.upload import media_uploads, TEMP_SUFFIX
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+import asyncio
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+
+
+@dataclass
+class Lifecycle:
+    """Where the process is between startup and shutdown; readiness fails outside "serving" """
+    started: bool = False
+    draining: bool = False
+    warmup: Optional[dict] = None
+
+
+lifecycle = Lifecycle()
+
+# The database ping in flight, shared by concurrent readiness probes. A sync
+# ping stuck on the pool cannot be cancelled, so a timed-out probe leaves it
+# running and the next probe waits on it instead of tying up another thread.
+_pending_ping: Optional[asyncio.Future] = None
+
+
+def request_pool():
+    """Connection pool behind request handling (the async engine's when DB_ASYNC)"""
+    return async_engine.sync_engine.pool if async_engine is not None else engine.pool
+
+
+def _ping_sync() -> float:
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return time.perf_counter() - start
+
+
+async def _ping_async() -> float:
+    start = time.perf_counter()
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return time.perf_counter() - start
+
+
+def _first_line(exc: Exception) -> str:
+    message = str(exc).strip().splitlines()
+    return f"{type(exc).__name__}: {message[0]}" if message else type(exc).__name__
+
+
+async def check_database(timeout: float) -> dict:
+    """Run SELECT 1 on a pooled connection (pre-pinged on checkout) within timeout seconds"""
+    global _pending_ping
+    if _pending_ping is None or _pending_ping.done():
+        ping = _ping_async() if async_engine is not None else run_in_threadpool(_ping_sync)
+        _pending_ping = asyncio.ensure_future(ping)
+        # Nobody may be waiting any more when a slow ping finally fails
+        _pending_ping.add_done_callback(lambda future: future.cancelled() or future.exception())
+    
+    try:
+        seconds = await asyncio.wait_for(asyncio.shield(_pending_ping), timeout)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"No response within {timeout}s"}
+    except Exception as exc:
+        return {"ok": False, "error": _first_line(exc)}
+    return {"ok": True, "latency_ms": round(seconds * 1000, 2)}
+
+
+def check_upload_dir(directory: Path, min_free_mb: int) -> dict:
+    """Create and remove a file where uploads are written, and check the volume's free space"""
+    try:
+        # Named like an upload in progress so the media GC sweeps it if we die mid-check
+        fd, probe = tempfile.mkstemp(dir=directory, prefix=".ready-", suffix=TEMP_SUFFIX)
+        os.close(fd)
+        os.unlink(probe)
+        free_mb = shutil.disk_usage(directory).free // (1024 * 1024)
+    except OSError as exc:
+        return {"ok": False, "path": str(directory), "error": exc.strerror or str(exc)}
+    
+    return {
+        "ok": free_mb >= min_free_mb,
+        "path": str(directory),
+        "free_mb": free_mb,
+        "min_free_mb": min_free_mb,
+    }
+
+
+def check_pool(pool, max_saturation: float) -> dict:
+    """Connections in use against everything the pool may open (pool_size + max_overflow)"""
+    if not isinstance(pool, QueuePool):
+        return {"ok": True, "pooled": False}  # e.g. the NullPool aiosqlite uses in test runs
+    
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 1.0
+    return {
+        "ok": saturation < max_saturation,
+        "size": pool.size(),
+        "capacity": capacity,
+        "checked_out": checked_out,
+        "idle": pool.checkedin(),
+        "saturation": round(saturation, 3),
+    }
+
+
+def begin_draining(drain_seconds: float, stop: Callable[[], None]) -> None:
+    """Fail readiness now and call stop() once the load balancer has had drain_seconds to notice"""
+    if lifecycle.draining:
+        stop()  # A second SIGTERM does not wait again
+        return
+    lifecycle.draining = True
+    print(f"SIGTERM received: failing readiness for {drain_seconds}s before shutting down")
+    asyncio.get_running_loop().call_later(drain_seconds, stop)
+
+
+def install_drain_handler(drain_seconds: float) -> bool:
+    """
+    Handle SIGTERM by failing readiness first, while the server still accepts
+    connections, and only then raising SIGINT, which uvicorn treats as a
+    graceful shutdown. Needs the main thread's running loop, so it is not
+    installed under TestClient; returns whether it was.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, begin_draining, drain_seconds, lambda: signal.raise_signal(signal.SIGINT)
+        )
+    except (NotImplementedError, RuntimeError, ValueError):
+        return False
+    return True
+
+
+async def readiness_report() -> dict:
+    """Every readiness check; the process is ready only when all of them pass"""
+    if lifecycle.draining:
+        startup = {"ok": False, "error": "Shutting down"}
+    elif not lifecycle.started:
+        startup = {"ok": False, "error": "Starting up"}
+    else:
+        startup = {"ok": True, "warmup": lifecycle.warmup}
+    
+    checks = {
+        "startup": startup,
+        "database": await check_database(settings.HEALTH_DB_TIMEOUT_SECONDS),
+        "uploads": await run_in_threadpool(check_upload_dir, media_uploads.media_dir, settings.HEALTH_MIN_FREE_DISK_MB),
+        "pool": check_pool(request_pool(), settings.HEALTH_MAX_POOL_SATURATION),
+    }
+    ready = all(check["ok"] for check in checks.values())
+    return {"status": "ready" if ready else "not_ready", "checks": checks}
+
+
+def prime_statements(session: Session) -> int:
+    """
+    Configure the mappers and run the hot read queries (auth, membership,
+    ETag version, list pages) once against IDs that match nothing, so their
+    compiled SQL is in the engine's statement cache before real traffic.
+    """
+    configure_mappers()
+    queries = [
+        lambda: AuthRepository(session).get_user_by_id(0),
+        lambda: BandMemberRepository(session).get_active_role(0, 0),
+        lambda: BandRepository(session).get_data_version(0),
+        lambda: BandRepository(session).get_user_bands(0),
+        lambda: SongRepository(session).get_band_songs(0, limit=settings.DEFAULT_PAGE_SIZE),
+        lambda: MasterSetlistRepository(session).get_band_setlists_with_song_count(0),
+    ]
+    for query in queries:
+        query()
+    session.rollback()
+    return len(queries)
+
+
+def _warm_up_sync() -> dict:
+    connections = []
+    try:
+        # Held together so each checkout opens a new connection rather than reusing one
+        for _ in range(engine.pool.size() if isinstance(engine.pool, QueuePool) else 0):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    
+    with SessionLocal() as session:
+        statements = prime_statements(session)
+    return {"connections": len(connections), "statements": statements}
+
+
+async def _warm_up_async() -> dict:
+    pool = async_engine.sync_engine.pool
+    count = pool.size() if isinstance(pool, QueuePool) else 0
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(stack.enter_async_context(async_engine.connect()) for _ in range(count)))
+    
+    async with AsyncSessionLocal() as session:
+        statements = await session.run_sync(prime_statements)
+    return {"connections": count, "statements": statements}
+
+
+async def warm_up(timeout: float) -> Optional[dict]:
+    """
+    Pre-open pool_size connections of the request pool and prime the hot
+    statements, so the first requests after a deploy skip connection setup
+    and SQL compilation. Failures are logged, not fatal: readiness reports them.
+    """
+    start = time.perf_counter()
+    try:
+        if async_engine is not None:
+            result = await asyncio.wait_for(_warm_up_async(), timeout)
+        else:
+            result = await asyncio.wait_for(run_in_threadpool(_warm_up_sync), timeout)
+    except asyncio.TimeoutError:
+        print(f"Database warmup did not finish within {timeout}s")
+        return None
+    except Exception as e:
+        print(f"Database warmup failed: {str(e)}")
+        return None
+    
+    result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    print(f"Database warmup opened {result['connections']} connection(s) and primed "
+          f"{result['statements']} statement(s) in {result['ms']}ms")
+    return result
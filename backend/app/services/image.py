@@ -0,0 +1,115 @@
+from fastapi import HTTPException, status
+from PIL import Image, ImageOps
+from app.config import settings
+from app.services.upload import UPLOAD_ROOT, path_for_url
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+import asyncio
+import multiprocessing
+import os
+import threading
+
+# Variant name -> longest edge in pixels; every variant is stored as WebP
+IMAGE_VARIANTS = {
+    "thumb": 160,
+    "card": 480,
+    "large": 1280,
+}
+DERIVED_DIR = UPLOAD_ROOT / "derived"
+
+
+def derivative_path(sha256: str, variant: str) -> Path:
+    """Cache location of a resized WebP variant of a media object"""
+    return DERIVED_DIR / variant / sha256[:2] / f"{sha256}.webp"
+
+
+def remove_derivatives(sha256: str) -> None:
+    """Delete every cached variant of a media object"""
+    for variant in IMAGE_VARIANTS:
+        derivative_path(sha256, variant).unlink(missing_ok=True)
+
+
+def render_derivatives(source: str, sha256: str, variants: Iterable[str]) -> None:
+    """Resize an original into WebP variants (runs in a worker process)"""
+    # Uploads are checked too, but originals stored before the limit existed are not
+    Image.MAX_IMAGE_PIXELS = settings.IMAGE_MAX_PIXELS
+    with Image.open(source) as original:
+        if original.width * original.height > settings.IMAGE_MAX_PIXELS:
+            raise Image.DecompressionBombError(
+                f"{original.width}x{original.height} image is over IMAGE_MAX_PIXELS ({settings.IMAGE_MAX_PIXELS})"
+            )
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        
+        for variant in variants:
+            edge = IMAGE_VARIANTS[variant]
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+            
+            target = derivative_path(sha256, variant)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(f"{target.name}.{os.getpid()}.part")
+            resized.save(tmp_path, "WEBP", quality=settings.IMAGE_WEBP_QUALITY, method=4)
+            os.replace(tmp_path, target)
+
+
+class ImagePipeline:
+    """
+    Generates image variants on a process pool so resizing never holds the GIL
+    of the API workers. Variants are rendered eagerly after an upload and
+    lazily (on request) when a cached file is missing.
+    """
+    
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def schedule(self, sha256: str, url: str) -> None:
+        """Render all missing variants of an uploaded image in the background"""
+        source = path_for_url(url)
+        missing = [v for v in IMAGE_VARIANTS if not derivative_path(sha256, v).exists()]
+        if source is None or not missing:
+            return
+        future = self._pool().submit(render_derivatives, str(source), sha256, missing)
+        future.add_done_callback(self._log_failure)
+    
+    async def ensure(self, sha256: str, variant: str, source: Path) -> Path:
+        """Return the cached variant, regenerating it from the original if it is missing"""
+        target = derivative_path(sha256, variant)
+        if not target.exists():
+            future = self._pool().submit(render_derivatives, str(source), sha256, [variant])
+            try:
+                await asyncio.wrap_future(future)
+            except Image.DecompressionBombError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Image is too large to resize"
+                )
+        return target
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: the API process is multi-threaded, forking it is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+    
+    @staticmethod
+    def _log_failure(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Image variant generation failed: {str(future.exception())}")
+
+
+image_pipeline = ImagePipeline(settings.IMAGE_WORKERS)
@@ -2,11 +2,12 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.master_setlist import MasterSetlistRepository
 from app.repositories.setlist_song import SetlistSongRepository
-from app.repositories.band import BandRepository
+from app.services.band_access import BandAccessService
 from app.schemas.master_setlist import (
     MasterSetlistCreate, MasterSetlistUpdate, MasterSetlistResponse,
     MasterSetlistWithSongsResponse, SongBriefResponse
 )
+from app.schemas.setlist_song import SetlistSongReorder, SetlistSongUpdatePosition
 from typing import List
 
 
@@ -16,31 +17,11 @@ class MasterSetlistService:
         self.db = db
         self.setlist_repo = MasterSetlistRepository(db)
         self.setlist_song_repo = SetlistSongRepository(db)
-        self.band_repo = BandRepository(db)
-    
-    def _check_band_access(self, band_id: int, user_id: int) -> None:
-        """Check if user is a member of the band"""
-        band = self.band_repo.get_band_by_id(band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_member = any(
-            member.user_id == user_id and member.is_active
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access = BandAccessService(db)
     
     def create_setlist(self, setlist_data: MasterSetlistCreate, user_id: int) -> MasterSetlistResponse:
         """Create a new master setlist"""
-        self._check_band_access(setlist_data.band_id, user_id)
+        self.access.require_member(setlist_data.band_id, user_id)
         
         setlist = self.setlist_repo.create_setlist(
             band_id=setlist_data.band_id,
@@ -54,7 +35,7 @@ class MasterSetlistService:
     
     def get_band_setlists(self, band_id: int, user_id: int) -> List[MasterSetlistResponse]:
         """Get all setlists for a band"""
-        self._check_band_access(band_id, user_id)
+        self.access.require_member(band_id, user_id)
         
         results = self.setlist_repo.get_band_setlists_with_song_count(band_id)
         
@@ -76,7 +57,7 @@ class MasterSetlistService:
                 detail="Setlist not found"
             )
         
-        self._check_band_access(setlist.band_id, user_id)
+        self.access.require_member(setlist.band_id, user_id)
         
         result = self.setlist_repo.get_setlist_with_song_count(setlist_id)
         response = MasterSetlistResponse.model_validate(result[0])
@@ -93,14 +74,14 @@ class MasterSetlistService:
                 detail="Setlist not found"
             )
         
-        self._check_band_access(setlist.band_id, user_id)
+        self.access.require_member(setlist.band_id, user_id)
         
         # Get songs with positions
         songs_with_positions = self.setlist_song_repo.get_setlist_songs(setlist_id)
         print(f"DEBUG: Found {len(songs_with_positions)} songs for setlist {setlist_id}")
         print(f"DEBUG: Songs: {songs_with_positions}")
         song_responses = []
-        for song, position in songs_with_positions:
+        for position, (song, _) in enumerate(songs_with_positions):
             song_brief = SongBriefResponse(
                 id=song.id,
                 title=song.title,
@@ -115,6 +96,70 @@ class MasterSetlistService:
         response.songs = song_responses
         return response
     
+    def reorder_setlist(self, setlist_id: int, order: SetlistSongReorder, user_id: int) -> MasterSetlistWithSongsResponse:
+        """Reorder a setlist's songs in one statement, rejecting stale versions"""
+        setlist = self.setlist_repo.get_setlist_by_id(setlist_id)
+        
+        if not setlist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Setlist not found"
+            )
+        
+        self.access.require_member(setlist.band_id, user_id)
+        
+        if len(set(order.song_ids)) != len(order.song_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Song order contains duplicates"
+            )
+        
+        current_ids = set(self.setlist_song_repo.get_setlist_song_ids(setlist_id))
+        unknown = [song_id for song_id in order.song_ids if song_id not in current_ids]
+        missing = current_ids.difference(order.song_ids)
+        if unknown or missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Song order must list exactly the setlist's songs "
+                       f"(not in setlist: {unknown}, missing: {sorted(missing)})"
+            )
+        
+        # A concurrent add/remove/reorder moves the version, so the membership
+        # checked above cannot go stale without this failing
+        if not self.setlist_song_repo.reorder_songs(setlist_id, order.song_ids, order.version):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Setlist was changed by someone else; reload it and try again"
+            )
+        
+        return self.get_setlist_with_songs(setlist_id, user_id)
+    
+    def move_song(self, setlist_id: int, move: SetlistSongUpdatePosition, user_id: int) -> MasterSetlistWithSongsResponse:
+        """Move one song to a new slot in a setlist, rejecting stale versions"""
+        setlist = self.setlist_repo.get_setlist_by_id(setlist_id)
+        
+        if not setlist:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Setlist not found"
+            )
+        
+        self.access.require_member(setlist.band_id, user_id)
+        
+        if not self.setlist_song_repo.is_song_in_setlist(setlist_id, move.song_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Song not found in setlist"
+            )
+        
+        if not self.setlist_song_repo.move_song(setlist_id, move.song_id, move.position, move.version):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Setlist was changed by someone else; reload it and try again"
+            )
+        
+        return self.get_setlist_with_songs(setlist_id, user_id)
+    
     def update_setlist(self, setlist_id: int, setlist_data: MasterSetlistUpdate, user_id: int) -> MasterSetlistResponse:
         """Update setlist details"""
         setlist = self.setlist_repo.get_setlist_by_id(setlist_id)
@@ -125,7 +170,7 @@ class MasterSetlistService:
                 detail="Setlist not found"
             )
         
-        self._check_band_access(setlist.band_id, user_id)
+        self.access.require_member(setlist.band_id, user_id)
         
         updated_setlist = self.setlist_repo.update_setlist(
             setlist_id=setlist_id,
@@ -148,6 +193,6 @@ class MasterSetlistService:
                 detail="Setlist not found"
             )
         
-        self._check_band_access(setlist.band_id, user_id)
+        self.access.require_member(setlist.band_id, user_id)
         
         return self.setlist_repo.delete_setlist(setlist_id)
\ No newline at end of file
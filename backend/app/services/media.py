@@ -0,0 +1,135 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.database import SessionLocal, run_unit_of_work
+from app.repositories.media import MediaRepository
+from app.services.upload import UploadService, StoredUpload, media_uploads, path_for_url, MEDIA_DIR, TEMP_SUFFIX
+from app.services.image import remove_derivatives
+from pathlib import Path
+from typing import Optional
+from datetime import datetime, timedelta
+import asyncio
+import time
+
+# Files are checked against the database in batches during the orphan sweep
+SWEEP_BATCH_SIZE = 500
+
+
+class MediaService:
+    """
+    Reference-counted, content-addressed media. Bands, shows and members hold
+    URLs of media objects; a file is only deleted once nothing points at it.
+    """
+    
+    def __init__(self, db: Session, uploads: UploadService = media_uploads):
+        self.db = db
+        self.media_repo = MediaRepository(db)
+        self.uploads = uploads
+    
+    def acquire(self, stored: StoredUpload) -> str:
+        """Record a reference to an upload and move it to its content address"""
+        self.media_repo.acquire(
+            sha256=stored.sha256,
+            url=stored.url,
+            content_type=stored.content_type,
+            size=stored.size
+        )
+        self.uploads.place(stored)
+        return stored.url
+    
+    def release(self, url: Optional[str]) -> None:
+        """Drop a reference; unreferenced files are removed by the garbage collector"""
+        if not url:
+            return
+        if self.media_repo.release(url):
+            return
+        
+        # Files uploaded before the media store have no reference count
+        path = path_for_url(url)
+        if path is not None and MEDIA_DIR.resolve() not in path.parents:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                print(f"Error deleting file {url}: {str(e)}")
+    
+    def get_original_path(self, sha256: str) -> Path:
+        """Get the stored file for a content hash"""
+        media = self.media_repo.get_by_sha256(sha256)
+        path = path_for_url(media.url) if media else None
+        
+        if path is None or not path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Image not found"
+            )
+        
+        return path
+    
+    def collect_garbage(self, grace_seconds: int) -> int:
+        """Delete unreferenced media and orphaned files older than the grace period"""
+        cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+        removed = 0
+        
+        # Each purge commits on its own, right after its file is gone
+        for media_id in [media.id for media in self.media_repo.get_unreferenced(cutoff)]:
+            if run_unit_of_work(self.db, lambda session: self.media_repo.purge(media_id, cutoff, self._remove_file)):
+                removed += 1
+        
+        return removed + self._sweep_orphans(time.time() - grace_seconds)
+    
+    def _remove_file(self, url: str) -> None:
+        path = path_for_url(url)
+        if path is not None:
+            path.unlink(missing_ok=True)
+            remove_derivatives(path.stem)
+    
+    def _sweep_orphans(self, cutoff_ts: float) -> int:
+        """Remove temp files and media files with no database row (left by failed requests)"""
+        removed = 0
+        candidates = {}
+        
+        for path in MEDIA_DIR.rglob("*"):
+            if not path.is_file() or path.stat().st_mtime >= cutoff_ts:
+                continue
+            if path.name.endswith(TEMP_SUFFIX):
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            
+            url = f"{self.uploads.url_prefix}/{path.relative_to(MEDIA_DIR).as_posix()}"
+            candidates[url] = path
+            if len(candidates) >= SWEEP_BATCH_SIZE:
+                removed += self._remove_untracked(candidates)
+                candidates = {}
+        
+        return removed + self._remove_untracked(candidates)
+    
+    def _remove_untracked(self, candidates: dict) -> int:
+        known = self.media_repo.get_known_urls(candidates.keys())
+        removed = 0
+        for url, path in candidates.items():
+            if url not in known:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+def collect_media_garbage(grace_seconds: int) -> int:
+    """Run one garbage collection pass with its own session"""
+    db = SessionLocal()
+    try:
+        return MediaService(db).collect_garbage(grace_seconds)
+    finally:
+        db.close()
+
+
+async def run_media_gc(interval_seconds: int, grace_seconds: int) -> None:
+    """Background task: periodically collect unreferenced and orphaned media"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            removed = await run_in_threadpool(collect_media_garbage, grace_seconds)
+            if removed:
+                print(f"Media garbage collection removed {removed} file(s)")
+        except Exception as e:
+            print(f"Media garbage collection failed: {str(e)}")
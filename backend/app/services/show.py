@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.show import ShowRepository
-from app.repositories.band import BandRepository
-from app.schemas.show import ShowCreate, ShowUpdate, ShowResponse
-from typing import List
+from app.services.band_access import BandAccessService
+from app.services.media import MediaService
+from app.services.upload import StoredUpload
+from app.schemas.show import ShowCreate, ShowUpdate, ShowResponse, ShowStatus
+from app.schemas.pagination import Page
+from app.utils.pagination import clamp_limit, decode_cursor, split_page
+from typing import Optional
+from datetime import date
 from decimal import Decimal
 
 
@@ -12,28 +17,13 @@ class ShowService:
     def __init__(self, db: Session):
         self.db = db
         self.show_repo = ShowRepository(db)
-        self.band_repo = BandRepository(db)
+        self.access = BandAccessService(db)
+        self.media = MediaService(db)
     
     def create_show(self, show_data: ShowCreate, user_id: int) -> ShowResponse:
         """Create a new show"""
         # Get band and check if user is a member
-        band = self.band_repo.get_band_by_id(show_data.band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access.require_member(show_data.band_id, user_id)
         
         # Create show
         show = self.show_repo.create_show(
@@ -47,35 +37,34 @@ class ShowService:
             band_fund_amount=show_data.band_fund_amount,
             piece_count=show_data.piece_count,
             status=show_data.status,
-            poster=show_data.poster,
             description=show_data.description
         )
         
         return ShowResponse.model_validate(show)
     
-    def get_band_shows(self, band_id: int, user_id: int) -> List[ShowResponse]:
-        """Get all shows for a band"""
+    def get_band_shows(self, band_id: int, user_id: int, limit: Optional[int] = None, cursor: Optional[str] = None,
+                       start_date: Optional[date] = None, end_date: Optional[date] = None,
+                       show_status: Optional[ShowStatus] = None,
+                       member_name: Optional[str] = None) -> Page[ShowResponse]:
+        """Get a page of a band's shows, newest first, optionally filtered by date range, status or member"""
         # Check if user is a member of the band
-        band = self.band_repo.get_band_by_id(band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
+        self.access.require_member(band_id, user_id)
+        
+        limit = clamp_limit(limit)
+        shows = self.show_repo.get_band_shows(
+            band_id,
+            limit=limit + 1,
+            after=decode_cursor(cursor, date.fromisoformat, int),
+            start_date=start_date,
+            end_date=end_date,
+            status=show_status,
+            member_name=member_name
+        )
+        items, next_cursor = split_page(shows, limit, key=lambda show: (show.show_date, show.id))
+        return Page[ShowResponse](
+            items=[ShowResponse.model_validate(show) for show in items],
+            next_cursor=next_cursor
         )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
-        
-        shows = self.show_repo.get_band_shows(band_id)
-        return [ShowResponse.model_validate(show) for show in shows]
     
     def get_show(self, show_id: int, user_id: int) -> ShowResponse:
         """Get a specific show"""
@@ -88,17 +77,7 @@ class ShowService:
             )
         
         # Check if user is a member of the band
-        band = self.band_repo.get_band_by_id(show.band_id)
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access.require_member(show.band_id, user_id)
         
         return ShowResponse.model_validate(show)
     
@@ -113,17 +92,7 @@ class ShowService:
             )
         
         # Check if user is a member of the band
-        band = self.band_repo.get_band_by_id(show.band_id)
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access.require_member(show.band_id, user_id)
         
         # Update show
         updated_show = self.show_repo.update_show(
@@ -137,7 +106,6 @@ class ShowService:
             band_fund_amount=show_data.band_fund_amount,
             piece_count=show_data.piece_count,
             status=show_data.status,
-            poster=show_data.poster,
             description=show_data.description
         )
         
@@ -154,39 +122,37 @@ class ShowService:
             )
         
         # Check if user is a member of the band
-        band = self.band_repo.get_band_by_id(show.band_id)
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
+        self.access.require_member(show.band_id, user_id)
         
-        if not is_member:
+        poster = show.poster
+        deleted = self.show_repo.delete_show(show_id)
+        if deleted:
+            self.media.release(poster)
+        return deleted
+    
+    def replace_poster(self, show_id: int, upload: Optional[StoredUpload], user_id: int) -> ShowResponse:
+        """Point the show at a new poster (or none) and release the old one"""
+        show = self.show_repo.get_show_by_id(show_id)
+        
+        if not show:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Show not found"
             )
         
-        return self.show_repo.delete_show(show_id)
+        # Check if user is a member of the band
+        self.access.require_member(show.band_id, user_id)
+        
+        old_poster = show.poster
+        new_poster = self.media.acquire(upload) if upload else None
+        updated_show = self.show_repo.set_poster(show_id, new_poster)
+        self.media.release(old_poster)
+        
+        return ShowResponse.model_validate(updated_show)
     
     def get_total_band_fund(self, band_id: int, user_id: int) -> Decimal:
         """Get total band fund for a band"""
         # Check if user is a member of the band
-        band = self.band_repo.get_band_by_id(band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_member = any(
-            member.user_id == user_id and member.is_active 
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access.require_member(band_id, user_id)
         
         return self.show_repo.get_total_band_fund(band_id)
\ No newline at end of file
@@ -2,9 +2,17 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.show_payment import ShowPaymentRepository
 from app.repositories.show import ShowRepository
-from app.repositories.band import BandRepository
-from app.schemas.show_payment import ShowPaymentCreate, ShowPaymentUpdate, ShowPaymentResponse
-from typing import List
+from app.repositories.earnings import EarningsRepository
+from app.services.band_access import BandAccessService
+from app.schemas.show_payment import (
+    ShowPaymentCreate, ShowPaymentUpdate, ShowPaymentResponse,
+    ShowFinanceSummary, MemberPayoutSummary, BandFinanceSummary,
+    MonthlyEarning, MemberEarningsSummary, BandEarnings
+)
+from app.schemas.pagination import Page
+from app.utils.pagination import clamp_limit, decode_cursor, split_page
+from typing import Optional
+from datetime import date, datetime
 from decimal import Decimal
 
 
@@ -14,7 +22,8 @@ class ShowPaymentService:
         self.db = db
         self.payment_repo = ShowPaymentRepository(db)
         self.show_repo = ShowRepository(db)
-        self.band_repo = BandRepository(db)
+        self.earnings_repo = EarningsRepository(db)
+        self.access = BandAccessService(db)
     
     def _check_show_access(self, show_id: int, user_id: int):
         """Check if user has access to the show's band"""
@@ -25,17 +34,7 @@ class ShowPaymentService:
                 detail="Show not found"
             )
         
-        band = self.band_repo.get_band_by_id(show.band_id)
-        is_member = any(
-            member.user_id == user_id and member.is_active
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access.require_member(show.band_id, user_id)
         
         return show
     
@@ -57,12 +56,22 @@ class ShowPaymentService:
         
         return ShowPaymentResponse.model_validate(payment)
     
-    def get_show_payments(self, show_id: int, user_id: int) -> List[ShowPaymentResponse]:
-        """Get all payments for a show"""
+    def get_show_payments(self, show_id: int, user_id: int, limit: Optional[int] = None,
+                          cursor: Optional[str] = None) -> Page[ShowPaymentResponse]:
+        """Get a page of payments for a show, newest first"""
         self._check_show_access(show_id, user_id)
         
-        payments = self.payment_repo.get_show_payments(show_id)
-        return [ShowPaymentResponse.model_validate(p) for p in payments]
+        limit = clamp_limit(limit)
+        payments = self.payment_repo.get_show_payments(
+            show_id,
+            limit=limit + 1,
+            after=decode_cursor(cursor, datetime.fromisoformat, int)
+        )
+        items, next_cursor = split_page(payments, limit, key=lambda p: (p.created_at, p.id))
+        return Page[ShowPaymentResponse](
+            items=[ShowPaymentResponse.model_validate(p) for p in items],
+            next_cursor=next_cursor
+        )
     
     def get_payment(self, payment_id: int, user_id: int) -> ShowPaymentResponse:
         """Get a specific payment"""
@@ -120,7 +129,7 @@ class ShowPaymentService:
         show = self._check_show_access(show_id, user_id)
         
         payments = self.payment_repo.get_show_payments(show_id)
-        total_member_payments = sum(p.amount for p in payments) if payments else Decimal('0')
+        total_member_payments = self.payment_repo.get_total_payments_for_show(show_id)
         
         return {
             "show_id": show_id,
@@ -128,4 +137,74 @@ class ShowPaymentService:
             "band_fund_amount": show.band_fund_amount or Decimal('0'),
             "total_member_payments": total_member_payments,
             "member_payments": [ShowPaymentResponse.model_validate(p) for p in payments]
-        }
\ No newline at end of file
+        }
+    
+    def get_band_finance_summary(self, band_id: int, user_id: int) -> BandFinanceSummary:
+        """Get per-show totals, per-member payouts and outstanding balances for a band"""
+        self.access.require_member(band_id, user_id)
+        
+        shows = [
+            ShowFinanceSummary(
+                show_id=row.show_id,
+                venue=row.venue,
+                show_date=row.show_date,
+                status=row.status,
+                total_payment=row.total_payment,
+                band_fund_amount=row.band_fund_amount,
+                member_payouts=row.member_payouts,
+                payment_count=row.payment_count,
+                outstanding=Decimal(row.total_payment) - Decimal(row.band_fund_amount) - Decimal(row.member_payouts)
+            )
+            for row in self.payment_repo.get_band_show_totals(band_id)
+        ]
+        members = [
+            MemberPayoutSummary(member_name=row.member_name, total_paid=row.total_paid, show_count=row.show_count)
+            for row in self.payment_repo.get_band_member_payouts(band_id)
+        ]
+        
+        return BandFinanceSummary(
+            band_id=band_id,
+            total_payment=sum((s.total_payment for s in shows), Decimal('0')),
+            total_band_fund=sum((s.band_fund_amount for s in shows), Decimal('0')),
+            total_member_payouts=sum((s.member_payouts for s in shows), Decimal('0')),
+            total_outstanding=sum((s.outstanding for s in shows), Decimal('0')),
+            shows=shows,
+            members=members
+        )
+    
+    def get_band_earnings(self, band_id: int, user_id: int, start: Optional[date] = None,
+                          end: Optional[date] = None) -> BandEarnings:
+        """Get per-member earnings by month from the ledger, optionally within a date range"""
+        self.access.require_member(band_id, user_id)
+        
+        if start is not None and end is not None and start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start must be on or before end"
+            )
+        
+        members = {}
+        for row in self.earnings_repo.get_band_earnings(band_id, start, end):
+            summary = members.get(row.member_name)
+            if summary is None:
+                summary = members[row.member_name] = MemberEarningsSummary(
+                    member_name=row.member_name,
+                    total_amount=Decimal('0'),
+                    payment_count=0,
+                    months=[]
+                )
+            summary.months.append(MonthlyEarning(
+                month=row.month,
+                total_amount=row.total_amount,
+                payment_count=row.payment_count
+            ))
+            summary.total_amount += Decimal(row.total_amount)
+            summary.payment_count += row.payment_count
+        
+        return BandEarnings(
+            band_id=band_id,
+            start=start,
+            end=end,
+            total_amount=sum((m.total_amount for m in members.values()), Decimal('0')),
+            members=list(members.values())
+        )
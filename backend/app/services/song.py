@@ -1,14 +1,17 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from app.repositories.song import SongRepository
 from app.repositories.setlist_song import SetlistSongRepository
 from app.repositories.master_setlist import MasterSetlistRepository
-from app.repositories.band import BandRepository
+from app.services.band_access import BandAccessService
 from app.schemas.song import (
-    SongCreate, SongUpdate, SongResponse,
-    SongWithSetlistsResponse, SetlistBriefResponse
+    SongCreate, SongUpdate,
+    SongWithSetlistsResponse, SongSummaryWithSetlistsResponse, SetlistBriefResponse
 )
-from typing import List
+from app.schemas.pagination import Page
+from app.utils.pagination import clamp_limit, decode_cursor, split_page
+from typing import List, Optional, Union
 
 
 class SongService:
@@ -18,31 +21,11 @@ class SongService:
         self.song_repo = SongRepository(db)
         self.setlist_song_repo = SetlistSongRepository(db)
         self.setlist_repo = MasterSetlistRepository(db)
-        self.band_repo = BandRepository(db)
-    
-    def _check_band_access(self, band_id: int, user_id: int) -> None:
-        """Check if user is a member of the band"""
-        band = self.band_repo.get_band_by_id(band_id)
-        if not band:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Band not found"
-            )
-        
-        is_member = any(
-            member.user_id == user_id and member.is_active
-            for member in band.members
-        )
-        
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You are not a member of this band"
-            )
+        self.access = BandAccessService(db)
     
     def create_song(self, song_data: SongCreate, user_id: int) -> SongWithSetlistsResponse:
         """Create a new song, optionally adding to setlists"""
-        self._check_band_access(song_data.band_id, user_id)
+        self.access.require_member(song_data.band_id, user_id)
         
         # Create the song
         song = self.song_repo.create_song(
@@ -57,34 +40,48 @@ class SongService:
             is_active=song_data.is_active if song_data.is_active is not None else True
         )
         
-        # Add to setlists if provided
-        setlists = []
-        if song_data.setlist_ids:
-            for setlist_id in song_data.setlist_ids:
-                setlist = self.setlist_repo.get_setlist_by_id(setlist_id)
-                if setlist and setlist.band_id == song_data.band_id:
-                    self.setlist_song_repo.add_song_to_setlist(setlist_id, song.id)
-                    setlists.append(SetlistBriefResponse(id=setlist.id, name=setlist.name))
+        # Add to setlists if provided, skipping any that are not this band's
+        setlists_by_id = {
+            setlist.id: setlist
+            for setlist in self.setlist_repo.get_band_setlists_by_ids(song_data.band_id, song_data.setlist_ids or [])
+        }
+        setlist_ids = [setlist_id for setlist_id in dict.fromkeys(song_data.setlist_ids or []) if setlist_id in setlists_by_id]
+        self.setlist_song_repo.set_song_setlists(song.id, add_setlist_ids=setlist_ids, remove_setlist_ids=[])
         
         response = SongWithSetlistsResponse.model_validate(song)
-        response.setlists = setlists
+        response.setlists = [
+            SetlistBriefResponse(id=setlist_id, name=setlists_by_id[setlist_id].name) for setlist_id in setlist_ids
+        ]
         return response
     
-    def get_band_songs(self, band_id: int, user_id: int) -> List[SongWithSetlistsResponse]:
-        """Get all songs for a band with their setlists"""
-        self._check_band_access(band_id, user_id)
-    
-        results = self.song_repo.get_band_songs_with_setlists(band_id, include_inactive=True)
+    def get_band_songs(self, band_id: int, user_id: int, limit: Optional[int] = None, cursor: Optional[str] = None,
+                       genre: Optional[str] = None, scale: Optional[str] = None, is_active: Optional[bool] = None,
+                       summary: bool = True) -> Page[Union[SongSummaryWithSetlistsResponse, SongWithSetlistsResponse]]:
+        """Get a page of a band's songs with their setlists, ordered by title (text bodies only when summary=False)"""
+        self.access.require_member(band_id, user_id)
+        
+        limit = clamp_limit(limit)
+        results = self.song_repo.get_band_songs_with_setlists(
+            band_id,
+            limit=limit + 1,
+            after=decode_cursor(cursor, str, int),
+            genre=genre,
+            scale=scale,
+            is_active=is_active,
+            summary=summary
+        )
+        results, next_cursor = split_page(results, limit, key=lambda result: (result[0].title, result[0].id))
         
+        response_type = SongSummaryWithSetlistsResponse if summary else SongWithSetlistsResponse
         response_list = []
         for song, setlists in results:
-            response = SongWithSetlistsResponse.model_validate(song)
+            response = response_type.model_validate(song)
             response.setlists = [
                 SetlistBriefResponse(id=s.id, name=s.name) for s in setlists
             ]
             response_list.append(response)
         
-        return response_list
+        return Page[response_type](items=response_list, next_cursor=next_cursor)
     
     def get_song(self, song_id: int, user_id: int) -> SongWithSetlistsResponse:
         """Get a specific song with its setlists"""
@@ -96,7 +93,7 @@ class SongService:
                 detail="Song not found"
             )
         
-        self._check_band_access(song.band_id, user_id)
+        self.access.require_member(song.band_id, user_id)
         
         result = self.song_repo.get_song_with_setlists(song_id)
         response = SongWithSetlistsResponse.model_validate(result[0])
@@ -115,7 +112,7 @@ class SongService:
                 detail="Song not found"
             )
         
-        self._check_band_access(song.band_id, user_id)
+        self.access.require_member(song.band_id, user_id)
         
         updated_song = self.song_repo.update_song(
                 song_id=song_id,
@@ -145,7 +142,7 @@ class SongService:
                 detail="Song not found"
             )
         
-        self._check_band_access(song.band_id, user_id)
+        self.access.require_member(song.band_id, user_id)
         
         return self.song_repo.delete_song(song_id)
     
@@ -172,16 +169,16 @@ class SongService:
                 detail="Song and setlist must belong to the same band"
             )
         
-        self._check_band_access(song.band_id, user_id)
+        self.access.require_member(song.band_id, user_id)
         
-        # Check if already in setlist
-        if self.setlist_song_repo.is_song_in_setlist(setlist_id, song_id):
+        # The unique (setlist_id, song_id) constraint rejects duplicates
+        try:
+            self.setlist_song_repo.add_song_to_setlist(setlist_id, song_id, position)
+        except IntegrityError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Song is already in this setlist"
             )
-        
-        self.setlist_song_repo.add_song_to_setlist(setlist_id, song_id, position)
         return True
     
     def remove_song_from_setlist(self, song_id: int, setlist_id: int, user_id: int) -> bool:
@@ -200,7 +197,7 @@ class SongService:
                 detail="Setlist not found"
             )
         
-        self._check_band_access(song.band_id, user_id)
+        self.access.require_member(song.band_id, user_id)
         
         return self.setlist_song_repo.remove_song_from_setlist(setlist_id, song_id)
     
@@ -213,22 +210,23 @@ class SongService:
                 detail="Song not found"
             )
         
-        self._check_band_access(song.band_id, user_id)
-        
-        # Get current setlist IDs
-        current_setlist_ids = self.setlist_song_repo.get_setlists_for_song(song_id)
+        self.access.require_member(song.band_id, user_id)
         
-        # Remove from setlists not in new list
-        for setlist_id in current_setlist_ids:
-            if setlist_id not in setlist_ids:
-                self.setlist_song_repo.remove_song_from_setlist(setlist_id, song_id)
+        target_ids = list(dict.fromkeys(setlist_ids))
+        valid_ids = {setlist.id for setlist in self.setlist_repo.get_band_setlists_by_ids(song.band_id, target_ids)}
+        unknown_ids = [setlist_id for setlist_id in target_ids if setlist_id not in valid_ids]
+        if unknown_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Not setlists of this band: {unknown_ids}"
+            )
         
-        # Add to new setlists
-        for setlist_id in setlist_ids:
-            if setlist_id not in current_setlist_ids:
-                setlist = self.setlist_repo.get_setlist_by_id(setlist_id)
-                if setlist and setlist.band_id == song.band_id:
-                    self.setlist_song_repo.add_song_to_setlist(setlist_id, song_id)
+        current_ids = set(self.setlist_song_repo.get_setlists_for_song(song_id))
+        self.setlist_song_repo.set_song_setlists(
+            song_id,
+            add_setlist_ids=[setlist_id for setlist_id in target_ids if setlist_id not in current_ids],
+            remove_setlist_ids=[setlist_id for setlist_id in current_ids if setlist_id not in valid_ids]
+        )
         
         # Return updated song
         result = self.song_repo.get_song_with_setlists(song_id)
@@ -0,0 +1,190 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import open_db_runner, SessionRunner
+from app.models.versioning import bump_band_versions, bump_setlist_versions
+from app.repositories.song import SongRepository
+from app.repositories.setlist_song import SetlistSongRepository
+from app.repositories.master_setlist import MasterSetlistRepository
+from app.services.band_access import BandAccessService
+from app.schemas.song import SongCreate, SongImportError, SongImportResult
+from app.utils.song_formats import SongFileError, read_song_records, song_record
+from collections import defaultdict
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+
+
+class SongImportService:
+    """
+    Bulk song import and export. An import is read and validated outside the
+    session (see import_songs below); this service authorizes it, then inserts
+    the valid records in batches and adds their setlist memberships in one
+    unit of work. Bad records are reported, not fatal.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.song_repo = SongRepository(db)
+        self.setlist_song_repo = SetlistSongRepository(db)
+        self.setlist_repo = MasterSetlistRepository(db)
+        self.access = BandAccessService(db)
+    
+    def get_import_setlists(self, band_id: int, user_id: int) -> Dict[int, str]:
+        """Authorize an import and return the band's setlist names by ID, for validating records"""
+        self.access.require_member(band_id, user_id)
+        return {setlist.id: setlist.name for setlist in self.setlist_repo.get_band_setlists(band_id)}
+    
+    def insert_songs(self, band_id: int, user_id: int, rows: List[Tuple[dict, List[int]]]) -> int:
+        """Insert validated (song values, setlist IDs) rows in batches and add their memberships"""
+        self.access.require_member(band_id, user_id)
+        # A setlist may have been deleted while the file was being read
+        setlist_ids = {setlist.id for setlist in self.setlist_repo.get_band_setlists(band_id)}
+        
+        created = 0
+        memberships: Dict[int, List[int]] = defaultdict(list)
+        size = settings.SONG_IMPORT_BATCH_SIZE
+        for start in range(0, len(rows), size):
+            created += self._insert_batch(rows[start:start + size], memberships, setlist_ids)
+        
+        # Bulk inserts bypass the flush hook that versions band data
+        self.setlist_song_repo.append_songs(memberships)
+        bump_band_versions(self.db, band_ids=[band_id])
+        bump_setlist_versions(self.db, memberships)
+        return created
+    
+    def _insert_batch(self, batch: List[Tuple[dict, List[int]]], memberships: Dict[int, List[int]],
+                      setlist_ids: set) -> int:
+        """Insert one batch of validated songs and queue their setlist memberships"""
+        song_ids = self.song_repo.insert_songs([values for values, _ in batch])
+        for song_id, (_, targets) in zip(song_ids, batch):
+            for setlist_id in targets:
+                if setlist_id in setlist_ids:
+                    memberships[setlist_id].append(song_id)
+        return len(song_ids)
+    
+    def check_export(self, band_id: int, user_id: int) -> None:
+        """Authorize an export before its response starts streaming"""
+        self.access.require_member(band_id, user_id)
+    
+    def export_batch(self, band_id: int, after: Optional[Tuple[str, int]],
+                     limit: int) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """One title-ordered batch of export records and the keyset to continue after"""
+        results = self.song_repo.get_band_songs_with_setlists(band_id, limit=limit, after=after)
+        records = [song_record(song, [setlist.name for setlist in setlists]) for song, setlists in results]
+        if len(results) < limit:
+            return records, None
+        last = results[-1][0]
+        return records, (last.title, last.id)
+
+
+async def stream_song_export(band_id: int, writer) -> AsyncIterator[str]:
+    """
+    Write a band's catalog batch by batch so only SONG_EXPORT_BATCH_SIZE songs
+    are in memory at once. Uses its own session: the response streams after
+    the request's dependencies may have been torn down.
+    """
+    yield writer.start()
+    async with open_db_runner() as db:
+        after = None
+        while True:
+            records, after = await db.run(
+                lambda session, after=after: SongImportService(session).export_batch(
+                    band_id, after, settings.SONG_EXPORT_BATCH_SIZE
+                )
+            )
+            if records:
+                yield writer.write(records)
+            if after is None:
+                break
+    yield writer.end()
+
+
+async def import_songs(db: SessionRunner, band_id: int, user_id: int, stream: BinaryIO, fmt: str,
+                       dry_run: bool = False) -> SongImportResult:
+    """
+    Create songs from an uploaded CSV, JSON or ChordPro file. The file is read
+    and validated on the threadpool between units of work, so a large upload
+    never parses inside db.run (which is on the event loop when DB_ASYNC=true);
+    only the validated rows are written. A dry run writes nothing.
+    """
+    setlists = await db.run(lambda session: SongImportService(session).get_import_setlists(band_id, user_id))
+    rows, errors = await run_in_threadpool(read_song_import, band_id, stream, fmt, setlists)
+    
+    created = len(rows)
+    if rows and not dry_run:
+        created = await db.run(lambda session: SongImportService(session).insert_songs(band_id, user_id, rows))
+    return SongImportResult(created=created, dry_run=dry_run, errors=errors)
+
+
+def read_song_import(band_id: int, stream: BinaryIO, fmt: str,
+                     setlists: Dict[int, str]) -> Tuple[List[Tuple[dict, List[int]]], List[SongImportError]]:
+    """Validated (song values, setlist IDs) rows of an upload and the records that failed; no database access"""
+    setlist_ids_by_name = {name.strip().lower(): setlist_id for setlist_id, name in setlists.items()}
+    rows: List[Tuple[dict, List[int]]] = []
+    errors: List[SongImportError] = []
+    
+    try:
+        for row, record in read_song_records(stream, fmt):
+            if row > settings.SONG_IMPORT_MAX_ROWS:
+                errors.append(SongImportError(
+                    row=row, detail=f"Import stopped: at most {settings.SONG_IMPORT_MAX_ROWS} songs per file"
+                ))
+                break
+            
+            try:
+                rows.append(_validate(band_id, record, setlists, setlist_ids_by_name))
+            except ValueError as exc:
+                title = record.get("title") if isinstance(record, dict) else None
+                errors.append(SongImportError(
+                    row=row, title=title if isinstance(title, str) else None, detail=_error_detail(exc)
+                ))
+    except SongFileError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read the file: {exc}"
+        )
+    return rows, errors
+
+
+def _validate(band_id: int, record: Any, setlists: Dict[int, str],
+              setlist_ids_by_name: Dict[str, int]) -> Tuple[dict, List[int]]:
+    """Song column values and setlist IDs of one record, or ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError("Record must be an object")
+    
+    fields = dict(record)
+    setlist_names = fields.pop("setlists", None) or []
+    if isinstance(setlist_names, str):
+        setlist_names = [setlist_names]
+    fields["band_id"] = band_id
+    
+    song = SongCreate.model_validate(fields)
+    if not song.title.strip():
+        raise ValueError("title: Title is required")
+    
+    targets = list(song.setlist_ids or [])
+    unknown_ids = [setlist_id for setlist_id in targets if setlist_id not in setlists]
+    if unknown_ids:
+        raise ValueError(f"setlist_ids: Not setlists of this band: {unknown_ids}")
+    for name in setlist_names:
+        setlist_id = setlist_ids_by_name.get(str(name).strip().lower())
+        if setlist_id is None:
+            raise ValueError(f"setlists: No setlist named '{name}'")
+        targets.append(setlist_id)
+    
+    values = song.model_dump(exclude={"setlist_ids"})
+    values["title"] = song.title.strip()
+    if values["is_active"] is None:
+        values["is_active"] = True
+    return values, list(dict.fromkeys(targets))
+
+
+def _error_detail(exc: ValueError) -> str:
+    """One line per problem, pydantic errors as "field: message" """
+    if isinstance(exc, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+            for error in exc.errors()
+        )
+    return str(exc)
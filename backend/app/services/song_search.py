@@ -0,0 +1,73 @@
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.repositories.band import BandRepository
+from app.repositories.song import SongRepository
+from app.services.band_access import BandAccessService
+from app.schemas.song import SongSearchResult
+from app.utils.cache import search_index_cache
+from app.utils.search import SongSearchIndex, make_snippet, to_tsquery_text, tokenize
+from typing import List, Optional
+
+
+class SongSearchService:
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self.song_repo = SongRepository(db)
+        self.band_repo = BandRepository(db)
+        self.access = BandAccessService(db)
+    
+    def search(self, band_id: int, user_id: int, q: str, limit: Optional[int] = None,
+               is_active: Optional[bool] = None) -> List[SongSearchResult]:
+        """Ranked search over a band's song titles, lyrics, descriptions and chords"""
+        self.access.require_member(band_id, user_id)
+        
+        text = q.strip()
+        if not text:
+            return []
+        
+        terms = tokenize(text)
+        limit = min(limit or settings.SEARCH_DEFAULT_LIMIT, settings.MAX_PAGE_SIZE)
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            hits = self.song_repo.search_songs(band_id, to_tsquery_text(terms), text, limit, is_active)
+            bodies = {}
+        else:
+            hits = self._get_index(band_id).search(terms, text, limit, is_active)
+            # The index keeps no song bodies; snippets are cut from the hits' own rows
+            bodies = {row.id: row for row in self.song_repo.iter_search_rows(band_id, [doc.id for doc, _ in hits])}
+        
+        results = []
+        for song, score in hits:
+            field, snippet, highlights = make_snippet(bodies.get(song.id, song), terms)
+            results.append(SongSearchResult(
+                id=song.id,
+                title=song.title,
+                genre=song.genre,
+                scale=song.scale,
+                is_active=song.is_active,
+                score=round(float(score), 6),
+                snippet_field=field,
+                snippet=snippet,
+                highlights=highlights
+            ))
+        return results
+    
+    def _get_index(self, band_id: int) -> SongSearchIndex:
+        """In-memory index for a band, re-synced (changed songs only) whenever the band's data version moves"""
+        version = self.band_repo.get_data_version(band_id)
+        cached = search_index_cache.get(band_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        if cached is None:
+            index = SongSearchIndex()
+            # Cold start: one streamed pass over the catalog beats thousands of IN batches
+            load = lambda song_ids: self.song_repo.iter_search_rows(band_id)
+        else:
+            index = cached[1]
+            load = lambda song_ids: self.song_repo.iter_search_rows(band_id, song_ids)
+        
+        index.sync(self.song_repo.get_band_song_stamps(band_id), load)
+        search_index_cache.set(band_id, (version, index))
+        return index
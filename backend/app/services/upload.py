@@ -0,0 +1,170 @@
+from fastapi import HTTPException, UploadFile, status
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.utils.metrics import upload_bytes, upload_duration_seconds, uploads_rejected_total
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+import hashlib
+import os
+import tempfile
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+# backend/uploads is served at /uploads; new files live in the content-addressed media/ tree
+UPLOAD_ROOT = Path(__file__).resolve().parent.parent.parent / "uploads"
+MEDIA_DIR = UPLOAD_ROOT / "media"
+MEDIA_URL_PREFIX = "/uploads/media"
+TEMP_SUFFIX = ".part"
+
+# Leading bytes -> (content type, extension) for the image formats we accept
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png", ".png"),
+    (b"\xff\xd8\xff", "image/jpeg", ".jpg"),
+    (b"GIF87a", "image/gif", ".gif"),
+    (b"GIF89a", "image/gif", ".gif"),
+]
+
+
+def sniff_image_type(header: bytes) -> Optional[tuple]:
+    """Detect the image format from the first bytes of a file"""
+    for signature, content_type, extension in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return content_type, extension
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp", ".webp"
+    return None
+
+
+def path_for_url(url: str) -> Optional[Path]:
+    """Map an /uploads/... URL to its file, or None if it points outside the upload root"""
+    if not url or not url.startswith("/uploads/"):
+        return None
+    path = (UPLOAD_ROOT / url[len("/uploads/"):]).resolve()
+    if UPLOAD_ROOT.resolve() not in path.parents:
+        return None
+    return path
+
+
+@dataclass
+class StoredUpload:
+    temp_path: Path
+    url: str
+    size: int
+    sha256: str
+    content_type: str
+
+
+class UploadService:
+    """
+    Streams an uploaded image to disk in fixed-size chunks: the size limit is
+    enforced while copying, the content type is sniffed from the first bytes,
+    and the SHA-256 is computed on the way through. The pixel count is then
+    read from the image header, so decompression bombs never reach a decoder.
+    The bytes land in a temp file; place() atomically renames it to its
+    content address (media/<sha[:2]>/<sha><ext>) once the media reference is
+    recorded.
+    """
+    
+    def __init__(self, media_dir: Path = MEDIA_DIR, url_prefix: str = MEDIA_URL_PREFIX,
+                 max_bytes: Optional[int] = None):
+        self.media_dir = media_dir
+        self.url_prefix = url_prefix.rstrip("/")
+        self.max_bytes = max_bytes or settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+        self.media_dir.mkdir(parents=True, exist_ok=True)
+    
+    async def save(self, file: UploadFile) -> StoredUpload:
+        """Stream an uploaded image into a temp file"""
+        return await run_in_threadpool(self._save_stream, file.file)
+    
+    def place(self, stored: StoredUpload) -> Path:
+        """Move a saved upload to its content address (identical content is simply overwritten)"""
+        final_path = self.media_dir / stored.url[len(self.url_prefix) + 1:]
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(stored.temp_path, final_path)
+        return final_path
+    
+    def discard(self, stored: StoredUpload) -> None:
+        """Remove a saved upload that will not be used"""
+        stored.temp_path.unlink(missing_ok=True)
+    
+    def _save_stream(self, source: BinaryIO) -> StoredUpload:
+        start = time.perf_counter()
+        fd, tmp_name = tempfile.mkstemp(dir=self.media_dir, suffix=TEMP_SUFFIX)
+        tmp_path = Path(tmp_name)
+        try:
+            digest = hashlib.sha256()
+            size = 0
+            detected = None
+            
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    if detected is None:
+                        detected = sniff_image_type(chunk)
+                        if detected is None:
+                            raise HTTPException(
+                                status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="File type not allowed. Use jpg, jpeg, png, gif, or webp"
+                            )
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)} MB"
+                        )
+                    digest.update(chunk)
+                    out.write(chunk)
+            
+            if detected is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Uploaded file is empty"
+                )
+            self._check_dimensions(tmp_path)
+        except HTTPException as e:
+            tmp_path.unlink(missing_ok=True)
+            uploads_rejected_total.inc("image", str(e.status_code))
+            raise
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        upload_bytes.observe(size, "image")
+        upload_duration_seconds.observe(time.perf_counter() - start, "image")
+        content_type, extension = detected
+        sha256 = digest.hexdigest()
+        return StoredUpload(
+            temp_path=tmp_path,
+            url=f"{self.url_prefix}/{sha256[:2]}/{sha256}{extension}",
+            size=size,
+            sha256=sha256,
+            content_type=content_type
+        )
+    
+    def _check_dimensions(self, path: Path) -> None:
+        """Refuse images over IMAGE_MAX_PIXELS from the header alone, before anything decodes them"""
+        try:
+            with Image.open(path) as image:
+                pixels = image.width * image.height
+        except Image.DecompressionBombError:
+            pixels = None  # Past Pillow's own limit
+        except (OSError, SyntaxError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not read the image"
+            )
+        
+        if pixels is None or pixels > settings.IMAGE_MAX_PIXELS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Image too large. Maximum is {settings.IMAGE_MAX_PIXELS / 1_000_000:g} megapixels"
+            )
+
+
+# Shared by the logo, poster and profile picture routes
+media_uploads = UploadService()
@@ -1,8 +1,15 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Callable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from jose import JWTError, jwt
+import asyncio
 import bcrypt
+import time
 from app.config import settings
+from app.utils.metrics import password_hash_seconds
+
+T = TypeVar("T")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -12,11 +19,96 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was made with a different work factor than configured"""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return False
+    return rounds != settings.BCRYPT_ROUNDS
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-bounded thread pool so a burst of logins
+    cannot occupy the request threadpool or the event loop. Awaited from the
+    route (outside db.run), so a queued login holds no thread while it waits;
+    beyond max_pending it is refused at once.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = Lock()
+        
+        # Metrics
+        self.in_flight = 0
+        self.rejected_total = 0
+        self.operations_total = 0
+        self.hash_seconds_total = 0.0
+    
+    @property
+    def queue_depth(self) -> int:
+        """Operations waiting for a free worker"""
+        return max(self.in_flight - self.workers, 0)
+    
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+    
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+    
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "rejected_total": self.rejected_total,
+            "operations_total": self.operations_total,
+            "hash_seconds_total": self.hash_seconds_total,
+        }
+    
+    async def _run(self, operation: str, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.in_flight >= self.max_pending:
+                self.rejected_total += 1
+                raise PasswordHasherBusy()
+            self.in_flight += 1
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, operation, fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+    
+    def _timed(self, operation: str, fn: Callable[..., T], *args) -> T:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            password_hash_seconds.observe(elapsed, operation)
+            with self._lock:
+                self.operations_total += 1
+                self.hash_seconds_total += elapsed
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
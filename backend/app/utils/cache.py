@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+import time
+
+from app.config import settings
+from app.database import after_commit
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a time-to-live"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry whose key satisfies the predicate"""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters and current size"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# (user_id, band_id) -> "admin" | "member" for active memberships
+membership_cache = TTLCache(
+    maxsize=settings.BAND_ACCESS_CACHE_SIZE,
+    ttl=settings.BAND_ACCESS_CACHE_TTL_SECONDS
+)
+
+# Session.info key for the per-request membership memo
+MEMBERSHIP_MEMO_KEY = "band_access"
+
+
+def forget_membership(db, band_id: int, user_id: Optional[int] = None) -> None:
+    """
+    Invalidate cached band access for one user, or for every user of a band.
+    The request's own memo forgets at once; the shared cache only once the
+    change commits, so other requests cannot re-cache the old role meanwhile.
+    """
+    memo = db.info.get(MEMBERSHIP_MEMO_KEY, {})
+    if user_id is not None:
+        memo.pop((user_id, band_id), None)
+        after_commit(db, lambda: membership_cache.delete((user_id, band_id)))
+    else:
+        for key in [k for k in memo if k[1] == band_id]:
+            del memo[key]
+        after_commit(db, lambda: membership_cache.delete_matching(lambda key: key[1] == band_id))
+
+
+# JWT -> verified claims; entries never outlive the token's own exp
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+
+# user_id -> UserResponse for /auth/me
+current_user_cache = TTLCache(
+    maxsize=settings.CURRENT_USER_CACHE_SIZE,
+    ttl=settings.CURRENT_USER_CACHE_TTL_SECONDS
+)
+
+
+def forget_current_user(db, user_id: int) -> None:
+    """Invalidate a user's cached /auth/me once the change commits"""
+    after_commit(db, lambda: current_user_cache.delete(user_id))
+
+
+# band_id -> (data_version, SongSearchIndex) where Postgres full-text search is unavailable
+search_index_cache = TTLCache(
+    maxsize=settings.SEARCH_INDEX_CACHE_SIZE,
+    ttl=settings.SEARCH_INDEX_CACHE_TTL_SECONDS
+)
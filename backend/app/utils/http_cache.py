@@ -0,0 +1,50 @@
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from typing import Optional
+import hashlib
+import os
+
+# Clients must revalidate, but can reuse the body when the ETag still matches
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def make_etag(scope: str, key: int, version: int, request: Optional[Request] = None) -> str:
+    """Build a strong ETag for a versioned resource (query parameters are part of the representation)"""
+    tag = f"{scope}-{key}-v{version}"
+    if request is not None and request.url.query:
+        tag += "-" + hashlib.sha1(request.url.query.encode()).hexdigest()[:12]
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current validator"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    )
+
+
+# Upload subdirectories whose files are named by content hash
+IMMUTABLE_UPLOAD_DIRS = ("media", "derived")
+
+
+class UploadStaticFiles(StaticFiles):
+    """StaticFiles for /uploads; content-addressed files never change, so they are cached forever"""
+    
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        relative = os.path.relpath(full_path, self.directory)
+        if relative.split(os.sep, 1)[0] in IMMUTABLE_UPLOAD_DIRS:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
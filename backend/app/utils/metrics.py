@@ -0,0 +1,274 @@
+from bisect import bisect_left
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+import time
+
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# 4 KiB .. 64 MiB
+BYTE_BUCKETS = tuple(4096 * 4 ** i for i in range(8))
+
+# Starlette appends "; charset=utf-8" to text/ media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric family with a fixed set of label names"""
+    kind = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+    
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+    
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+    
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+    
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+    
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[LabelValues, list] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+    
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        lines = self.header()
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _number(bound) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    In-process metric registry rendered in the Prometheus text format. Besides
+    metrics updated as things happen, collectors sample existing counters
+    (caches, pools, the password hasher) only when /metrics is scraped.
+    """
+    
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], Iterable[Metric]]] = []
+    
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+    
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]) -> None:
+        self.collectors.append(collector)
+    
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"
+))
+http_errors_total = registry.register(Counter(
+    "http_errors_total", "HTTP responses with status >= 400 (500 for unhandled exceptions)", ("status",)
+))
+db_pool_checkout_seconds = registry.register(Histogram(
+    "db_pool_checkout_seconds", "Time to check a connection out of the pool, including waiting for one", ("pool",)
+))
+password_hash_seconds = registry.register(Histogram(
+    "password_hash_seconds", "bcrypt time per operation", ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+))
+upload_bytes = registry.register(Histogram(
+    "upload_bytes", "Size of accepted uploads", ("kind",), buckets=BYTE_BUCKETS
+))
+upload_duration_seconds = registry.register(Histogram(
+    "upload_duration_seconds", "Time to receive and store or parse an upload", ("kind",)
+))
+uploads_rejected_total = registry.register(Counter(
+    "uploads_rejected_total", "Uploads refused (bad type, too large, unreadable) by status", ("kind", "status")
+))
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout takes, waits for a free connection included"""
+    pool_label = "sync"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - start, self.pool_label)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    pool_label = "async"
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - start, self.pool_label)
+
+
+def pool_metrics(pools: Dict[str, object]) -> List[Metric]:
+    """Connection counts of QueuePool-based pools, sampled at scrape time"""
+    size = Gauge("db_pool_size", "Configured pool_size", ("pool",))
+    checked_out = Gauge("db_pool_checked_out", "Connections currently checked out", ("pool",))
+    checked_in = Gauge("db_pool_checked_in", "Idle connections in the pool", ("pool",))
+    overflow = Gauge("db_pool_overflow", "Connections open beyond pool_size (negative: unopened pool slots)", ("pool",))
+    for label, pool in pools.items():
+        if not isinstance(pool, QueuePool):
+            continue  # e.g. the NullPool aiosqlite uses in test runs
+        size.set(label, value=pool.size())
+        checked_out.set(label, value=pool.checkedout())
+        checked_in.set(label, value=pool.checkedin())
+        overflow.set(label, value=pool.overflow())
+    return [size, checked_out, checked_in, overflow]
+
+
+def cache_metrics(caches: Dict[str, dict]) -> List[Metric]:
+    """Hit/miss/eviction counters and sizes of the in-process caches"""
+    hits = Counter("cache_hits_total", "Cache hits", ("cache",))
+    misses = Counter("cache_misses_total", "Cache misses", ("cache",))
+    evictions = Counter("cache_evictions_total", "Entries evicted to stay within maxsize", ("cache",))
+    size = Gauge("cache_entries", "Entries currently cached", ("cache",))
+    for name, stats in caches.items():
+        hits.inc(name, amount=stats.get("hits", 0))
+        misses.inc(name, amount=stats.get("misses", 0))
+        if "evictions" in stats:
+            evictions.inc(name, amount=stats["evictions"])
+        if "size" in stats:
+            size.set(name, value=stats["size"])
+    return [hits, misses, evictions, size]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request by its route template (so path
+    parameters do not explode the label set) and counting errors by status.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        root_path = scope.get("root_path", "")
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            route = route_template(scope, root_path)
+            http_request_duration_seconds.observe(elapsed, scope["method"], route)
+            http_requests_total.inc(scope["method"], route, str(status))
+            if status >= 400:
+                http_errors_total.inc(str(status))
+
+
+def route_template(scope, root_path: str = "") -> str:
+    """The matched route's path template, the mount prefix for mounted apps, else "unmatched" """
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    mount = scope.get("root_path", "")[len(root_path):]
+    return mount or "unmatched"
@@ -0,0 +1,42 @@
+from fastapi import HTTPException, status
+from app.config import settings
+from typing import Any, Callable, Optional, Sequence, Tuple
+from datetime import date, datetime
+import base64
+import json
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Page size from a client `limit`, defaulted and capped by settings"""
+    if not limit or limit < 1:
+        return settings.DEFAULT_PAGE_SIZE
+    return min(limit, settings.MAX_PAGE_SIZE)
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    raw = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *parsers: Callable[[Any], Any]) -> Optional[Tuple]:
+    """Decode a cursor back into its sort key, parsing each value; 400 on anything malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(parsers):
+            raise ValueError(cursor)
+        return tuple(parse(value) for parse, value in zip(parsers, raw))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def split_page(rows: Sequence, limit: int, key: Callable[[Any], Tuple]) -> Tuple[list, Optional[str]]:
+    """Trim a limit + 1 fetch to the page and build the next cursor from its last row"""
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(*key(items[-1])) if len(rows) > limit else None
+    return items, next_cursor
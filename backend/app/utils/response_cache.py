@@ -0,0 +1,102 @@
+from pydantic import TypeAdapter
+from app.config import settings
+from app.utils.cache import TTLCache
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Optional, Protocol
+
+
+class CacheBackend(Protocol):
+    """Storage used by ResponseCache; TTLCache (in-process) and RedisCache (shared) implement it"""
+    
+    def get(self, key: str, default: Any = None) -> Any: ...
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None: ...
+    
+    def stats(self) -> dict: ...
+
+
+class RedisCache:
+    """Shared cache backend on Redis; requires the optional redis package"""
+    
+    def __init__(self, url: str, ttl: float, prefix: str = "band-manager:response:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requires the redis package") from e
+        
+        self._redis = redis
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self._client.get(self.prefix + key)
+        except self._redis.RedisError:
+            self._count("errors")
+            return default
+        
+        self._count("misses" if value is None else "hits")
+        return default if value is None else value
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        try:
+            self._client.set(self.prefix + key, value, ex=max(1, int(ttl or self.ttl)))
+        except self._redis.RedisError:
+            self._count("errors")
+    
+    def stats(self) -> dict:
+        # Redis evicts on its own (maxmemory policy); see INFO stats on the server for that
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+    
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies for band-scoped reads. Keys embed the band's
+    data_version, so every committed write moves readers to a fresh key and
+    stale entries simply age out of the backend.
+    """
+    
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self.backend.get(key)
+    
+    def set(self, key: str, body: bytes) -> None:
+        self.backend.set(key, body)
+    
+    def serialize(self, response_type: Any, data: Any) -> bytes:
+        """Render data the way the route's response_model would"""
+        return _adapter(response_type).dump_json(data)
+    
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def create_backend() -> CacheBackend:
+    """Build the backend selected by RESPONSE_CACHE_BACKEND"""
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        if not settings.RESPONSE_CACHE_URL:
+            raise RuntimeError("RESPONSE_CACHE_URL must be set when RESPONSE_CACHE_BACKEND=redis")
+        return RedisCache(settings.RESPONSE_CACHE_URL, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+    
+    return TTLCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+# Swap response_cache.backend (e.g. for a TTLCache) to replace the shared store
+response_cache = ResponseCache(create_backend())
@@ -0,0 +1,272 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+import re
+import sys
+import threading
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Searchable song fields and their weights. Mirrors the A/B/C/D setweight()
+# labels of songs.search_vector and ts_rank's default {1.0, 0.4, 0.2, 0.1}.
+SEARCH_FIELDS = (
+    ("title", 1.0),
+    ("lyrics", 0.4),
+    ("description", 0.2),
+    ("chord_structure", 0.1),
+)
+
+# Fields a snippet may be cut from, in order of preference
+SNIPPET_FIELDS = ("lyrics", "description", "chord_structure")
+SNIPPET_WIDTH = 160
+SNIPPET_CONTEXT = 40  # Characters kept before the first match
+
+# The last query term matches as a prefix (search-as-you-type) once it is this long
+PREFIX_MIN_LENGTH = 2
+
+# pg_trgm's default similarity_threshold
+TRIGRAM_THRESHOLD = 0.3
+
+# Stamp placeholder for songs the index has not seen
+MISSING = object()
+
+# Songs tokenized per lock hold while syncing; only this many song bodies are in memory at once
+SYNC_BATCH_SIZE = 500
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased word tokens of a text"""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """Trigram set of a text, built the way pg_trgm does (each word padded "  word ")"""
+    grams = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def to_tsquery_text(terms: List[str]) -> Optional[str]:
+    """to_tsquery() input requiring every term, the last one as a prefix"""
+    if not terms:
+        return None
+    parts = list(terms)
+    if len(parts[-1]) >= PREFIX_MIN_LENGTH:
+        parts[-1] += ":*"
+    return " & ".join(parts)
+
+
+def term_matcher(terms: List[str]):
+    """Predicate telling whether a token matches one of the query terms"""
+    exact = set(terms)
+    prefix = terms[-1] if terms and len(terms[-1]) >= PREFIX_MIN_LENGTH else None
+    return lambda token: token in exact or (prefix is not None and token.startswith(prefix))
+
+
+def make_snippet(document, terms: List[str]) -> Tuple[Optional[str], str, List[Tuple[int, int]]]:
+    """
+    Excerpt of the first field that matches the query, cut around the first
+    match, with [start, end) offsets of every matched word in the excerpt.
+    Falls back to the opening of the lyrics (no highlights) for title-only hits.
+    """
+    matches_term = term_matcher(terms)
+
+    for field in SNIPPET_FIELDS:
+        text = getattr(document, field, None) or ""
+        spans = [m.span() for m in TOKEN_RE.finditer(text) if matches_term(m.group().lower())]
+        if not spans:
+            continue
+
+        first_start, first_end = spans[0]
+        start = max(0, first_start - SNIPPET_CONTEXT)
+        while 0 < start < first_start and not text[start - 1].isspace():
+            start += 1
+        end = min(len(text), start + SNIPPET_WIDTH)
+        if end < len(text):
+            cut = text.rfind(" ", first_end, end)
+            if cut > 0:
+                end = cut
+
+        lead = "…" if start > 0 else ""
+        snippet = lead + text[start:end].replace("\n", " ") + ("…" if end < len(text) else "")
+        shift = len(lead) - start
+        highlights = [(s + shift, e + shift) for s, e in spans if s >= start and e <= end]
+        return field, snippet, highlights
+
+    for field in SNIPPET_FIELDS:
+        text = getattr(document, field, None) or ""
+        if text:
+            snippet = text[:SNIPPET_WIDTH].replace("\n", " ") + ("…" if len(text) > SNIPPET_WIDTH else "")
+            return None, snippet, []
+    return None, "", []
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """Song fields the in-memory index filters on and returns; bodies are tokenized, not kept"""
+    id: int
+    title: str
+    genre: Optional[str]
+    scale: Optional[str]
+    is_active: bool
+
+    @classmethod
+    def from_song(cls, song) -> "SearchDocument":
+        return cls(
+            id=song.id,
+            title=song.title,
+            genre=song.genre,
+            scale=song.scale,
+            is_active=bool(song.is_active)
+        )
+
+
+class SongSearchIndex:
+    """
+    In-memory inverted index over one band's songs, used where the database has
+    no full-text search (SQLite). Scores are weighted tf-idf plus trigram title
+    similarity, so ranking follows the Postgres search closely but not exactly.
+    Kept current incrementally: sync() re-indexes only songs whose updated_at moved.
+    Song bodies are not kept; memory is the postings and title trigrams, which
+    benchmarks/song_search.py measures per song.
+    """
+
+    def __init__(self):
+        self.documents: Dict[int, SearchDocument] = {}
+        self.stamps: Dict[int, Optional[datetime]] = {}  # song id -> updated_at when indexed
+        self.postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self.doc_tokens: Dict[int, Tuple[str, ...]] = {}
+        self.title_grams: Dict[str, Set[int]] = defaultdict(set)
+        self.doc_grams: Dict[int, FrozenSet[str]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self.lock = threading.Lock()
+
+    def sync(self, stamps: Dict[int, Optional[datetime]],
+             load: Callable[[List[int]], Iterable]) -> Tuple[int, int]:
+        """
+        Bring the index in line with the band's current (song id -> updated_at)
+        stamps, loading changed songs through `load`. Returns (indexed, removed).
+        """
+        with self.lock:
+            removed = [doc_id for doc_id in self.stamps if doc_id not in stamps]
+            for doc_id in removed:
+                self._remove(doc_id)
+            stale = [doc_id for doc_id, stamp in stamps.items() if self.stamps.get(doc_id, MISSING) != stamp]
+
+        # Load outside the lock so searches keep running meanwhile, one batch of bodies at a time
+        rows = iter(load(stale)) if stale else iter(())
+        indexed = 0
+        while True:
+            batch = list(islice(rows, SYNC_BATCH_SIZE))
+            if not batch:
+                break
+            with self.lock:
+                for song in batch:
+                    current = self.stamps.get(song.id)
+                    if current is not None and song.updated_at is not None and current > song.updated_at:
+                        continue  # A concurrent sync already indexed a newer copy
+                    self._remove(song.id)
+                    self._add(song)
+            indexed += len(batch)
+        return indexed, len(removed)
+
+    def _add(self, song) -> None:
+        document = SearchDocument.from_song(song)
+        doc_id = document.id
+        self.documents[doc_id] = document
+        self.stamps[doc_id] = song.updated_at
+
+        # Interned so every posting list and doc_tokens entry shares one string per token
+        fields = [(weight, Counter(map(sys.intern, tokenize(getattr(song, field))))) for field, weight in SEARCH_FIELDS]
+        postings = self.postings
+        for weight, counts in fields:
+            for token, count in counts.items():
+                docs = postings[token]
+                score = weight if count == 1 else weight * (1 + math.log(count))
+                previous = docs.get(doc_id)
+                docs[doc_id] = score if previous is None else previous + score  # Most postings share the weight object
+        self.doc_tokens[doc_id] = tuple(set().union(*(counts for _, counts in fields)))
+
+        grams = frozenset(map(sys.intern, trigrams(document.title)))
+        self.doc_grams[doc_id] = grams
+        for gram in grams:
+            self.title_grams[gram].add(doc_id)
+        self._vocabulary = None
+
+    def _remove(self, doc_id: int) -> None:
+        if doc_id not in self.documents:
+            return
+        del self.documents[doc_id]
+        del self.stamps[doc_id]
+        for token in self.doc_tokens.pop(doc_id):
+            postings = self.postings[token]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[token]
+        for gram in self.doc_grams.pop(doc_id):
+            docs = self.title_grams[gram]
+            docs.discard(doc_id)
+            if not docs:
+                del self.title_grams[gram]
+        self._vocabulary = None
+
+    def _expand(self, prefix: str) -> List[str]:
+        """Indexed tokens starting with a prefix"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        vocabulary = self._vocabulary
+        tokens = []
+        i = bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            tokens.append(vocabulary[i])
+            i += 1
+        return tokens
+
+    def _term_scores(self, term: str, as_prefix: bool) -> Dict[int, float]:
+        """tf-idf score per document for one query term"""
+        tokens = self._expand(term) if as_prefix else ([term] if term in self.postings else [])
+        scores: Dict[int, float] = {}
+        for token in tokens:
+            postings = self.postings[token]
+            idf = math.log(1 + len(self.documents) / len(postings))
+            for doc_id, weight in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf
+        return scores
+
+    def search(self, terms: List[str], text: str, limit: int,
+               is_active: Optional[bool] = None) -> List[Tuple[SearchDocument, float]]:
+        """Documents matching every term (last as prefix) or fuzzily matching the title, best first"""
+        with self.lock:
+            scores: Dict[int, float] = {}
+
+            if terms:
+                per_term = [
+                    self._term_scores(term, i == len(terms) - 1 and len(term) >= PREFIX_MIN_LENGTH)
+                    for i, term in enumerate(terms)
+                ]
+                matched = set.intersection(*(set(s) for s in per_term))
+                for doc_id in matched:
+                    scores[doc_id] = sum(s[doc_id] for s in per_term)
+
+            query_grams = trigrams(text)
+            if query_grams:
+                shared: Counter = Counter()
+                for gram in query_grams:
+                    shared.update(self.title_grams.get(gram, ()))
+                for doc_id, common in shared.items():
+                    similarity = common / (len(query_grams) + len(self.doc_grams[doc_id]) - common)
+                    if similarity >= TRIGRAM_THRESHOLD:
+                        scores[doc_id] = scores.get(doc_id, 0.0) + similarity
+
+            candidates = [
+                (self.documents[doc_id], score) for doc_id, score in scores.items()
+                if is_active is None or self.documents[doc_id].is_active == is_active
+            ]
+        return heapq.nsmallest(limit, candidates, key=lambda hit: (-hit[1], hit[0].title.lower(), hit[0].id))
@@ -0,0 +1,310 @@
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+import csv
+import io
+import json
+import re
+
+IMPORT_FORMATS = ("csv", "json", "chordpro")
+
+# File extension -> format, for uploads that do not say which one they are
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "json",
+    ".ndjson": "json",
+    ".cho": "chordpro",
+    ".chopro": "chordpro",
+    ".chordpro": "chordpro",
+    ".crd": "chordpro",
+    ".pro": "chordpro",
+}
+
+# Columns of a CSV export, in order; imports accept any subset in any order
+CSV_COLUMNS = (
+    "title", "scale", "genre", "is_active", "description",
+    "lyrics", "chord_structure", "lyrics_with_chords", "setlists",
+)
+
+# CSV cells holding several values ("Opening; Encore", "3;7")
+LIST_COLUMNS = ("setlists", "setlist_ids")
+LIST_SEPARATOR = ";"
+
+JSON_CHUNK_CHARS = 64 * 1024
+JSON_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+CHORDPRO_DIRECTIVE = re.compile(r"^\{\s*([A-Za-z_]+)\s*(?::\s*(.*?))?\s*\}$")
+CHORDPRO_CHORD = re.compile(r"\[([^\]]*)\]")
+CHORDPRO_NEW_SONG = ("new_song", "ns")
+
+
+class SongFileError(ValueError):
+    """The upload itself cannot be parsed any further (as opposed to one bad record)"""
+
+
+def format_for_filename(filename: Optional[str]) -> Optional[str]:
+    """Import format implied by a file name's extension"""
+    if not filename or "." not in filename:
+        return None
+    return FORMAT_EXTENSIONS.get(filename[filename.rfind("."):].lower())
+
+
+def read_song_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Decode an uploaded song file record by record as (record number, fields),
+    reading it incrementally. Raises SongFileError where the file stops being
+    parseable; records before that point have already been yielded.
+    """
+    readers = {"csv": _read_csv, "json": _read_json, "chordpro": _read_chordpro}
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="" if fmt == "csv" else None)
+    try:
+        yield from readers[fmt](text)
+    except UnicodeDecodeError:
+        raise SongFileError("File is not UTF-8 text")
+    finally:
+        text.detach()  # Leave the upload's own file open for its owner to close
+
+
+def _read_csv(text: io.TextIOBase) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = csv.DictReader(text)
+    try:
+        for number, row in enumerate(reader, 1):
+            record = {}
+            for column, value in row.items():
+                if column is None:
+                    continue  # Cells beyond the header
+                column = column.strip().lower()
+                value = value.strip() if isinstance(value, str) else value
+                if not value:
+                    continue  # An empty cell means "not given", so schema defaults apply
+                if column in LIST_COLUMNS:
+                    record[column] = [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+                else:
+                    record[column] = value
+            yield number, record
+    except csv.Error as exc:
+        raise SongFileError(f"CSV line {reader.line_num}: {exc}")
+
+
+def _read_json(text: io.TextIOBase) -> Iterator[Tuple[int, Any]]:
+    """Records of a JSON array or of JSON Lines, decoded one at a time from a sliding buffer"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    number = 0
+    in_array = None
+
+    while True:
+        pos = JSON_WHITESPACE.match(buffer, pos).end()
+        if in_array and pos < len(buffer) and buffer[pos] == ",":
+            pos += 1
+            continue
+
+        if pos == len(buffer):
+            if eof:
+                if in_array:
+                    raise SongFileError(f"JSON array is not closed after record {number}")
+                return
+            chunk = text.read(JSON_CHUNK_CHARS)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        if in_array is None:
+            in_array = buffer[pos] == "["
+            if in_array:
+                pos += 1
+            continue
+        if in_array and buffer[pos] == "]":
+            if JSON_WHITESPACE.match(buffer, pos + 1).end() < len(buffer) or not eof and text.read(JSON_CHUNK_CHARS).strip():
+                raise SongFileError("Unexpected data after the JSON array")
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as exc:
+            if not eof:
+                # The record may just continue in the next chunk
+                chunk = text.read(JSON_CHUNK_CHARS)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            raise SongFileError(f"Invalid JSON in record {number + 1}: {exc.msg}")
+
+        if end == len(buffer) and not eof and not isinstance(value, (dict, list, str)):
+            # A bare number or literal at the end of the buffer may be cut short
+            chunk = text.read(JSON_CHUNK_CHARS)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        number += 1
+        yield number, value
+        pos = end
+
+
+def _read_chordpro(text: io.TextIOBase) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Songs of a ChordPro file, split on {new_song} or on a second {title}.
+    title/subtitle/key/meta genre fill the song fields; the body is kept with
+    its inline chords as lyrics_with_chords, and yields the plain lyrics and
+    the per-line chord progression.
+    """
+    number = 0
+    song: Dict[str, Any] = {}
+    body: List[str] = []
+
+    def finish():
+        if not song and not any(line.strip() for line in body):
+            return None
+        return {**song, **_chordpro_body(body)}
+
+    for line in text:
+        line = line.rstrip("\r\n")
+        directive = CHORDPRO_DIRECTIVE.match(line.strip())
+        name = directive.group(1).lower() if directive else None
+        value = (directive.group(2) or "").strip() if directive else ""
+
+        if name in CHORDPRO_NEW_SONG or (name in ("title", "t") and "title" in song):
+            record = finish()
+            if record is not None:
+                number += 1
+                yield number, record
+            song, body = {}, []
+            if name in CHORDPRO_NEW_SONG:
+                continue
+
+        if name in ("title", "t"):
+            song["title"] = value
+        elif name in ("subtitle", "st"):
+            song["description"] = f"{song['description']}\n{value}" if song.get("description") else value
+        elif name == "key":
+            song["scale"] = value or None
+        elif name == "meta" and value.lower().startswith("genre "):
+            song["genre"] = value[len("genre "):].strip() or None
+        else:
+            body.append(line)
+
+    record = finish()
+    if record is not None:
+        yield number + 1, record
+
+
+def _chordpro_body(lines: List[str]) -> Dict[str, Optional[str]]:
+    while lines and not lines[0].strip():
+        lines = lines[1:]
+    while lines and not lines[-1].strip():
+        lines = lines[:-1]
+
+    lyrics, progression = [], []
+    for line in lines:
+        if CHORDPRO_DIRECTIVE.match(line.strip()):
+            continue  # Section and formatting directives stay in lyrics_with_chords only
+        chords = [chord.strip() for chord in CHORDPRO_CHORD.findall(line) if chord.strip()]
+        if chords:
+            progression.append(" ".join(chords))
+        lyrics.append(CHORDPRO_CHORD.sub("", line).rstrip())
+
+    return {
+        "lyrics": "\n".join(lyrics).strip() or None,
+        "chord_structure": "\n".join(progression) or None,
+        "lyrics_with_chords": "\n".join(lines) or None,
+    }
+
+
+def song_record(song, setlist_names: List[str]) -> Dict[str, Any]:
+    """Export fields of a song"""
+    return {
+        "title": song.title,
+        "scale": song.scale,
+        "genre": song.genre,
+        "is_active": bool(song.is_active),
+        "description": song.description,
+        "lyrics": song.lyrics,
+        "chord_structure": song.chord_structure,
+        "lyrics_with_chords": song.lyrics_with_chords,
+        "setlists": setlist_names,
+    }
+
+
+class CsvExportWriter:
+    media_type = "text/csv"
+    extension = "csv"
+
+    def start(self) -> str:
+        return self._rows([CSV_COLUMNS])
+
+    def write(self, records: List[Dict[str, Any]]) -> str:
+        return self._rows([
+            [
+                f"{LIST_SEPARATOR} ".join(record[column]) if column in LIST_COLUMNS
+                else "" if record[column] is None else record[column]
+                for column in CSV_COLUMNS
+            ]
+            for record in records
+        ])
+
+    def end(self) -> str:
+        return ""
+
+    def _rows(self, rows) -> str:
+        out = io.StringIO()
+        csv.writer(out).writerows(rows)
+        return out.getvalue()
+
+
+class JsonExportWriter:
+    """A JSON array, one song object per line"""
+    media_type = "application/json"
+    extension = "json"
+
+    def __init__(self):
+        self.first = True
+
+    def start(self) -> str:
+        return "["
+
+    def write(self, records: List[Dict[str, Any]]) -> str:
+        parts = []
+        for record in records:
+            parts.append(("\n" if self.first else ",\n") + json.dumps(record, ensure_ascii=False))
+            self.first = False
+        return "".join(parts)
+
+    def end(self) -> str:
+        return "\n]\n"
+
+
+class ChordProExportWriter:
+    """Songs separated by {new_song}; setlists and is_active have no ChordPro directive and are left out"""
+    media_type = "text/plain"
+    extension = "cho"
+
+    def __init__(self):
+        self.first = True
+
+    def start(self) -> str:
+        return ""
+
+    def write(self, records: List[Dict[str, Any]]) -> str:
+        parts = []
+        for record in records:
+            lines = [] if self.first else ["", "{new_song}"]
+            lines.append(f"{{title: {record['title']}}}")
+            if record["description"]:
+                lines.extend(f"{{subtitle: {line}}}" for line in record["description"].splitlines() if line.strip())
+            if record["scale"]:
+                lines.append(f"{{key: {record['scale']}}}")
+            if record["genre"]:
+                lines.append(f"{{meta: genre {record['genre']}}}")
+            body = record["lyrics_with_chords"] or record["lyrics"]
+            if body:
+                lines.extend(["", body])
+            parts.append("\n".join(lines) + "\n")
+            self.first = False
+        return "".join(parts)
+
+    def end(self) -> str:
+        return ""
+
+
+EXPORT_WRITERS = {
+    "csv": CsvExportWriter,
+    "json": JsonExportWriter,
+    "chordpro": ChordProExportWriter,
+}
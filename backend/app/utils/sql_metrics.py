@@ -0,0 +1,173 @@
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from threading import Lock
+from typing import Deque, List, Optional, Tuple
+import json
+import re
+import time
+
+from app.config import settings
+
+# Bound parameter lists ("IN (?, ?, ?)", "IN (%(p_1)s, ...)", "IN ($1, $2)") collapse
+# to one placeholder so statements that differ only in list length share a shape
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_MULTI_ROW_VALUES = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+# Longest statement text kept in logs and on the debug endpoint
+STATEMENT_PREVIEW_CHARS = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    """An endpoint issued more statements than its budget (raised in "raise" mode, e.g. under tests)"""
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with bound-parameter lists collapsed and whitespace normalized"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _MULTI_ROW_VALUES.sub(r"\1", shape)
+
+
+@dataclass
+class RequestSqlStats:
+    """Statements one request issued, filled in by the engine hooks below"""
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    count: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    slowest: List[Tuple[float, str]] = field(default_factory=list)
+    budget: Optional[int] = None
+    status: Optional[int] = None
+    lock: Lock = field(default_factory=Lock, repr=False)
+    
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        with self.lock:
+            self.count += 1
+            self.db_seconds += seconds
+            self.shapes[shape] += 1
+            self.slowest.append((seconds, shape))
+            self.slowest.sort(key=lambda entry: entry[0], reverse=True)
+            del self.slowest[settings.SQL_SLOWEST_STATEMENTS:]
+    
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Statement shapes run at least SQL_REPEAT_THRESHOLD times: likely N+1 loops"""
+        return [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= settings.SQL_REPEAT_THRESHOLD
+        ]
+    
+    def over_budget(self) -> bool:
+        budget = self.budget if self.budget is not None else settings.SQL_QUERY_BUDGET
+        return budget is not None and self.count > budget
+    
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries"'
+    
+    def summary(self) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "queries": self.count,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "budget": self.budget if self.budget is not None else settings.SQL_QUERY_BUDGET,
+            "repeated": [
+                {"statement": shape[:STATEMENT_PREVIEW_CHARS], "count": count}
+                for shape, count in self.repeated()
+            ],
+            "slowest": [
+                {"statement": shape[:STATEMENT_PREVIEW_CHARS], "ms": round(seconds * 1000, 2)}
+                for seconds, shape in self.slowest
+            ],
+        }
+
+
+# Stats of the request being handled; copied into threadpool calls, so sync
+# repository code run through the session runner reports into the same object
+current_sql_stats: ContextVar[Optional[RequestSqlStats]] = ContextVar("current_sql_stats", default=None)
+
+# Summaries of the latest requests, for the debug endpoint
+recent_requests: Deque[dict] = deque(maxlen=settings.SQL_RECENT_REQUESTS)
+
+
+def set_query_budget(max_queries: int) -> None:
+    """Give the current request its own statement budget"""
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.budget = max_queries
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement an engine runs and attribute it to the current request"""
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if current_sql_stats.get() is not None:
+            conn.info.setdefault("sql_started", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        stats = current_sql_stats.get()
+        started = conn.info.get("sql_started")
+        if stats is not None and started:
+            stats.record(statement, time.perf_counter() - started.pop())
+
+
+class SqlInstrumentationMiddleware:
+    """
+    ASGI middleware reporting each request's SQL: a Server-Timing header, a
+    JSON log line (always for N+1 suspects and budget overruns, for every
+    request with SQL_LOG_REQUESTS) and the recent_requests ring buffer.
+    With SQL_QUERY_BUDGET_MODE="raise" an overrun raises instead of responding.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestSqlStats(method=scope["method"], path=scope["path"])
+        token = current_sql_stats.set(stats)
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                if stats.over_budget() and settings.SQL_QUERY_BUDGET_MODE == "raise":
+                    raise QueryBudgetExceeded(
+                        f"{stats.method} {stats.path} ran {stats.count} statements, budget "
+                        f"{stats.budget if stats.budget is not None else settings.SQL_QUERY_BUDGET}: "
+                        f"{json.dumps(stats.summary()['repeated'])}"
+                    )
+                stats.status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                # Lets the frontend (another origin) read Server-Timing in devtools/PerformanceResourceTiming
+                headers.append((b"timing-allow-origin", settings.FRONTEND_URL.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_sql_stats.reset(token)
+            if stats.count:
+                self._report(stats)
+    
+    def _report(self, stats: RequestSqlStats) -> None:
+        summary = stats.summary()
+        recent_requests.append(summary)
+        
+        flagged = summary["repeated"] or stats.over_budget()
+        if settings.SQL_LOG_REQUESTS or flagged:
+            print(json.dumps({"event": "sql", **summary}))
@@ -0,0 +1,88 @@
+"""
+Load benchmark for the two database paths: p50/p99 latency and requests per
+second of authenticated song reads at a fixed concurrency, once with
+DB_ASYNC=false (sessions on the Starlette threadpool) and once with
+DB_ASYNC=true (AsyncSession). Each path runs in its own process because the
+setting is read at import time.
+
+    cd backend && python benchmarks/async_load.py --requests 2000 --concurrency 100
+
+Requests go to the app in-process over ASGI, so client and server share one
+event loop; compare the two rows with each other, not with a deployed server.
+"""
+from common import configure, create_band, signup, summarize_ms
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+
+async def run_load(requests: int, concurrency: int) -> dict:
+    import httpx
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        band_id = create_band(client, headers)
+        song_ids = []
+        for number in range(20):
+            response = client.post("/api/v1/songs/", json={
+                "band_id": band_id, "title": f"Song {number}", "lyrics": "la la la"
+            }, headers=headers)
+            response.raise_for_status()
+            song_ids.append(response.json()["id"])
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def one(number: int, record: bool) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(f"/api/v1/songs/{song_ids[number % len(song_ids)]}", headers=headers)
+                elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            if record:
+                latencies.append(elapsed)
+
+        await asyncio.gather(*(one(number, False) for number in range(min(requests, 200))))
+        start = time.perf_counter()
+        await asyncio.gather(*(one(number, True) for number in range(requests)))
+        wall = time.perf_counter() - start
+
+    return {"latencies": latencies, "rps": requests / wall}
+
+
+def child(db_async: bool, requests: int, concurrency: int) -> None:
+    configure(DB_ASYNC=str(db_async).lower(), SQL_INSTRUMENTATION="false", METRICS_ENABLED="false")
+    result = asyncio.run(run_load(requests, concurrency))
+    print("RESULT " + json.dumps(result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--child", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child == "async", args.requests, args.concurrency)
+        return
+
+    print(f"GET /api/v1/songs/{{id}}: {args.requests} requests, concurrency {args.concurrency}")
+    for mode in ("sync", "async"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, "--requests", str(args.requests),
+             "--concurrency", str(args.concurrency)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(next(line for line in output.splitlines() if line.startswith("RESULT "))[7:])
+        print(f"  DB_ASYNC={mode == 'async'!s:<5}  {summarize_ms(result['latencies'])}  {result['rps']:.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
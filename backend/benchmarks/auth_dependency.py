@@ -0,0 +1,87 @@
+"""
+Cost of authenticating a request. Before: every router's own sync
+get_current_user_id re-verified the JWT with jose on each call, and FastAPI
+ran it on the threadpool. After: the shared async dependency in
+app/api/deps.py returns cached claims. Also times GET /auth/me with and
+without the per-user response cache.
+
+    cd backend && python benchmarks/auth_dependency.py --calls 20000
+"""
+from common import configure, signup, summarize_ms
+import argparse
+import asyncio
+import time
+
+configure(SQL_INSTRUMENTATION="false", METRICS_ENABLED="false")
+
+from fastapi import HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from app.api.deps import get_current_user_id
+from app.database import engine
+from app.main import app
+from app.utils.auth import decode_access_token
+from app.utils.cache import current_user_cache, token_cache
+
+
+def legacy_get_current_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """The dependency as it was copied into each router"""
+    payload = decode_access_token(credentials.credentials)
+    if not payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+    return int(user_id)
+
+
+async def time_calls(call, calls: int) -> list:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=headers["Authorization"][7:])
+
+        before = asyncio.run(time_calls(lambda: run_in_threadpool(legacy_get_current_user_id, credentials), args.calls))
+        token_cache.clear()
+        after = asyncio.run(time_calls(lambda: get_current_user_id(credentials), args.calls))
+        print(f"get_current_user_id, {args.calls} calls")
+        print(f"  before (jose decode on the threadpool): {summarize_ms(before)}")
+        print(f"  after  (cached claims, async):          {summarize_ms(after)}")
+
+        statements = {"count": 0}
+
+        def count(*_):
+            statements["count"] += 1
+
+        event.listen(engine, "before_cursor_execute", count)
+        for label, clear in (("without user cache", True), ("with user cache", False)):
+            samples = []
+            statements["count"] = 0
+            for _ in range(args.requests):
+                if clear:
+                    current_user_cache.clear()
+                start = time.perf_counter()
+                client.get("/api/v1/auth/me", headers=headers).raise_for_status()
+                samples.append(time.perf_counter() - start)
+            print(f"GET /auth/me {label}: {summarize_ms(samples)}  "
+                  f"{statements['count'] / args.requests:.1f} statements/request")
+        event.remove(engine, "before_cursor_execute", count)
+
+
+if __name__ == "__main__":
+    main()
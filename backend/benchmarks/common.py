@@ -0,0 +1,59 @@
+"""
+Shared setup for the benchmark scripts: a throwaway database migrated to
+head (SQLite by default, BENCH_DATABASE_URL for Postgres) and helpers to
+seed a user and band through the API. Run the scripts from backend/.
+"""
+from pathlib import Path
+from typing import Dict, List
+import os
+import statistics
+import sys
+import tempfile
+import uuid
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def configure(**settings) -> None:
+    """Set the environment app.config reads, then migrate the database. Call before importing app.main."""
+    workdir = tempfile.mkdtemp(prefix="band-bench-")
+    os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ.setdefault("GOOGLE_CLIENT_ID", "bench")
+    os.environ.setdefault("GOOGLE_CLIENT_SECRET", "bench")
+    os.environ.setdefault("GOOGLE_REDIRECT_URI", "http://localhost/callback")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    os.environ.setdefault("DB_WARMUP", "false")
+    for name, value in settings.items():
+        os.environ[name] = str(value)
+
+    from app.init_db import init_db
+    init_db()
+
+
+def signup(client) -> Dict[str, str]:
+    """Bearer headers of a new user"""
+    response = client.post("/api/v1/auth/signup", json={
+        "email": f"{uuid.uuid4().hex}@example.com", "password": "secret", "name": "Bench"
+    })
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_band(client, headers: Dict[str, str], name: str = "Bench Band") -> int:
+    response = client.post("/api/v1/bands/", json={"name": name}, headers=headers)
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize_ms(samples: List[float]) -> str:
+    """p50 / p99 / mean of durations given in seconds"""
+    return (f"p50 {percentile(samples, 50) * 1000:.3f}ms  p99 {percentile(samples, 99) * 1000:.3f}ms  "
+            f"mean {statistics.mean(samples) * 1000:.3f}ms")
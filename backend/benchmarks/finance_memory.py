@@ -0,0 +1,107 @@
+"""
+Peak Python memory of the band finance queries as show history grows.
+Before: totals loaded every Show / ShowPayment row and summed Decimals in
+Python. After: COALESCE(SUM(...)) aggregates and the grouped finance summary
+behind GET /shows/band/{id}/finance. Rows are bulk-inserted, so large
+histories stay quick to seed.
+
+    cd backend && python benchmarks/finance_memory.py --shows 100 1000 10000 --payments-per-show 4
+"""
+from common import configure, create_band, signup
+import argparse
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+configure(SQL_INSTRUMENTATION="false", METRICS_ENABLED="false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+from app.database import SessionLocal
+from app.main import app
+from app.models.show import Show
+from app.models.show_payment import ShowPayment
+from app.repositories.show import ShowRepository
+from app.repositories.show_payment import ShowPaymentRepository
+from app.services.show_payment import ShowPaymentService
+
+
+def legacy_total_band_fund(session, band_id: int) -> Decimal:
+    """ShowRepository.get_total_band_fund before the change"""
+    shows = session.query(Show).filter(Show.band_id == band_id, Show.band_fund_amount.isnot(None)).all()
+    total = sum(show.band_fund_amount for show in shows if show.band_fund_amount)
+    return total if total else Decimal("0")
+
+
+def legacy_total_paid(session, band_id: int) -> Decimal:
+    """Band-wide payouts the old way: every payment row of every show, summed in Python"""
+    payments = session.query(ShowPayment).join(Show).filter(Show.band_id == band_id).all()
+    return sum(payment.amount for payment in payments) if payments else Decimal("0")
+
+
+def peak_kib(fn) -> float:
+    """Peak traced allocation while fn runs against a fresh session"""
+    session = SessionLocal()
+    try:
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        fn(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak / 1024
+    finally:
+        session.close()
+
+
+def grow_history(band_id: int, target_shows: int, payments_per_show: int) -> None:
+    """Add shows (with payments) until the band has target_shows"""
+    with SessionLocal() as session:
+        existing = session.query(Show).filter(Show.band_id == band_id).count()
+        now = datetime.utcnow()
+        shows = [
+            {
+                "band_id": band_id, "venue": f"Venue {number}", "show_date": date(2015, 1, 1) + timedelta(days=number),
+                "show_members": ["Ann", "Bo", "Cy", "Di"], "payment": Decimal("1000.00"),
+                "band_fund_amount": Decimal("100.00"), "status": "DONE", "created_at": now, "updated_at": now,
+            }
+            for number in range(existing, target_shows)
+        ]
+        if not shows:
+            return
+        session.execute(insert(Show), shows)
+        new_ids = session.scalars(
+            select(Show.id).where(Show.band_id == band_id).order_by(Show.id.desc()).limit(len(shows))
+        ).all()
+        session.execute(insert(ShowPayment), [
+            {"show_id": show_id, "member_name": ["Ann", "Bo", "Cy", "Di"][number % 4], "amount": Decimal("225.00"),
+             "created_at": now, "updated_at": now}
+            for show_id in new_ids for number in range(payments_per_show)
+        ])
+        session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--payments-per-show", type=int, default=4)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        band_id = create_band(client, headers)
+        user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+
+    print(f"Peak traced memory (KiB), {args.payments_per_show} payments per show")
+    print(f"{'shows':>7} {'fund total before':>18} {'after':>8} {'payouts before':>15} {'after':>8} {'finance summary':>16}")
+    for target in sorted(args.shows):
+        grow_history(band_id, target, args.payments_per_show)
+        fund_before = peak_kib(lambda session: legacy_total_band_fund(session, band_id))
+        fund_after = peak_kib(lambda session: ShowRepository(session).get_total_band_fund(band_id))
+        paid_before = peak_kib(lambda session: legacy_total_paid(session, band_id))
+        paid_after = peak_kib(lambda session: ShowPaymentRepository(session).get_band_member_payouts(band_id))
+        finance = peak_kib(lambda session: ShowPaymentService(session).get_band_finance_summary(band_id, user_id))
+        print(f"{target:>7} {fund_before:>18.0f} {fund_after:>8.0f} {paid_before:>15.0f} {paid_after:>8.0f} {finance:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
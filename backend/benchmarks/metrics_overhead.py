@@ -0,0 +1,147 @@
+"""
+Per-request cost of the Prometheus metrics (MetricsMiddleware plus the
+/metrics scrape), with METRICS_ENABLED=true and with false. Each setting runs
+in its own process because it is read at import time, and the two alternate
+for a few rounds, since run-to-run noise is as large as the difference.
+Times a dependency-free route (GET /health/live) and an authenticated song
+read one request at a time, then requests per second at a fixed concurrency.
+With metrics on, also times rendering /metrics after the load. Finally the
+middleware alone, wrapped around a no-op ASGI app, without the noise.
+
+    cd backend && python benchmarks/metrics_overhead.py --requests 3000 --concurrency 50 --rounds 3
+
+Requests go to the app in-process over ASGI; compare the rows with each
+other, not with a deployed server.
+"""
+from common import configure, create_band, signup, summarize_ms
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+async def run_load(requests: int, concurrency: int, metrics: bool) -> dict:
+    import httpx
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        band_id = create_band(client, headers)
+        response = client.post("/api/v1/songs/", json={
+            "band_id": band_id, "title": "Song", "lyrics": "la la la"
+        }, headers=headers)
+        response.raise_for_status()
+        song_path = f"/api/v1/songs/{response.json()['id']}"
+
+    result = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        async def timed(path: str, request_headers=None) -> float:
+            start = time.perf_counter()
+            response = await client.get(path, headers=request_headers)
+            elapsed = time.perf_counter() - start
+            response.raise_for_status()
+            return elapsed
+
+        for label, path, request_headers in (("live", "/health/live", None), ("song", song_path, headers)):
+            for _ in range(min(requests, 200)):
+                await timed(path, request_headers)
+            result[label] = [await timed(path, request_headers) for _ in range(requests)]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with semaphore:
+                await timed(song_path, headers)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        result["rps"] = requests / (time.perf_counter() - start)
+
+        if metrics:
+            result["scrape"] = [await timed("/metrics") for _ in range(50)]
+    return result
+
+
+def child(metrics: bool, requests: int, concurrency: int) -> None:
+    configure(METRICS_ENABLED=str(metrics).lower(), SQL_INSTRUMENTATION="false")
+    result = asyncio.run(run_load(requests, concurrency, metrics))
+    print("RESULT " + json.dumps(result))
+
+
+def middleware_cost(calls: int) -> float:
+    """Seconds per request MetricsMiddleware adds around a no-op app"""
+    from app.utils.metrics import MetricsMiddleware
+
+    class Route:
+        path = "/api/v1/songs/{song_id}"
+
+    async def app(scope, receive, send):
+        scope["route"] = Route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    async def run(handler) -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            await handler({"type": "http", "method": "GET", "path": "/"}, None, send)
+        return time.perf_counter() - start
+
+    async def compare() -> float:
+        wrapped = MetricsMiddleware(app)
+        differences = []
+        for _ in range(5):
+            differences.append(await run(wrapped) - await run(app))
+        return min(differences) / calls
+
+    return asyncio.run(compare())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--child", choices=["on", "off"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child == "on", args.requests, args.concurrency)
+        return
+
+    results = {"off": [], "on": []}
+    for round_number in range(args.rounds):
+        for mode in ("off", "on") if round_number % 2 == 0 else ("on", "off"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--requests", str(args.requests),
+                 "--concurrency", str(args.concurrency)],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results[mode].append(json.loads(next(line for line in output.splitlines() if line.startswith("RESULT "))[7:]))
+
+    def samples(mode: str, label: str) -> list:
+        return [sample for result in results[mode] for sample in result[label]]
+
+    print(f"{args.rounds} rounds of {args.requests} requests per row; sequential latency, then concurrency {args.concurrency}")
+    for label, title in (("live", "GET /health/live"), ("song", "GET /api/v1/songs/{id}")):
+        print(title)
+        for mode in ("off", "on"):
+            print(f"  METRICS_ENABLED={mode == 'on'!s:<5}  {summarize_ms(samples(mode, label))}")
+        overhead = statistics.mean(samples("on", label)) - statistics.mean(samples("off", label))
+        print(f"  difference: {overhead * 1e6:+.1f}us per request (mean)")
+    print(f"GET /api/v1/songs/{{id}} at concurrency {args.concurrency}")
+    for mode in ("off", "on"):
+        rps = statistics.median(result["rps"] for result in results[mode])
+        print(f"  METRICS_ENABLED={mode == 'on'!s:<5}  {rps:.0f} req/s (median round)")
+    print(f"GET /metrics (50 scrapes per round): {summarize_ms(samples('on', 'scrape'))}")
+    print(f"MetricsMiddleware alone: {middleware_cost(20000) * 1e6:.1f}us per request")
+
+
+if __name__ == "__main__":
+    main()
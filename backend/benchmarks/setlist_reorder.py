@@ -0,0 +1,173 @@
+"""
+Heavy reordering of long setlists: many single-song moves in a row against
+setlists of growing length, each move in its own transaction and based on
+the version the previous one left. "gap move" is what PUT
+/setlists/{id}/songs/move runs: the version compare-and-swap, then one row
+written (plus a local respace when a spot runs out of midpoints). Compared
+with the dense positions it replaced (shift every row in between) and with
+sending the whole order through PUT /setlists/{id}/order for every move.
+"hot spot" moves the last song to slot 1 over and over, the worst case for
+running out of midpoints. The last row times the full move request, which
+also reloads the setlist for its response.
+
+    cd backend && python benchmarks/setlist_reorder.py --songs 100 1000 5000 --moves 300
+"""
+from common import configure, create_band, signup, summarize_ms
+import argparse
+import random
+import time
+from datetime import datetime
+
+configure(SQL_INSTRUMENTATION="false", METRICS_ENABLED="false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert, select, update
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models.master_setlist import MasterSetlist
+from app.models.setlist_song import SetlistSong
+from app.models.song import Song
+from app.models.versioning import bump_band_versions
+from app.repositories.setlist_song import POSITION_GAP, SetlistSongRepository
+
+rng = random.Random(11)
+rows_written = {"count": 0}
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def count_rows(conn, cursor, statement, parameters, context, executemany):
+    if statement.startswith("UPDATE setlist_songs"):
+        rows_written["count"] += max(cursor.rowcount, 0)
+
+
+def seed_setlist(band_id: int, length: int, dense: bool) -> int:
+    """A setlist of `length` new songs, positioned 0, 1, 2... (dense) or GAP apart"""
+    now = datetime.utcnow()
+    with SessionLocal() as session:
+        setlist_id = session.execute(
+            insert(MasterSetlist).values(band_id=band_id, name=f"{length} songs", created_at=now, updated_at=now)
+        ).inserted_primary_key[0]
+        session.execute(insert(Song), [
+            {"band_id": band_id, "title": f"Song {setlist_id}-{number}", "is_active": True,
+             "created_at": now, "updated_at": now}
+            for number in range(length)
+        ])
+        song_ids = session.scalars(
+            select(Song.id).where(Song.band_id == band_id).order_by(Song.id.desc()).limit(length)
+        ).all()
+        session.execute(insert(SetlistSong), [
+            {"setlist_id": setlist_id, "song_id": song_id, "created_at": now,
+             "position": index if dense else (index + 1) * POSITION_GAP}
+            for index, song_id in enumerate(reversed(song_ids))
+        ])
+        session.commit()
+        return setlist_id
+
+
+def dense_move(session, setlist_id: int, song_id: int, slot: int, order, version: int) -> bool:
+    """A move under the old dense positions: shift the rows in between, then place the song"""
+    current = session.scalar(select(SetlistSong.position).where(
+        SetlistSong.setlist_id == setlist_id, SetlistSong.song_id == song_id
+    ))
+    rows = update(SetlistSong).where(SetlistSong.setlist_id == setlist_id)
+    if slot < current:
+        session.execute(rows.where(SetlistSong.position >= slot, SetlistSong.position < current)
+                        .values(position=SetlistSong.position + 1))
+    elif slot > current:
+        session.execute(rows.where(SetlistSong.position > current, SetlistSong.position <= slot)
+                        .values(position=SetlistSong.position - 1))
+    session.execute(rows.where(SetlistSong.song_id == song_id).values(position=slot))
+    session.execute(update(MasterSetlist).where(MasterSetlist.id == setlist_id)
+                    .values(version=MasterSetlist.version + 1))
+    bump_band_versions(session, setlist_ids=[setlist_id])
+    return True
+
+
+def gap_move(session, setlist_id: int, song_id: int, slot: int, order, version: int) -> bool:
+    return SetlistSongRepository(session).move_song(setlist_id, song_id, slot, version)
+
+
+def whole_order(session, setlist_id: int, song_id: int, slot: int, order, version: int) -> bool:
+    return SetlistSongRepository(session).reorder_songs(setlist_id, order, version)
+
+
+def current_version(setlist_id: int) -> int:
+    with SessionLocal() as session:
+        return session.scalar(select(MasterSetlist.version).where(MasterSetlist.id == setlist_id))
+
+
+def make_moves(length: int, count: int, hot_spot: bool):
+    """(from slot, to slot) pairs"""
+    if hot_spot:
+        return [(length - 1, 1)] * count
+    return [(rng.randrange(length), rng.randrange(length)) for _ in range(count)]
+
+
+def replay(setlist_id: int, moves, write):
+    """
+    Apply each move with write(...) in its own transaction, carrying the
+    version over from the previous move. Returns (seconds per move,
+    setlist_songs rows updated per move).
+    """
+    with SessionLocal() as session:
+        order = SetlistSongRepository(session).get_setlist_song_ids(setlist_id)
+    version = current_version(setlist_id)
+    samples = []
+    rows_written["count"] = 0
+    for source, target in moves:
+        song_id = order.pop(source)
+        order.insert(target, song_id)
+        start = time.perf_counter()
+        with SessionLocal() as session:
+            assert write(session, setlist_id, song_id, target, order, version), "stale version"
+            session.commit()
+        samples.append(time.perf_counter() - start)
+        version = current_version(setlist_id)
+    with SessionLocal() as session:
+        assert SetlistSongRepository(session).get_setlist_song_ids(setlist_id) == order
+    return samples, rows_written["count"] / len(moves)
+
+
+def replay_api(client, headers, setlist_id: int, moves):
+    """The same moves as PUT songs/move requests, each sending the version of the previous response"""
+    setlist = client.get(f"/api/v1/setlists/{setlist_id}/songs", headers=headers).json()
+    order, version = [song["id"] for song in setlist["songs"]], setlist["version"]
+    samples = []
+    for source, target in moves:
+        song_id = order.pop(source)
+        order.insert(target, song_id)
+        start = time.perf_counter()
+        response = client.put(f"/api/v1/setlists/{setlist_id}/songs/move", headers=headers,
+                              json={"song_id": song_id, "position": target, "version": version})
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+        version = response.json()["version"]
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--moves", type=int, default=300)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        band_id = create_band(client, headers)
+
+        print(f"{args.moves} moves per run")
+        for length in args.songs:
+            for hot_spot in (False, True):
+                moves = make_moves(length, args.moves, hot_spot)
+                print(f"{length} songs, {'hot spot' if hot_spot else 'random moves'}")
+                for label, write, dense in (("dense shift (before)", dense_move, True),
+                                            ("gap move", gap_move, False),
+                                            ("whole order", whole_order, False)):
+                    samples, rows = replay(seed_setlist(band_id, length, dense), moves, write)
+                    print(f"  {label:<22} {summarize_ms(samples)}  {rows:.1f} rows/move")
+                samples = replay_api(client, headers, seed_setlist(band_id, length, False), moves)
+                print(f"  {'PUT songs/move':<22} {summarize_ms(samples)}")
+
+
+if __name__ == "__main__":
+    main()
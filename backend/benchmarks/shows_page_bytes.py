@@ -0,0 +1,93 @@
+"""
+Bytes the Shows page transfers for its poster cards. Before: each card loaded
+the original upload from /uploads. After: it loads the 480px WebP "card"
+variant from /api/v1/media/card/{sha256}.webp (see frontend/src/utils/media.ts).
+Posters are generated photo-like JPEGs at phone-camera size.
+
+    cd backend && python benchmarks/shows_page_bytes.py --shows 12
+
+Posters and their variants are written to backend/uploads like any upload
+and deleted again when the script finishes.
+"""
+from common import configure, create_band, signup
+import argparse
+import io
+import re
+import time
+
+configure(SQL_INSTRUMENTATION="false", METRICS_ENABLED="false")
+
+from fastapi.testclient import TestClient
+from PIL import Image, ImageFilter
+from app.main import app
+from app.services.image import IMAGE_VARIANTS, derivative_path, remove_derivatives
+from app.services.upload import path_for_url
+
+MEDIA_URL = re.compile(r"^/uploads/media/[0-9a-f]{2}/([0-9a-f]{64})\.\w+$")
+
+
+def poster_jpeg(seed: int, size=(3024, 4032)) -> bytes:
+    """Noise blurred into soft shapes, so it compresses like a photo rather than a flat test card"""
+    noise = Image.effect_noise((size[0] // 8, size[1] // 8), 60 + seed).convert("RGB")
+    image = noise.resize(size, Image.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+    grain = Image.effect_noise(size, 25).convert("RGB")
+    image = Image.blend(image, grain, 0.3)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shows", type=int, default=12)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        band_id = create_band(client, headers)
+        for number in range(args.shows):
+            response = client.post("/api/v1/shows/", json={
+                "band_id": band_id, "venue": f"Venue {number}", "show_date": f"2024-{number % 12 + 1:02d}-01"
+            }, headers=headers)
+            response.raise_for_status()
+            upload = poster_jpeg(number)
+            client.post(
+                f"/api/v1/shows/{response.json()['id']}/poster",
+                files={"file": (f"poster{number}.jpg", upload, "image/jpeg")}, headers=headers
+            ).raise_for_status()
+
+        page = client.get(f"/api/v1/shows/band/{band_id}", headers=headers)
+        page.raise_for_status()
+        shows = page.json()["items"]
+        sha256s = [MEDIA_URL.match(show["poster"]).group(1) for show in shows]
+
+        # Let the upload-time renders finish, so nothing writes variants after the cleanup below
+        deadline = time.monotonic() + 300
+        while not all(derivative_path(sha256, variant).exists() for sha256 in sha256s for variant in IMAGE_VARIANTS):
+            if time.monotonic() > deadline:
+                raise TimeoutError("Image variants were not rendered within 5 minutes")
+            time.sleep(0.2)
+
+        original_bytes = variant_bytes = 0
+        for show, sha256 in zip(shows, sha256s):
+            original = client.get(show["poster"])
+            original.raise_for_status()
+            original_bytes += len(original.content)
+
+            variant = client.get(f"/api/v1/media/card/{sha256}.webp")
+            variant.raise_for_status()
+            variant_bytes += len(variant.content)
+
+            path_for_url(show["poster"]).unlink(missing_ok=True)
+            remove_derivatives(sha256)
+
+    listing = len(page.content)
+    print(f"Shows page, {len(shows)} shows with posters (list JSON {listing / 1024:.1f} KiB)")
+    print(f"  before (original uploads): {(listing + original_bytes) / 1024 / 1024:.2f} MiB")
+    print(f"  after  (card WebP):        {(listing + variant_bytes) / 1024 / 1024:.2f} MiB")
+    print(f"  posters alone: {original_bytes / len(shows) / 1024:.0f} KiB -> "
+          f"{variant_bytes / len(shows) / 1024:.1f} KiB per card")
+
+
+if __name__ == "__main__":
+    main()
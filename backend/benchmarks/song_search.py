@@ -0,0 +1,142 @@
+"""
+Song search on a synthetic catalog (50k songs of ~190 words by default).
+Before: the songs tab downloaded the whole catalog and substring-filtered it
+in the browser; the "linear scan" row repeats that filter over the loaded
+rows. After: GET /songs/band/{id}/search. On SQLite that is the in-memory
+index in app/utils/search.py, whose build time, memory per song and
+incremental sync are reported too; with BENCH_DATABASE_URL pointing at
+Postgres it is the tsvector/trigram query and only query latency is timed.
+
+    cd backend && python benchmarks/song_search.py --songs 50000 --queries 300
+"""
+from common import configure, create_band, signup, summarize_ms
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime
+
+configure(SQL_INSTRUMENTATION="false", METRICS_ENABLED="false")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+from app.database import SessionLocal
+from app.main import app
+from app.models.song import Song
+from app.models.versioning import bump_band_versions
+from app.repositories.song import SongRepository
+from app.services.song_search import SongSearchService
+from app.utils.cache import search_index_cache
+
+rng = random.Random(7)
+WORDS = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(20000)]
+
+
+def words(count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def seed_songs(band_id: int, count: int) -> None:
+    """Bulk-insert songs: 3-word title, 20 lines of lyrics, a description and chords"""
+    now = datetime.utcnow()
+    with SessionLocal() as session:
+        for start in range(0, count, 5000):
+            session.execute(insert(Song), [
+                {
+                    "band_id": band_id, "title": words(3).title(), "lyrics": "\n".join(words(8) for _ in range(20)),
+                    "description": words(12), "chord_structure": "C G Am F", "is_active": number % 10 != 0,
+                    "created_at": now, "updated_at": now,
+                }
+                for number in range(start, min(count, start + 5000))
+            ])
+        session.commit()
+
+
+def build_index(band_id: int):
+    """Cold-build the band's in-memory index; returns (seconds, index)"""
+    search_index_cache.clear()
+    with SessionLocal() as session:
+        start = time.perf_counter()
+        index = SongSearchService(session)._get_index(band_id)
+        return time.perf_counter() - start, index
+
+
+def make_queries(titles, count: int):
+    """A third whole titles, a third 4-letter prefixes (search-as-you-type), a third two-word AND queries"""
+    third = count // 3
+    return ([rng.choice(titles).lower() for _ in range(third)]
+            + [rng.choice(WORDS)[:4] for _ in range(third)]
+            + [" ".join(rng.sample(WORDS, 2)) for _ in range(count - 2 * third)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--songs", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--edits", type=int, default=20)
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        headers = signup(client)
+        band_id = create_band(client, headers)
+        user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    seed_songs(band_id, args.songs)
+
+    with SessionLocal() as session:
+        postgres = session.get_bind().dialect.name == "postgresql"
+        catalog = session.query(Song.id, Song.title, Song.lyrics, Song.description).filter(Song.band_id == band_id).all()
+    queries = make_queries([song.title for song in catalog], args.queries)
+    print(f"{len(catalog)} songs, {len(queries)} queries, {'Postgres full-text' if postgres else 'in-memory index'}")
+
+    if not postgres:
+        seconds, _ = build_index(band_id)
+        print(f"  cold index build:       {seconds:.1f}s")
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        _, index = build_index(band_id)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained -= baseline
+        print(f"  index memory:           {retained / 2 ** 20:.1f} MiB retained "
+              f"({retained / len(catalog) / 1024:.1f} KiB per song), {(peak - baseline) / 2 ** 20:.1f} MiB peak while building")
+
+    samples = []
+    with SessionLocal() as session:
+        service = SongSearchService(session)
+        for q in queries:
+            start = time.perf_counter()
+            service.search(band_id, user_id, q)
+            samples.append(time.perf_counter() - start)
+    print(f"  search (with snippets): {summarize_ms(samples)}")
+
+    samples = []
+    for q in queries[:30]:
+        needle = q.lower()
+        start = time.perf_counter()
+        [song for song in catalog if needle in song.title.lower() or needle in (song.lyrics or "").lower()
+         or needle in (song.description or "").lower()]
+        samples.append(time.perf_counter() - start)
+    print(f"  linear scan (before):   {summarize_ms(samples)}")
+
+    if not postgres:
+        edited = rng.sample(catalog, args.edits + 1)
+        with SessionLocal() as session:
+            for song in edited[1:]:
+                session.query(Song).filter(Song.id == song.id).update(
+                    {Song.title: "Fresh " + song.title, Song.updated_at: datetime.utcnow()}
+                )
+            session.execute(delete(Song).where(Song.id == edited[0].id))
+            bump_band_versions(session, band_ids=[band_id])
+            session.commit()
+
+        with SessionLocal() as session:
+            stamps = SongRepository(session).get_band_song_stamps(band_id)
+            start = time.perf_counter()
+            indexed, removed = index.sync(stamps, lambda song_ids: SongRepository(session).iter_search_rows(band_id, song_ids))
+            seconds = time.perf_counter() - start
+        print(f"  incremental sync:       {seconds * 1000:.1f}ms ({indexed} re-indexed, {removed} removed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import uvicorn
+from app.init_db import init_db
 
 if __name__ == "__main__":
+    init_db()
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read when app.config is imported, so the test environment goes first
+_TEST_DIR = tempfile.mkdtemp(prefix="band-api-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{_TEST_DIR}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test")
+os.environ.setdefault("GOOGLE_REDIRECT_URI", "http://localhost/callback")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["SQL_QUERY_BUDGET_MODE"] = "raise"  # Endpoints over their query_budget fail the test
+os.environ["DB_WARMUP"] = "false"
+
+import io
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import event
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app.init_db import init_db
+    init_db()
+    
+    from app.main import app
+    return app
+
+
+@pytest.fixture(scope="session", autouse=True)
+def uploads_cleanup():
+    """Skip background variant renders and delete upload files the test run created"""
+    from app.services.image import image_pipeline
+    from app.services.upload import UPLOAD_ROOT
+    before = set(UPLOAD_ROOT.rglob("*"))
+    schedule, image_pipeline.schedule = image_pipeline.schedule, lambda sha256, url: None
+    yield
+    image_pipeline.schedule = schedule
+    for path in sorted(set(UPLOAD_ROOT.rglob("*")) - before, reverse=True):
+        if path.is_dir():
+            path.rmdir()
+        else:
+            path.unlink()
+
+
+@pytest.fixture
+def client(app):
+    from app.services.health import lifecycle
+    # The previous test's shutdown left the process draining
+    lifecycle.draining = False
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Bearer headers of a freshly signed-up user"""
+    response = client.post("/api/v1/auth/signup", json={
+        "email": f"{uuid.uuid4().hex}@example.com", "password": "secret", "name": "Tester"
+    })
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def band(client, auth_headers):
+    response = client.post("/api/v1/bands/", json={"name": "Test Band"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def post_json(client, headers, path, payload):
+    response = client.post(path, json=payload, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def create_setlist(client, auth_headers, band):
+    """create_setlist(name) adds a setlist to the band fixture; pass band_id/headers for another band"""
+    def create(name="Main", band_id=None, headers=None, **fields):
+        return post_json(client, headers or auth_headers, "/api/v1/setlists/", {
+            "band_id": band_id or band["id"], "name": name, **fields
+        })
+    return create
+
+
+@pytest.fixture
+def create_song(client, auth_headers, band):
+    """create_song(title, **fields) adds a song to the band fixture; pass band_id/headers for another band"""
+    def create(title="Song", band_id=None, headers=None, **fields):
+        return post_json(client, headers or auth_headers, "/api/v1/songs/", {
+            "band_id": band_id or band["id"], "title": title, **fields
+        })
+    return create
+
+
+@pytest.fixture
+def create_show(client, auth_headers, band):
+    """create_show(show_date, **fields) adds a show to the band fixture; pass band_id/headers for another band"""
+    def create(show_date="2024-01-15", venue="Club", band_id=None, headers=None, **fields):
+        return post_json(client, headers or auth_headers, "/api/v1/shows/", {
+            "band_id": band_id or band["id"], "venue": venue, "show_date": show_date, **fields
+        })
+    return create
+
+
+def png_bytes(size=(8, 8), color=0):
+    """A real PNG of the given size; 1-bit, so even huge dimensions stay a few KB"""
+    out = io.BytesIO()
+    Image.new("1", size, color).save(out, "PNG")
+    return out.getvalue()
+
+
+@pytest.fixture
+def statement_counter():
+    """Counts (and keeps) statements sent to the database by the engine requests use"""
+    from app.database import engine, async_engine
+    target = async_engine.sync_engine if async_engine is not None else engine
+    counter = {"count": 0, "statements": []}
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+        counter["statements"].append(statement)
+    
+    event.listen(target, "before_cursor_execute", count)
+    yield counter
+    event.remove(target, "before_cursor_execute", count)
+
+
+@pytest.fixture
+def postgres_session(app):
+    """Session on the test database; skips unless it is Postgres (TEST_DATABASE_URL=postgresql://...)"""
+    from app.database import engine, SessionLocal
+    if engine.dialect.name != "postgresql":
+        pytest.skip("needs Postgres: set TEST_DATABASE_URL to a postgresql:// database")
+    
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
@@ -0,0 +1,37 @@
+from app.api import deps
+from app.utils.cache import current_user_cache, token_cache
+
+
+def test_verified_tokens_are_not_decoded_again(client, auth_headers, monkeypatch):
+    decoded = []
+    decode = deps.decode_access_token
+    monkeypatch.setattr(deps, "decode_access_token", lambda token: decoded.append(token) or decode(token))
+    token_cache.clear()
+    
+    for _ in range(3):
+        assert client.get("/api/v1/bands/", headers=auth_headers).status_code == 200
+    assert len(decoded) == 1
+    
+    # A token that fails verification is refused every time, never cached
+    bad_headers = {"Authorization": "Bearer not-a-jwt"}
+    for _ in range(2):
+        assert client.get("/api/v1/bands/", headers=bad_headers).status_code == 401
+    assert len(decoded) == 3
+    assert token_cache.get("not-a-jwt") is None
+
+
+def test_current_user_is_cached_until_it_changes(client, auth_headers, statement_counter):
+    first = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert first.status_code == 200, first.text
+    assert first.json()["has_band"] is False
+    assert current_user_cache.get(first.json()["id"]) is not None
+    
+    statement_counter["count"] = 0
+    second = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert second.json() == first.json()
+    assert statement_counter["count"] == 0
+    
+    # Creating a band changes has_band, so the cached copy is dropped on commit
+    response = client.post("/api/v1/bands/", json={"name": "New Band"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["has_band"] is True
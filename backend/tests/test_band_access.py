@@ -0,0 +1,27 @@
+import uuid
+from app.utils.cache import membership_cache
+
+
+def test_removing_a_member_drops_their_cached_access(client, auth_headers, band):
+    email = f"{uuid.uuid4().hex}@example.com"
+    response = client.post(f"/api/v1/bands/{band['id']}/members/", json={"name": "Guest", "email": email},
+                           headers=auth_headers)
+    assert response.status_code == 200, response.text
+    member_id = response.json()["id"]
+    
+    # Signing up with the invited email links the new user to the membership
+    response = client.post("/api/v1/auth/signup", json={"email": email, "password": "secret", "name": "Guest"})
+    assert response.status_code == 200, response.text
+    member_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_id = client.get("/api/v1/auth/me", headers=member_headers).json()["id"]
+    
+    response = client.get(f"/api/v1/bands/{band['id']}", headers=member_headers)
+    assert response.status_code == 200, response.text
+    assert membership_cache.get((user_id, band["id"])) == "member"
+    
+    response = client.delete(f"/api/v1/bands/{band['id']}/members/{member_id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert membership_cache.get((user_id, band["id"])) is None
+    
+    response = client.get(f"/api/v1/bands/{band['id']}", headers=member_headers)
+    assert response.status_code == 403
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+
+def add_payment(client, headers, show_id, member_name, amount):
+    response = client.post(f"/api/v1/shows/{show_id}/payments/", json={
+        "member_name": member_name, "amount": amount
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def earnings(client, headers, band_id):
+    """{member_name: {month: (total_amount, payment_count)}} from the ledger endpoint"""
+    response = client.get(f"/api/v1/shows/band/{band_id}/earnings", headers=headers)
+    assert response.status_code == 200, response.text
+    return {
+        member["member_name"]: {
+            month["month"]: (Decimal(month["total_amount"]), month["payment_count"]) for month in member["months"]
+        }
+        for member in response.json()["members"]
+    }
+
+
+def test_ledger_books_the_stored_amount(client, auth_headers, band, create_show):
+    show = create_show("2024-01-15", payment="500.00")
+    payments = [add_payment(client, auth_headers, show["id"], "Ann", "10.005") for _ in range(2)]
+    
+    # Each payment is stored as 10.01, so the ledger must total 20.02 rather than round 20.010
+    assert [payment["amount"] for payment in payments] == ["10.01", "10.01"]
+    assert earnings(client, auth_headers, band["id"]) == {"Ann": {"2024-01-01": (Decimal("20.02"), 2)}}
+
+
+def test_moving_a_show_rebooks_its_payments_in_one_upsert_per_month(client, auth_headers, band, create_show,
+                                                                    statement_counter):
+    show = create_show("2024-01-15", payment="500.00")
+    for member_name, amount in (("Ann", "100.00"), ("Ann", "25.50"), ("Bo", "80.00"), ("Cy", "60.00")):
+        add_payment(client, auth_headers, show["id"], member_name, amount)
+    
+    statement_counter["statements"].clear()
+    response = client.put(f"/api/v1/shows/{show['id']}", json={"show_date": "2024-03-02"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    
+    # Out of January and into March: two upserts whatever the number of members
+    upserts = [statement for statement in statement_counter["statements"]
+               if statement.lstrip().upper().startswith("INSERT INTO MEMBER_EARNINGS")]
+    assert len(upserts) == 2
+    
+    assert earnings(client, auth_headers, band["id"]) == {
+        "Ann": {"2024-03-01": (Decimal("125.50"), 2)},
+        "Bo": {"2024-03-01": (Decimal("80.00"), 1)},
+        "Cy": {"2024-03-01": (Decimal("60.00"), 1)},
+    }
@@ -0,0 +1,69 @@
+from app.database import SessionLocal
+from app.models.band import Band
+from tests.conftest import png_bytes
+
+
+def data_version(band_id):
+    with SessionLocal() as session:
+        return session.query(Band.data_version).filter(Band.id == band_id).scalar()
+
+
+def version_bumps(statement_counter):
+    return [statement for statement in statement_counter["statements"]
+            if statement.lstrip().upper().startswith("UPDATE BANDS SET DATA_VERSION")]
+
+
+def test_band_read_returns_304_for_a_matching_etag(client, auth_headers, band):
+    response = client.get(f"/api/v1/bands/{band['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+    
+    response = client.get(f"/api/v1/bands/{band['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_a_write_bumps_data_version_once_per_unit_of_work(client, auth_headers, band, create_setlist,
+                                                          create_song, statement_counter):
+    setlist_ids = [create_setlist(name)["id"] for name in ("Opening", "Encore")]
+    etag = client.get(f"/api/v1/bands/{band['id']}", headers=auth_headers).headers["etag"]
+    before = data_version(band["id"])
+    
+    # One song and two setlist rows, flushed in steps, in one unit of work
+    statement_counter["statements"].clear()
+    create_song("New Song", setlist_ids=setlist_ids)
+    assert len(version_bumps(statement_counter)) == 1
+    assert data_version(band["id"]) == before + 1
+    
+    response = client.get(f"/api/v1/bands/{band['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_a_failed_write_does_not_bump_data_version(client, auth_headers, band, create_setlist, create_song):
+    setlist = create_setlist()
+    song = create_song(setlist_ids=[setlist["id"]])
+    before = data_version(band["id"])
+    
+    response = client.post(f"/api/v1/songs/{song['id']}/setlists/{setlist['id']}", headers=auth_headers)
+    assert response.status_code == 400
+    assert data_version(band["id"]) == before
+
+
+def test_content_addressed_uploads_are_cached_forever(client, auth_headers, band):
+    response = client.post(
+        f"/api/v1/bands/{band['id']}/logo",
+        files={"file": ("logo.png", png_bytes(), "image/png")},
+        headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    logo = response.json()["logo_url"]
+    
+    response = client.get(logo)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    
+    response = client.delete(f"/api/v1/bands/{band['id']}/logo", headers=auth_headers)
+    assert response.status_code == 200, response.text
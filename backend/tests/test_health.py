@@ -0,0 +1,56 @@
+import asyncio
+from app.services import health
+from app.services.health import begin_draining, lifecycle
+
+
+def fail_ping():
+    raise ConnectionError("could not connect to server")
+
+
+async def fail_ping_async():
+    fail_ping()
+
+
+def test_ready_once_started(client):
+    response = client.get("/health/ready")
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "ready"
+
+
+def test_not_ready_while_starting(client, monkeypatch):
+    monkeypatch.setattr(lifecycle, "started", False)
+    
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["startup"] == {"ok": False, "error": "Starting up"}
+
+
+def test_not_ready_when_the_database_fails(client, monkeypatch):
+    monkeypatch.setattr(health, "_pending_ping", None)
+    monkeypatch.setattr(health, "_ping_sync", fail_ping)
+    monkeypatch.setattr(health, "_ping_async", fail_ping_async)
+    
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    database = response.json()["checks"]["database"]
+    assert database == {"ok": False, "error": "ConnectionError: could not connect to server"}
+
+
+def test_sigterm_fails_readiness_before_stopping(client):
+    stopped = []
+    
+    async def receive_sigterm():
+        begin_draining(0.01, lambda: stopped.append("stop"))
+        # Readiness fails straight away; the server is only stopped after the drain window
+        assert lifecycle.draining and not stopped
+        await asyncio.sleep(0.05)
+    
+    asyncio.run(receive_sigterm())
+    assert stopped == ["stop"]
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["startup"] == {"ok": False, "error": "Shutting down"}
+    
+    # A second SIGTERM stops at once
+    begin_draining(60, lambda: stopped.append("stop now"))
+    assert stopped == ["stop", "stop now"]
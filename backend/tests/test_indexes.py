@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import event, text
+from app.repositories.band_member import BandMemberRepository
+from app.repositories.master_setlist import MasterSetlistRepository
+from app.repositories.setlist_song import SetlistSongRepository
+from app.repositories.show import ShowRepository
+from app.repositories.show_payment import ShowPaymentRepository
+from app.repositories.song import SongRepository
+
+# Index added by 0002_hot_path_indexes -> the repository query it was made for
+INDEXED_QUERIES = [
+    ("ix_songs_band_id_title", lambda session: SongRepository(session).get_band_songs(1, limit=50)),
+    ("ix_shows_band_id_show_date", lambda session: ShowRepository(session).get_band_shows(1, limit=50)),
+    ("ix_show_payments_show_id_created_at", lambda session: ShowPaymentRepository(session).get_show_payments(1, limit=50)),
+    ("ix_master_setlists_band_id_is_active_name", lambda session: MasterSetlistRepository(session).get_band_setlists(1)),
+    ("ix_setlist_songs_setlist_id_position", lambda session: SetlistSongRepository(session).get_setlist_songs(1)),
+    ("ix_setlist_songs_song_id", lambda session: SetlistSongRepository(session).get_setlists_for_song(1)),
+    ("ix_band_members_user_id_band_id", lambda session: BandMemberRepository(session).get_active_role(1, 1)),
+]
+
+
+def plan_index_names(plan: dict) -> set:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= plan_index_names(child)
+    return names
+
+
+def explain_index_names(session, run_query) -> set:
+    """Indexes in the Postgres plans of every statement run_query issues"""
+    connection = session.connection()
+    # Test tables are tiny, where a sequential scan always wins; only ask whether the index applies
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+    
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        run_query(session)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    
+    names = set()
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        names |= plan_index_names(plan[0]["Plan"])
+    return names
+
+
+@pytest.mark.parametrize("index_name, run_query", INDEXED_QUERIES, ids=[name for name, _ in INDEXED_QUERIES])
+def test_hot_path_query_uses_its_index(postgres_session, index_name, run_query):
+    assert index_name in explain_index_names(postgres_session, run_query)
@@ -0,0 +1,42 @@
+from app.database import SessionLocal
+from app.models.media_object import MediaObject
+from app.services.media import MediaService, collect_media_garbage
+from app.services.upload import path_for_url
+from tests.conftest import png_bytes
+
+
+def ref_count(url):
+    with SessionLocal() as session:
+        return session.query(MediaObject.ref_count).filter(MediaObject.url == url).scalar()
+
+
+def test_shared_upload_is_deleted_once_the_last_reference_goes(client, auth_headers, band, monkeypatch):
+    # The orphan sweep would also look at media this test did not create
+    monkeypatch.setattr(MediaService, "_sweep_orphans", lambda self, cutoff_ts: 0)
+    other = client.post("/api/v1/bands/", json={"name": "Other Band"}, headers=auth_headers).json()
+    image = png_bytes((17, 9))
+    
+    urls = []
+    for band_id in (band["id"], other["id"]):
+        response = client.post(f"/api/v1/bands/{band_id}/logo", files={"file": ("logo.png", image, "image/png")},
+                               headers=auth_headers)
+        assert response.status_code == 200, response.text
+        urls.append(response.json()["logo_url"])
+    
+    # Same content, one file, two references
+    assert urls[0] == urls[1]
+    url, path = urls[0], path_for_url(urls[0])
+    assert ref_count(url) == 2
+    
+    assert client.delete(f"/api/v1/bands/{band['id']}/logo", headers=auth_headers).status_code == 200
+    assert ref_count(url) == 1
+    collect_media_garbage(grace_seconds=0)
+    assert path.exists()
+    
+    assert client.delete(f"/api/v1/bands/{other['id']}/logo", headers=auth_headers).status_code == 200
+    assert ref_count(url) == 0
+    assert path.exists()  # Kept until the collector runs
+    
+    assert collect_media_garbage(grace_seconds=0) >= 1
+    assert not path.exists()
+    assert ref_count(url) is None
@@ -0,0 +1,47 @@
+def test_song_list_is_cached_until_the_next_write(client, auth_headers, band, create_song):
+    create_song(title="Alpha")
+    path = f"/api/v1/songs/band/{band['id']}"
+    
+    first = client.get(path, headers=auth_headers)
+    assert first.status_code == 200, first.text
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    
+    second = client.get(path, headers=auth_headers)
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.content == first.content
+    
+    # Any write to the band moves its data_version, and with it the cache key
+    create_song(title="Bravo")
+    third = client.get(path, headers=auth_headers)
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.headers["ETag"] != first.headers["ETag"]
+    assert [song["title"] for song in third.json()["items"]] == ["Alpha", "Bravo"]
+
+
+def test_setlist_list_answers_a_matching_etag_with_304(client, auth_headers, band, create_setlist):
+    create_setlist(name="Main")
+    path = f"/api/v1/setlists/band/{band['id']}"
+    
+    etag = client.get(path, headers=auth_headers).headers["ETag"]
+    response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    
+    create_setlist(name="Encore")
+    response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert {setlist["name"] for setlist in response.json()} == {"Main", "Encore"}
+
+
+def test_each_query_gets_its_own_etag(client, auth_headers, band, create_song):
+    create_song(title="Alpha", lyrics="la la")
+    path = f"/api/v1/songs/band/{band['id']}"
+    
+    summary = client.get(path, headers=auth_headers)
+    full = client.get(path, params={"view": "full"}, headers=auth_headers)
+    assert summary.headers["ETag"] != full.headers["ETag"]
+    assert full.headers["X-Cache"] == "MISS"
+    assert full.json()["items"][0]["lyrics"] == "la la"
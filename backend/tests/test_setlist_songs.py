@@ -0,0 +1,98 @@
+from app.database import SessionLocal
+from app.models.band import Band
+
+
+def band_version(band_id):
+    with SessionLocal() as session:
+        return session.query(Band.data_version).filter(Band.id == band_id).scalar()
+
+
+def test_adding_a_song_to_a_setlist_twice_is_a_400(client, auth_headers, create_setlist, create_song):
+    setlist = create_setlist()
+    song = create_song()
+    
+    response = client.post(f"/api/v1/songs/{song['id']}/setlists/{setlist['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    
+    # Rejected by the unique (setlist_id, song_id) constraint, not a read-then-insert check
+    response = client.post(f"/api/v1/songs/{song['id']}/setlists/{setlist['id']}", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Song is already in this setlist"
+    
+    # The failed insert rolled back cleanly: the song is still listed once
+    response = client.get(f"/api/v1/setlists/{setlist['id']}/songs", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [entry["id"] for entry in response.json()["songs"]] == [song["id"]]
+
+
+def test_moving_a_song_from_a_stale_version_is_a_409(client, auth_headers, create_setlist, create_song):
+    setlist = create_setlist()
+    songs = [create_song(title=f"Song {number}") for number in range(3)]
+    for song in songs:
+        response = client.post(f"/api/v1/songs/{song['id']}/setlists/{setlist['id']}", headers=auth_headers)
+        assert response.status_code == 200, response.text
+    version = client.get(f"/api/v1/setlists/{setlist['id']}/songs", headers=auth_headers).json()["version"]
+    
+    response = client.put(f"/api/v1/setlists/{setlist['id']}/songs/move", headers=auth_headers,
+                          json={"song_id": songs[2]["id"], "position": 0, "version": version})
+    assert response.status_code == 200, response.text
+    moved = response.json()
+    assert [entry["id"] for entry in moved["songs"]] == [songs[2]["id"], songs[0]["id"], songs[1]["id"]]
+    assert moved["version"] > version
+    
+    # A second client still holding the old version is turned away and nothing moves
+    response = client.put(f"/api/v1/setlists/{setlist['id']}/songs/move", headers=auth_headers,
+                          json={"song_id": songs[0]["id"], "position": 2, "version": version})
+    assert response.status_code == 409
+    response = client.get(f"/api/v1/setlists/{setlist['id']}/songs", headers=auth_headers)
+    assert [entry["id"] for entry in response.json()["songs"]] == [entry["id"] for entry in moved["songs"]]
+    assert response.json()["version"] == moved["version"]
+
+
+def test_reorder_with_the_wrong_songs_is_a_400_and_writes_nothing(client, auth_headers, create_setlist, create_song):
+    setlist = create_setlist()
+    songs = [create_song(title=f"Song {number}") for number in range(3)]
+    for song in songs:
+        response = client.post(f"/api/v1/songs/{song['id']}/setlists/{setlist['id']}", headers=auth_headers)
+        assert response.status_code == 200, response.text
+    before = client.get(f"/api/v1/setlists/{setlist['id']}/songs", headers=auth_headers).json()
+    ids = [entry["id"] for entry in before["songs"]]
+    outsider = create_song(title="Not in the setlist")
+    
+    for song_ids in ([ids[2], ids[1], outsider["id"]],  # Unknown id
+                     [ids[2], ids[1]],  # Missing id
+                     [ids[2], ids[1], ids[1], ids[0]]):  # Duplicate
+        response = client.put(f"/api/v1/setlists/{setlist['id']}/order", headers=auth_headers,
+                              json={"song_ids": song_ids, "version": before["version"]})
+        assert response.status_code == 400, song_ids
+    
+    after = client.get(f"/api/v1/setlists/{setlist['id']}/songs", headers=auth_headers).json()
+    assert [entry["id"] for entry in after["songs"]] == ids
+    assert after["version"] == before["version"]
+    
+    response = client.put(f"/api/v1/setlists/{setlist['id']}/order", headers=auth_headers,
+                          json={"song_ids": ids[::-1], "version": before["version"]})
+    assert response.status_code == 200, response.text
+    assert [entry["id"] for entry in response.json()["songs"]] == ids[::-1]
+
+
+def test_song_setlist_update_with_unknown_ids_is_a_400_and_writes_nothing(client, auth_headers, band,
+                                                                         create_setlist, create_song):
+    opening, encore, closing = (create_setlist(name)["id"] for name in ("Opening", "Encore", "Closing"))
+    other = client.post("/api/v1/bands/", json={"name": "Other Band"}, headers=auth_headers).json()
+    foreign = create_setlist("Theirs", band_id=other["id"])["id"]
+    song = create_song(setlist_ids=[opening, encore])
+    version = band_version(band["id"])
+    
+    for setlist_ids in ([closing, foreign], [closing, 999999]):
+        response = client.put(f"/api/v1/songs/{song['id']}/setlists", json=setlist_ids, headers=auth_headers)
+        assert response.status_code == 400, setlist_ids
+    
+    # Neither the valid half of the request nor a version bump went through
+    response = client.get(f"/api/v1/songs/{song['id']}", headers=auth_headers)
+    assert {setlist["id"] for setlist in response.json()["setlists"]} == {opening, encore}
+    assert band_version(band["id"]) == version
+    
+    response = client.put(f"/api/v1/songs/{song['id']}/setlists", json=[encore, closing], headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert {setlist["id"] for setlist in response.json()["setlists"]} == {encore, closing}
@@ -0,0 +1,54 @@
+from sqlalchemy import update
+from app.database import SessionLocal
+from app.models.show import Show
+
+
+def stored_members(show_id):
+    with SessionLocal() as session:
+        return session.query(Show.show_members).filter(Show.id == show_id).scalar()
+
+
+def test_show_members_are_stored_as_a_native_list(client, auth_headers, create_show):
+    show = create_show(show_members=["Ann", "Bo"])
+    assert show["show_members"] == ["Ann", "Bo"]
+    # A JSON array in the column, not a JSON-encoded string inside it
+    assert stored_members(show["id"]) == ["Ann", "Bo"]
+    
+    response = client.put(f"/api/v1/shows/{show['id']}", json={"show_members": ["Cy"]}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["show_members"] == ["Cy"]
+    assert stored_members(show["id"]) == ["Cy"]
+
+
+def test_legacy_text_show_members_still_read_as_a_list(client, auth_headers, create_show):
+    show = create_show()
+    with SessionLocal() as session:
+        session.execute(update(Show).where(Show.id == show["id"]).values(show_members='["Ann", "Bo"]'))
+        session.commit()
+    
+    response = client.get(f"/api/v1/shows/{show['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["show_members"] == ["Ann", "Bo"]
+
+
+def test_member_filter_returns_only_the_shows_they_played(client, auth_headers, band, create_show):
+    played = [create_show("2024-03-01", show_members=["Ann", "Bo"]), create_show("2024-02-01", show_members=["Ann"])]
+    create_show("2024-01-01", show_members=["Bo"])
+    create_show("2023-12-01")
+    # Another band's show with the same member stays out
+    other = client.post("/api/v1/bands/", json={"name": "Other Band"}, headers=auth_headers).json()
+    create_show("2024-04-01", band_id=other["id"], show_members=["Ann"])
+    
+    response = client.get(f"/api/v1/shows/band/{band['id']}", params={"member": "Ann"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [show["id"] for show in response.json()["items"]] == [show["id"] for show in played]
+    
+    # Exact names only, and the filter pages like the unfiltered list
+    response = client.get(f"/api/v1/shows/band/{band['id']}", params={"member": "An"}, headers=auth_headers)
+    assert response.json()["items"] == []
+    response = client.get(f"/api/v1/shows/band/{band['id']}", params={"member": "Ann", "limit": 1}, headers=auth_headers)
+    page = response.json()
+    assert [show["id"] for show in page["items"]] == [played[0]["id"]]
+    params = {"member": "Ann", "limit": 1, "cursor": page["next_cursor"]}
+    response = client.get(f"/api/v1/shows/band/{band['id']}", params=params, headers=auth_headers)
+    assert [show["id"] for show in response.json()["items"]] == [played[1]["id"]]
@@ -0,0 +1,57 @@
+CSV = (
+    "title,genre,setlists\n"
+    "First Song,rock,Main\n"
+    ",jazz,\n"
+    "Second Song,folk,\n"
+    "Lost Song,pop,Nope\n"
+)
+
+
+def import_csv(client, headers, band_id, data, dry_run=False):
+    return client.post(
+        f"/api/v1/songs/band/{band_id}/import",
+        params={"dry_run": str(dry_run).lower()},
+        files={"file": ("songs.csv", data.encode(), "text/csv")},
+        headers=headers
+    )
+
+
+def band_titles(client, headers, band_id):
+    response = client.get(f"/api/v1/songs/band/{band_id}", headers=headers)
+    assert response.status_code == 200, response.text
+    return sorted(song["title"] for song in response.json()["items"])
+
+
+def test_dry_run_validates_without_writing(client, auth_headers, band, create_setlist):
+    create_setlist("Main")
+    
+    response = import_csv(client, auth_headers, band["id"], CSV, dry_run=True)
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["created"], result["dry_run"]) == (2, True)
+    assert [(error["row"], error["title"]) for error in result["errors"]] == [(2, None), (4, "Lost Song")]
+    
+    assert band_titles(client, auth_headers, band["id"]) == []
+
+
+def test_import_creates_songs_and_setlist_memberships(client, auth_headers, band, create_setlist):
+    setlist = create_setlist("Main")
+    
+    response = import_csv(client, auth_headers, band["id"], CSV)
+    assert response.status_code == 200, response.text
+    assert (response.json()["created"], len(response.json()["errors"])) == (2, 2)
+    
+    assert band_titles(client, auth_headers, band["id"]) == ["First Song", "Second Song"]
+    response = client.get(f"/api/v1/setlists/{setlist['id']}/songs", headers=auth_headers)
+    assert [song["title"] for song in response.json()["songs"]] == ["First Song"]
+
+
+def test_unreadable_file_is_a_400(client, auth_headers, band):
+    response = client.post(
+        f"/api/v1/songs/band/{band['id']}/import",
+        files={"file": ("songs.json", b'[{"title": "A"}, oops]', "application/json")},
+        headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Could not read the file:")
+    assert band_titles(client, auth_headers, band["id"]) == []
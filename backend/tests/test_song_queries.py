@@ -0,0 +1,70 @@
+import pytest
+
+
+def add_songs(create_song, setlist_ids, count, start=0):
+    for number in range(start, start + count):
+        create_song(f"Song {number:03d}", lyrics="la la la",
+                    setlist_ids=setlist_ids if number % 2 else setlist_ids[:1])
+
+
+def count_song_list_statements(client, headers, band_id, statement_counter, view):
+    statement_counter["count"] = 0
+    response = client.get(f"/api/v1/songs/band/{band_id}", params={"view": view}, headers=headers)
+    assert response.status_code == 200, response.text
+    return statement_counter["count"], response.json()["items"]
+
+
+@pytest.mark.parametrize("view", ["summary", "full"])
+def test_band_song_list_statement_count_does_not_grow_with_songs(client, auth_headers, band, create_setlist,
+                                                                 create_song, statement_counter, view):
+    setlist_ids = [create_setlist(name)["id"] for name in ("Opening", "Encore")]
+    
+    add_songs(create_song, setlist_ids, 1)
+    one_song, items = count_song_list_statements(client, auth_headers, band["id"], statement_counter, view)
+    assert len(items) == 1
+    assert [setlist["id"] for setlist in items[0]["setlists"]] == setlist_ids[:1]
+    
+    add_songs(create_song, setlist_ids, 49, start=1)
+    fifty_songs, items = count_song_list_statements(client, auth_headers, band["id"], statement_counter, view)
+    assert len(items) == 50
+    assert all(item["setlists"] for item in items)
+    
+    assert fifty_songs == one_song
+
+
+def test_cursor_pages_through_every_song_once(client, auth_headers, band, create_song):
+    titles = [f"Song {number}" for number in range(5)]
+    for title in titles:
+        create_song(title)
+    
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get(f"/api/v1/songs/band/{band['id']}", params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen.append([song["title"] for song in page["items"]])
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+        if len(seen) == 1:
+            # Keyset paging: a song sorting before the cursor does not shift later pages
+            create_song("A new first song")
+    
+    assert seen == [titles[0:2], titles[2:4], titles[4:]]
+
+
+def test_summary_view_does_not_select_the_text_bodies(client, auth_headers, band, create_song, statement_counter):
+    create_song("Alpha", lyrics="la la la", chord_structure="C G", description="slow")
+    
+    statement_counter["statements"].clear()
+    response = client.get(f"/api/v1/songs/band/{band['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    song = response.json()["items"][0]
+    assert "lyrics" not in song and "chord_structure" not in song and "description" not in song
+    
+    song_selects = [s for s in statement_counter["statements"] if s.lstrip().startswith("SELECT") and "FROM songs" in s]
+    assert song_selects
+    for statement in song_selects:
+        assert "songs.lyrics" not in statement
+        assert "songs.chord_structure" not in statement
+        assert "songs.description" not in statement
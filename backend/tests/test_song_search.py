@@ -0,0 +1,34 @@
+def search(client, headers, band_id, q, **params):
+    response = client.get(f"/api/v1/songs/band/{band_id}/search", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_ranks_matches_and_highlights_the_snippet(client, auth_headers, band, create_song):
+    create_song("Yellow Submarine", lyrics="In the town where I was born lived a man who sailed to sea")
+    create_song("Hey Jude", lyrics="na na na", description="the submarine cover")
+    
+    results = search(client, auth_headers, band["id"], "submarine")
+    assert [result["title"] for result in results] == ["Yellow Submarine", "Hey Jude"]
+    
+    cover = results[1]
+    assert cover["snippet_field"] == "description"
+    start, end = cover["highlights"][0]
+    assert cover["snippet"][start:end] == "submarine"
+
+
+def test_index_follows_edits_and_deletes(client, auth_headers, band, create_song):
+    song = create_song("Octopus", lyrics="under the sea")
+    other = create_song("Garden", lyrics="in the shade")
+    assert [result["id"] for result in search(client, auth_headers, band["id"], "sea")] == [song["id"]]
+    
+    response = client.put(f"/api/v1/songs/{other['id']}", json={"lyrics": "by the sea"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    response = client.delete(f"/api/v1/songs/{song['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    
+    # Deleting is a soft delete: the song stays indexed but is now inactive
+    results = search(client, auth_headers, band["id"], "sea")
+    assert {result["id"]: result["is_active"] for result in results} == {song["id"]: False, other["id"]: True}
+    results = search(client, auth_headers, band["id"], "sea", is_active="true")
+    assert [(result["id"], result["snippet"]) for result in results] == [(other["id"], "by the sea")]
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from app.api.deps import query_budget
+from app.config import settings
+from app.utils.sql_metrics import QueryBudgetExceeded, SqlInstrumentationMiddleware, recent_requests
+
+
+@pytest.fixture
+def budget_client(app):
+    """An app whose /selects/{n} runs n statements under a budget of 2"""
+    from app.database import engine
+    budgeted = FastAPI()
+    budgeted.add_middleware(SqlInstrumentationMiddleware)
+    
+    @budgeted.get("/selects/{count}", dependencies=[Depends(query_budget(2))])
+    def run_selects(count: int):
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("SELECT 1"))
+        return {"ran": count}
+    
+    with TestClient(budgeted) as client:
+        yield client
+
+
+def test_request_over_its_query_budget_raises(budget_client):
+    response = budget_client.get("/selects/2")
+    assert response.status_code == 200
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    
+    with pytest.raises(QueryBudgetExceeded, match="ran 3 statements, budget 2"):
+        budget_client.get("/selects/3")
+
+
+def test_overrun_is_only_logged_outside_raise_mode(budget_client, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET_MODE", "log")
+    
+    response = budget_client.get("/selects/3")
+    assert response.status_code == 200
+    summary = recent_requests[-1]
+    assert (summary["path"], summary["queries"], summary["budget"]) == ("/selects/3", 3, 2)
@@ -0,0 +1,58 @@
+import pytest
+from PIL import Image
+from app.config import settings
+from app.services.upload import MEDIA_DIR, TEMP_SUFFIX, media_uploads
+from tests.conftest import png_bytes
+
+
+def upload_logo(client, headers, band_id, data):
+    return client.post(
+        f"/api/v1/bands/{band_id}/logo", files={"file": ("logo.png", data, "image/png")}, headers=headers
+    )
+
+
+def test_upload_over_the_size_limit_is_a_413(client, auth_headers, band, monkeypatch):
+    monkeypatch.setattr(media_uploads, "max_bytes", 1024)
+    # A valid PNG header followed by padding: rejected while streaming, before the whole body is read
+    response = upload_logo(client, auth_headers, band["id"], png_bytes() + b"\x00" * 200_000)
+    assert response.status_code == 413
+    assert list(MEDIA_DIR.glob(f"*{TEMP_SUFFIX}")) == []
+    assert client.get(f"/api/v1/bands/{band['id']}", headers=auth_headers).json()["logo"] is None
+
+
+def test_non_image_upload_is_a_400_whatever_its_declared_type(client, auth_headers, band):
+    response = upload_logo(client, auth_headers, band["id"], b"<html><script>alert(1)</script></html>")
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("File type not allowed")
+    assert list(MEDIA_DIR.glob(f"*{TEMP_SUFFIX}")) == []
+
+
+def test_image_over_the_pixel_limit_is_a_400(client, auth_headers, band):
+    # 20000 x 20000 is 400 megapixels in about 50 KB, past Pillow's own bomb check too
+    response = upload_logo(client, auth_headers, band["id"], png_bytes((20000, 20000)))
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Image too large")
+
+
+def test_pixel_limit_comes_from_settings(client, auth_headers, band, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_MAX_PIXELS", 100)
+    response = upload_logo(client, auth_headers, band["id"], png_bytes((11, 10)))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image too large. Maximum is 0.0001 megapixels"
+
+
+def test_image_with_a_broken_header_is_a_400(client, auth_headers, band):
+    response = upload_logo(client, auth_headers, band["id"], b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Could not read the image"
+
+
+def test_variant_render_refuses_an_oversized_original(tmp_path, monkeypatch):
+    from app.services.image import render_derivatives
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", Image.MAX_IMAGE_PIXELS)
+    monkeypatch.setattr(settings, "IMAGE_MAX_PIXELS", 100)
+    source = tmp_path / "original.png"
+    source.write_bytes(png_bytes((11, 10)))
+    
+    with pytest.raises(Image.DecompressionBombError):
+        render_derivatives(str(source), "0" * 64, ["thumb"])
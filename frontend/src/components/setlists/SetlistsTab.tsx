@@ -26,7 +26,7 @@ import { useBand } from '../../contexts/BandContext';
 import { masterSetlistService } from '../../services/masterSetlistService';
 import { songService } from '../../services/songService';
 import { MasterSetlist, MasterSetlistWithSongs, SongBrief } from '../../types/masterSetlist';
-import { SongWithSetlists } from '../../types/song';
+import { SongSummaryWithSetlists } from '../../types/song';
 
 const { Title, Text } = Typography;
 const { TextArea } = Input;
@@ -52,7 +52,7 @@ const SetlistsTab: React.FC = () => {
 
   // Add song to setlist state
   const [isAddSongModalVisible, setIsAddSongModalVisible] = useState(false);
-  const [availableSongs, setAvailableSongs] = useState<SongWithSetlists[]>([]);
+  const [availableSongs, setAvailableSongs] = useState<SongSummaryWithSetlists[]>([]);
   const [selectedSongId, setSelectedSongId] = useState<number | null>(null);
   const [addingSong, setAddingSong] = useState(false);
 
@@ -96,7 +96,7 @@ const SetlistsTab: React.FC = () => {
     if (!currentBand) return;
 
     try {
-      const data = await songService.getBandSongs(currentBand.id);
+      const data = await songService.getAllBandSongs(currentBand.id);
       setAvailableSongs(data);
     } catch (error: any) {
       console.error('Failed to fetch songs:', error);
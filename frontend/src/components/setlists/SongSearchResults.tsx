@@ -0,0 +1,68 @@
+import React from 'react';
+import { List, Tag, Typography, Empty } from 'antd';
+import { SongSearchResult } from '../../types/song';
+
+const { Text } = Typography;
+
+const FIELD_LABELS: Record<string, string> = {
+  lyrics: 'Lyrics',
+  description: 'Description',
+  chord_structure: 'Chords',
+};
+
+interface SongSearchResultsProps {
+  results: SongSearchResult[];
+  loading: boolean;
+  onSelect: (songId: number) => void;
+}
+
+// Render a snippet as plain text with the matched words wrapped in <mark>
+const renderSnippet = (snippet: string, highlights: [number, number][]) => {
+  const parts: React.ReactNode[] = [];
+  let cursor = 0;
+  highlights.forEach(([start, end], index) => {
+    if (start > cursor) parts.push(snippet.slice(cursor, start));
+    parts.push(<mark key={index}>{snippet.slice(start, end)}</mark>);
+    cursor = end;
+  });
+  if (cursor < snippet.length) parts.push(snippet.slice(cursor));
+  return parts;
+};
+
+const SongSearchResults: React.FC<SongSearchResultsProps> = ({ results, loading, onSelect }) => {
+  return (
+    <List
+      loading={loading}
+      dataSource={results}
+      locale={{ emptyText: <Empty description="No matching songs" image={Empty.PRESENTED_IMAGE_SIMPLE} /> }}
+      renderItem={(result) => (
+        <List.Item
+          key={result.id}
+          onClick={() => onSelect(result.id)}
+          style={{ cursor: 'pointer' }}
+        >
+          <List.Item.Meta
+            title={
+              <span>
+                {result.title}
+                {result.genre && <Tag color="blue" style={{ marginLeft: 8 }}>{result.genre}</Tag>}
+                {result.scale && <Tag color="purple">{result.scale}</Tag>}
+                {!result.is_active && <Tag>Inactive</Tag>}
+              </span>
+            }
+            description={
+              result.snippet && (
+                <Text type="secondary">
+                  {result.snippet_field && <Text strong>{FIELD_LABELS[result.snippet_field]}: </Text>}
+                  {renderSnippet(result.snippet, result.highlights)}
+                </Text>
+              )
+            }
+          />
+        </List.Item>
+      )}
+    />
+  );
+};
+
+export default SongSearchResults;
@@ -10,17 +10,34 @@ import {
   Select,
   message,
   Spin,
-  Switch
+  Switch,
+  Upload,
+  Dropdown
 } from 'antd';
-import { PlusOutlined, EditOutlined, DeleteOutlined, EyeOutlined } from '@ant-design/icons';
+import {
+  PlusOutlined,
+  EditOutlined,
+  DeleteOutlined,
+  EyeOutlined,
+  UploadOutlined,
+  DownloadOutlined
+} from '@ant-design/icons';
 import { AgGridReact } from 'ag-grid-react';
 import { ColDef, ICellRendererParams } from 'ag-grid-community';
 import { useBand } from '../../contexts/BandContext';
 import { songService } from '../../services/songService';
 import { masterSetlistService } from '../../services/masterSetlistService';
-import { SongWithSetlists, SongCreate, SongUpdate } from '../../types/song';
+import {
+  SongWithSetlists,
+  SongSummaryWithSetlists,
+  SongCreate,
+  SongUpdate,
+  SongSearchResult,
+  SongFileFormat
+} from '../../types/song';
 import { MasterSetlist } from '../../types/masterSetlist';
 import SongDetailDrawer from './SongDetailDrawer';
+import SongSearchResults from './SongSearchResults';
 
 const { Title } = Typography;
 const { TextArea } = Input;
@@ -30,8 +47,19 @@ const SongsTab: React.FC = () => {
   const gridRef = useRef<AgGridReact>(null);
 
   // Songs state
-  const [songs, setSongs] = useState<SongWithSetlists[]>([]);
+  const [songs, setSongs] = useState<SongSummaryWithSetlists[]>([]);
   const [loading, setLoading] = useState(false);
+  const fetchGeneration = useRef(0);
+
+  // Server-side search state
+  const [searchText, setSearchText] = useState('');
+  const [searchResults, setSearchResults] = useState<SongSearchResult[]>([]);
+  const [searching, setSearching] = useState(false);
+  const [catalogVersion, setCatalogVersion] = useState(0);
+
+  // Bulk import/export state
+  const [importing, setImporting] = useState(false);
+  const [exporting, setExporting] = useState(false);
 
   // Setlists for selection
   const [setlists, setSetlists] = useState<MasterSetlist[]>([]);
@@ -57,10 +85,23 @@ const SongsTab: React.FC = () => {
   const fetchSongs = async () => {
     if (!currentBand) return;
 
+    const bandId = currentBand.id;
+    const generation = ++fetchGeneration.current;
+    setCatalogVersion(generation);
+
     setLoading(true);
     try {
-      const data = await songService.getBandSongs(currentBand.id);
-      setSongs(data);
+      // Show the first page right away, then stream the rest of the catalog into the grid
+      let page = await songService.getBandSongs(bandId);
+      setSongs(page.items);
+      setLoading(false);
+
+      while (page.next_cursor && generation === fetchGeneration.current) {
+        page = await songService.getBandSongs(bandId, { cursor: page.next_cursor });
+        if (generation !== fetchGeneration.current) break;
+        const items = page.items;
+        setSongs((prev) => [...prev, ...items]);
+      }
     } catch (error: any) {
       message.error(error.response?.data?.detail || 'Failed to fetch songs');
     } finally {
@@ -87,7 +128,15 @@ const SongsTab: React.FC = () => {
     setIsModalVisible(true);
   };
 
-  const showEditModal = (song: SongWithSetlists) => {
+  const showEditModal = async (summary: SongSummaryWithSetlists) => {
+    let song: SongWithSetlists;
+    try {
+      // List rows carry no lyrics or chords; load the full song before editing
+      song = await songService.getSong(summary.id);
+    } catch (error: any) {
+      message.error(error.response?.data?.detail || 'Failed to load song');
+      return;
+    }
     setEditingSong(song);
     form.setFieldsValue({
       title: song.title,
@@ -164,7 +213,7 @@ const SongsTab: React.FC = () => {
     }
   };
 
-  const handleToggleActive = async (song: SongWithSetlists) => {
+  const handleToggleActive = async (song: SongSummaryWithSetlists) => {
     try {
       await songService.toggleSongActive(song.id);
       message.success(`Song ${song.is_active ? 'deactivated' : 'activated'} successfully!`);
@@ -174,10 +223,67 @@ const SongsTab: React.FC = () => {
     }
   };
 
+  // Import / export handlers
+  const handleImport = async (file: File) => {
+    if (!currentBand) return;
+
+    setImporting(true);
+    try {
+      const result = await songService.importSongs(currentBand.id, file);
+      if (result.created) {
+        message.success(`Imported ${result.created} song${result.created === 1 ? '' : 's'}`);
+        await fetchSongs();
+        await fetchSetlists();
+      }
+      if (result.errors.length) {
+        Modal.warning({
+          title: `${result.errors.length} record${result.errors.length === 1 ? ' was' : 's were'} not imported`,
+          width: 600,
+          content: (
+            <ul style={{ maxHeight: 300, overflowY: 'auto', paddingLeft: 20 }}>
+              {result.errors.map((error) => (
+                <li key={error.row}>
+                  Row {error.row}{error.title ? ` (${error.title})` : ''}: {error.detail}
+                </li>
+              ))}
+            </ul>
+          ),
+        });
+      }
+    } catch (error: any) {
+      message.error(error.response?.data?.detail || 'Failed to import songs');
+    } finally {
+      setImporting(false);
+    }
+  };
+
+  const handleExport = async (format: SongFileFormat) => {
+    if (!currentBand) return;
+
+    setExporting(true);
+    try {
+      const blob = await songService.exportSongs(currentBand.id, format);
+      const url = URL.createObjectURL(blob);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `${currentBand.name}-songs.${format === 'chordpro' ? 'cho' : format}`;
+      link.click();
+      URL.revokeObjectURL(url);
+    } catch (error: any) {
+      message.error('Failed to export songs');
+    } finally {
+      setExporting(false);
+    }
+  };
+
   // Drawer handlers
-  const openDrawer = (song: SongWithSetlists) => {
-    setSelectedSong(song);
-    setIsDrawerVisible(true);
+  const openDrawer = async (songId: number) => {
+    try {
+      setSelectedSong(await songService.getSong(songId));
+      setIsDrawerVisible(true);
+    } catch (error: any) {
+      message.error(error.response?.data?.detail || 'Failed to load song');
+    }
   };
 
   const closeDrawer = () => {
@@ -187,19 +293,46 @@ const SongsTab: React.FC = () => {
 
   // Search handler
   const onSearchChange = useCallback((e: React.ChangeEvent<HTMLInputElement>) => {
-    gridRef.current?.api?.setGridOption('quickFilterText', e.target.value);
+    setSearchText(e.target.value);
   }, []);
 
+  // Debounced server-side search over titles, lyrics, descriptions and chords
+  useEffect(() => {
+    const query = searchText.trim();
+    if (!currentBand || !query) {
+      setSearchResults([]);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      setSearching(true);
+      try {
+        const results = await songService.searchSongs(currentBand.id, query);
+        if (!cancelled) setSearchResults(results);
+      } catch (error: any) {
+        if (!cancelled) message.error(error.response?.data?.detail || 'Search failed');
+      } finally {
+        if (!cancelled) setSearching(false);
+      }
+    }, 300);
+
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchText, currentBand?.id, catalogVersion]);
+
   // Cell renderers
-  const TitleRenderer = (params: ICellRendererParams<SongWithSetlists>) => {
+  const TitleRenderer = (params: ICellRendererParams<SongSummaryWithSetlists>) => {
     return (
-      <Button type="link" onClick={() => openDrawer(params.data!)} style={{ padding: 0 }}>
+      <Button type="link" onClick={() => openDrawer(params.data!.id)} style={{ padding: 0 }}>
         {params.value}
       </Button>
     );
   };
 
-  const SetlistsRenderer = (params: ICellRendererParams<SongWithSetlists>) => {
+  const SetlistsRenderer = (params: ICellRendererParams<SongSummaryWithSetlists>) => {
     const song = params.data!;
     return (
       <>
@@ -216,7 +349,7 @@ const SongsTab: React.FC = () => {
     );
   };
 
-  const ActiveRenderer = (params: ICellRendererParams<SongWithSetlists>) => {
+  const ActiveRenderer = (params: ICellRendererParams<SongSummaryWithSetlists>) => {
     const song = params.data!;
     return (
       <Switch
@@ -228,14 +361,14 @@ const SongsTab: React.FC = () => {
     );
   };
 
-  const ActionsRenderer = (params: ICellRendererParams<SongWithSetlists>) => {
+  const ActionsRenderer = (params: ICellRendererParams<SongSummaryWithSetlists>) => {
     const song = params.data!;
     return (
       <Space>
         <Button
           type="text"
           icon={<EyeOutlined />}
-          onClick={() => openDrawer(song)}
+          onClick={() => openDrawer(song.id)}
         />
         <Button
           type="text"
@@ -261,7 +394,7 @@ const SongsTab: React.FC = () => {
   };
 
   // Column definitions
-  const columnDefs: ColDef<SongWithSetlists>[] = [
+  const columnDefs: ColDef<SongSummaryWithSetlists>[] = [
     {
       field: 'title',
       headerName: 'Title',
@@ -330,25 +463,59 @@ const SongsTab: React.FC = () => {
             onChange={onSearchChange}
             style={{ width: 250 }}
           />
+          <Upload
+            accept=".csv,.json,.jsonl,.ndjson,.cho,.chopro,.chordpro,.crd,.pro"
+            showUploadList={false}
+            beforeUpload={(file) => {
+              handleImport(file);
+              return false;
+            }}
+          >
+            <Button icon={<UploadOutlined />} loading={importing}>
+              Import
+            </Button>
+          </Upload>
+          <Dropdown
+            menu={{
+              items: [
+                { key: 'csv', label: 'CSV' },
+                { key: 'json', label: 'JSON' },
+                { key: 'chordpro', label: 'ChordPro' },
+              ],
+              onClick: ({ key }) => handleExport(key as SongFileFormat),
+            }}
+          >
+            <Button icon={<DownloadOutlined />} loading={exporting}>
+              Export
+            </Button>
+          </Dropdown>
           <Button type="primary" icon={<PlusOutlined />} onClick={showCreateModal}>
             Add Song
           </Button>
         </Space>
       </div>
 
-      <div className="ag-theme-quartz" style={{ height: 600, width: '100%' }}>
-        <AgGridReact
-          ref={gridRef}
-          rowData={songs}
-          columnDefs={columnDefs}
-          defaultColDef={defaultColDef}
-          pagination={true}
-          paginationPageSize={10}
-          domLayout="normal"
-          animateRows={true}
-          rowSelection="single"
+      {searchText.trim() ? (
+        <SongSearchResults
+          results={searchResults}
+          loading={searching}
+          onSelect={openDrawer}
         />
-      </div>
+      ) : (
+        <div className="ag-theme-quartz" style={{ height: 600, width: '100%' }}>
+          <AgGridReact
+            ref={gridRef}
+            rowData={songs}
+            columnDefs={columnDefs}
+            defaultColDef={defaultColDef}
+            pagination={true}
+            paginationPageSize={10}
+            domLayout="normal"
+            animateRows={true}
+            rowSelection="single"
+          />
+        </div>
+      )}
 
       {/* Create/Edit Modal */}
       <Modal
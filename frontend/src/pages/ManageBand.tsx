@@ -8,6 +8,7 @@ import { bandMemberService } from '../services/bandMemberService';
 import { BandMember, BandMemberCreate, BandMemberUpdate } from '../types/bandMember';
 import dayjs from 'dayjs';
 import type { UploadFile } from 'antd';
+import { imageUrl } from '../utils/media';
 
 const { Title, Text, Paragraph } = Typography;
 const { TextArea } = Input;
@@ -195,7 +196,7 @@ if (values.established_date) {
     maxCount: 1,
   };
 
-  const logoUrl = currentBand.logo ? `http://localhost:8000${currentBand.logo}` : null;
+  const logoUrl = imageUrl(currentBand.logo, 'card');
 
   // Member handlers
   const showMemberModal = (member?: BandMember) => {
@@ -482,7 +483,7 @@ if (values.established_date) {
                     <Avatar 
                       size={48} 
                       icon={<UserOutlined />}
-                      src={member.profile_picture ? `http://localhost:8000${member.profile_picture}` : undefined}
+                      src={imageUrl(member.profile_picture, 'thumb')}
                       style={{ backgroundColor: member.is_admin ? '#faad14' : '#1890ff' }}
                     />
                   }
@@ -8,6 +8,7 @@ import { Show, ShowCreate, ShowUpdate, ShowStatus, ShowPayment, ShowPaymentCreat
 import { BandMember } from '../types/bandMember';
 import dayjs from 'dayjs';
 import type { UploadFile } from 'antd';
+import { imageUrl } from '../utils/media';
 
 const { Title, Text } = Typography;
 const { TextArea } = Input;
@@ -25,6 +26,8 @@ const Shows: React.FC = () => {
   // Shows state
   const [shows, setShows] = useState<Show[]>([]);
   const [loading, setLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   
   // Modal state for create/edit
   const [isModalVisible, setIsModalVisible] = useState(false);
@@ -69,8 +72,9 @@ const Shows: React.FC = () => {
     
     setLoading(true);
     try {
-      const data = await showService.getBandShows(currentBand.id);
-      setShows(data);
+      const page = await showService.getBandShows(currentBand.id);
+      setShows(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error: any) {
       message.error(error.response?.data?.detail || 'Failed to fetch shows');
     } finally {
@@ -78,6 +82,21 @@ const Shows: React.FC = () => {
     }
   };
 
+  const fetchMoreShows = async () => {
+    if (!currentBand || !nextCursor) return;
+
+    setLoadingMore(true);
+    try {
+      const page = await showService.getBandShows(currentBand.id, { cursor: nextCursor });
+      setShows((prev) => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error: any) {
+      message.error(error.response?.data?.detail || 'Failed to fetch shows');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchBandMembers = async () => {
     if (!currentBand) return;
     
@@ -95,7 +114,7 @@ const Shows: React.FC = () => {
   const fetchShowPayments = async (showId: number) => {
     setPaymentsLoading(true);
     try {
-      const data = await showService.getShowPayments(showId);
+      const data = await showService.getAllShowPayments(showId);
       setPayments(data);
     } catch (error: any) {
       message.error(error.response?.data?.detail || 'Failed to fetch payments');
@@ -224,7 +243,7 @@ const Shows: React.FC = () => {
       
       // Fetch payments for display
       if (showData.status === ShowStatus.COMPLETE_PAYMENT_RECEIVED) {
-        const paymentsData = await showService.getShowPayments(show.id);
+        const paymentsData = await showService.getAllShowPayments(show.id);
         setPayments(paymentsData);
       } else {
         setPayments([]);
@@ -387,7 +406,7 @@ const Shows: React.FC = () => {
                     <div style={{ height: 160, overflow: 'hidden' }}>
                       <img
                         alt={show.venue}
-                        src={`http://localhost:8000${show.poster}`}
+                        src={imageUrl(show.poster, 'card')}
                         style={{ width: '100%', height: '100%', objectFit: 'cover' }}
                       />
                     </div>
@@ -434,6 +453,14 @@ const Shows: React.FC = () => {
         </Row>
       )}
 
+      {!loading && nextCursor && (
+        <div style={{ textAlign: 'center', marginTop: 24 }}>
+          <Button onClick={fetchMoreShows} loading={loadingMore}>
+            Load more shows
+          </Button>
+        </div>
+      )}
+
       {/* Create/Edit Modal */}
       <Modal
         title={editingShow ? 'Edit Show' : 'Create New Show'}
@@ -740,7 +767,7 @@ const Shows: React.FC = () => {
             {selectedShow.poster && (
               <div style={{ marginBottom: 24 }}>
                 <img
-                  src={`http://localhost:8000${selectedShow.poster}`}
+                  src={imageUrl(selectedShow.poster, 'large')}
                   alt={selectedShow.venue}
                   style={{ width: '100%', borderRadius: 8 }}
                 />
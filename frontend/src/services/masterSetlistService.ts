@@ -3,7 +3,8 @@ import {
   MasterSetlist,
   MasterSetlistCreate,
   MasterSetlistUpdate,
-  MasterSetlistWithSongs
+  MasterSetlistWithSongs,
+  SetlistSongReorder
 } from '../types/masterSetlist';
 
 export const masterSetlistService = {
@@ -32,6 +33,22 @@ export const masterSetlistService = {
     return response.data;
   },
 
+  // Rejected with 409 when the setlist changed since `version`; reload and retry
+  async reorderSetlist(setlistId: number, data: SetlistSongReorder): Promise<MasterSetlistWithSongs> {
+    const response = await api.put<MasterSetlistWithSongs>(`/api/v1/setlists/${setlistId}/order`, data);
+    return response.data;
+  },
+
+  // Rejected with 409 when the setlist changed since `version`; reload and retry
+  async moveSetlistSong(setlistId: number, songId: number, position: number, version: number): Promise<MasterSetlistWithSongs> {
+    const response = await api.put<MasterSetlistWithSongs>(`/api/v1/setlists/${setlistId}/songs/move`, {
+      song_id: songId,
+      position,
+      version,
+    });
+    return response.data;
+  },
+
   async deleteSetlist(setlistId: number): Promise<void> {
     await api.delete(`/api/v1/setlists/${setlistId}`);
   },
@@ -6,8 +6,21 @@ import {
   ShowPayment, 
   ShowPaymentCreate, 
   ShowPaymentUpdate,
-  PaymentSummary 
+  PaymentSummary,
+  ShowStatus
 } from '../types/show';
+import { Page, PageParams } from '../types/pagination';
+import { fetchAllPages } from '../utils/pagination';
+
+export interface ShowListParams extends PageParams {
+  start?: string;
+  end?: string;
+  status?: ShowStatus;
+  member?: string;
+}
+
+// Upper bound the server accepts for ?limit=
+const MAX_PAGE_SIZE = 200;
 
 export const showService = {
   // Show CRUD
@@ -16,8 +29,8 @@ export const showService = {
     return response.data;
   },
 
-  async getBandShows(bandId: number): Promise<Show[]> {
-    const response = await api.get<Show[]>(`/api/v1/shows/band/${bandId}`);
+  async getBandShows(bandId: number, params: ShowListParams = {}): Promise<Page<Show>> {
+    const response = await api.get<Page<Show>>(`/api/v1/shows/band/${bandId}`, { params });
     return response.data;
   },
 
@@ -53,11 +66,15 @@ export const showService = {
   },
 
   // Show Payments
-  async getShowPayments(showId: number): Promise<ShowPayment[]> {
-    const response = await api.get<ShowPayment[]>(`/api/v1/shows/${showId}/payments/`);
+  async getShowPayments(showId: number, params: PageParams = {}): Promise<Page<ShowPayment>> {
+    const response = await api.get<Page<ShowPayment>>(`/api/v1/shows/${showId}/payments/`, { params });
     return response.data;
   },
 
+  async getAllShowPayments(showId: number): Promise<ShowPayment[]> {
+    return fetchAllPages((cursor) => this.getShowPayments(showId, { cursor, limit: MAX_PAGE_SIZE }));
+  },
+
   async getPaymentSummary(showId: number): Promise<PaymentSummary> {
     const response = await api.get<PaymentSummary>(`/api/v1/shows/${showId}/payments/summary`);
     return response.data;
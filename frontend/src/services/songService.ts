@@ -3,8 +3,23 @@ import {
   Song,
   SongCreate,
   SongUpdate,
-  SongWithSetlists
+  SongWithSetlists,
+  SongSummaryWithSetlists,
+  SongSearchResult,
+  SongFileFormat,
+  SongImportResult
 } from '../types/song';
+import { Page, PageParams } from '../types/pagination';
+import { fetchAllPages } from '../utils/pagination';
+
+export interface SongListParams extends PageParams {
+  genre?: string;
+  scale?: string;
+  is_active?: boolean;
+}
+
+// Upper bound the server accepts for ?limit=
+const MAX_PAGE_SIZE = 200;
 
 export const songService = {
   async createSong(data: SongCreate): Promise<SongWithSetlists> {
@@ -12,8 +27,42 @@ export const songService = {
     return response.data;
   },
 
-  async getBandSongs(bandId: number): Promise<SongWithSetlists[]> {
-    const response = await api.get<SongWithSetlists[]>(`/api/v1/songs/band/${bandId}`);
+  // List rows are summaries; use getSong for lyrics and chords
+  async getBandSongs(bandId: number, params: SongListParams = {}): Promise<Page<SongSummaryWithSetlists>> {
+    const response = await api.get<Page<SongSummaryWithSetlists>>(`/api/v1/songs/band/${bandId}`, { params });
+    return response.data;
+  },
+
+  async getAllBandSongs(bandId: number, params: SongListParams = {}): Promise<SongSummaryWithSetlists[]> {
+    return fetchAllPages((cursor) => this.getBandSongs(bandId, { ...params, cursor, limit: MAX_PAGE_SIZE }));
+  },
+
+  async searchSongs(bandId: number, q: string, limit?: number): Promise<SongSearchResult[]> {
+    const response = await api.get<SongSearchResult[]>(`/api/v1/songs/band/${bandId}/search`, {
+      params: { q, limit },
+    });
+    return response.data;
+  },
+
+  // Format comes from the file extension unless given
+  async importSongs(bandId: number, file: File, options: { format?: SongFileFormat; dryRun?: boolean } = {}): Promise<SongImportResult> {
+    const formData = new FormData();
+    formData.append('file', file);
+
+    const response = await api.post<SongImportResult>(`/api/v1/songs/band/${bandId}/import`, formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+      params: { format: options.format, dry_run: options.dryRun },
+    });
+    return response.data;
+  },
+
+  async exportSongs(bandId: number, format: SongFileFormat = 'csv'): Promise<Blob> {
+    const response = await api.get<Blob>(`/api/v1/songs/band/${bandId}/export`, {
+      params: { format },
+      responseType: 'blob',
+    });
     return response.data;
   },
 
@@ -31,8 +80,9 @@ export const songService = {
     await api.delete(`/api/v1/songs/${songId}`);
   },
 
-  async addSongToSetlist(songId: number, setlistId: number): Promise<void> {
-    await api.post(`/api/v1/songs/${songId}/setlists/${setlistId}`);
+  // position: 0-based slot in the setlist; omitted appends to the end
+  async addSongToSetlist(songId: number, setlistId: number, position?: number): Promise<void> {
+    await api.post(`/api/v1/songs/${songId}/setlists/${setlistId}`, null, { params: { position } });
   },
 
   async removeSongFromSetlist(songId: number, setlistId: number): Promise<void> {
@@ -10,14 +10,12 @@ export interface Band {
 
 export interface BandCreate {
   name: string;
-  logo?: string | null;
   established_date?: string | null;
   description?: string | null;
 }
 
 export interface BandUpdate {
   name?: string;
-  logo?: string | null;
   established_date?: string | null;
   description?: string | null;
 }
\ No newline at end of file
@@ -4,6 +4,7 @@ export interface MasterSetlist {
   name: string;
   description?: string | null;
   is_active: boolean;
+  version: number;  // Bumped when songs are added, removed or reordered
   created_at: string;
   updated_at: string;
   song_count?: number;
@@ -25,9 +26,14 @@ export interface SongBrief {
   title: string;
   scale?: string | null;
   genre?: string | null;
-  position?: number;
+  position?: number;  // 0-based slot in the setlist
 }
 
 export interface MasterSetlistWithSongs extends MasterSetlist {
   songs: SongBrief[];
+}
+
+export interface SetlistSongReorder {
+  song_ids: number[];  // Every song in the setlist, in the new order
+  version: number;     // Version of the setlist the order was based on
 }
\ No newline at end of file
@@ -0,0 +1,9 @@
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export interface PageParams {
+  limit?: number;
+  cursor?: string | null;
+}
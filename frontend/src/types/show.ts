@@ -34,7 +34,6 @@ export interface ShowCreate {
   band_fund_amount?: number | null;
   piece_count?: number | null;
   status?: ShowStatus;
-  poster?: string | null;
   description?: string | null;
 }
 
@@ -48,7 +47,6 @@ export interface ShowUpdate {
   band_fund_amount?: number | null;
   piece_count?: number | null;
   status?: ShowStatus;
-  poster?: string | null;
   description?: string | null;
 }
 
@@ -44,4 +44,37 @@ export interface SetlistBrief {
 
 export interface SongWithSetlists extends Song {
   setlists: SetlistBrief[];
-}
\ No newline at end of file
+}
+
+// Catalog list row: no lyrics, chords or description (fetch the full song with getSong)
+export type SongSummary = Omit<Song, 'description' | 'lyrics' | 'chord_structure' | 'lyrics_with_chords'>;
+
+export interface SongSummaryWithSetlists extends SongSummary {
+  setlists: SetlistBrief[];
+}
+
+export interface SongSearchResult {
+  id: number;
+  title: string;
+  genre?: string | null;
+  scale?: string | null;
+  is_active: boolean;
+  score: number;
+  snippet_field?: 'lyrics' | 'description' | 'chord_structure' | null;
+  snippet: string;
+  highlights: [number, number][];  // [start, end) offsets of matched words within snippet
+}
+
+export type SongFileFormat = 'csv' | 'json' | 'chordpro';
+
+export interface SongImportError {
+  row: number;  // 1-based record number in the file (CSV: data row after the header)
+  title?: string | null;
+  detail: string;
+}
+
+export interface SongImportResult {
+  created: number;
+  dry_run: boolean;
+  errors: SongImportError[];
+}
@@ -0,0 +1,20 @@
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+export type ImageVariant = 'thumb' | 'card' | 'large';
+
+// Content-addressed uploads look like /uploads/media/ab/<sha256>.<ext>
+const MEDIA_URL_PATTERN = /^\/uploads\/media\/[0-9a-f]{2}\/([0-9a-f]{64})\.\w+$/;
+
+/**
+ * Absolute URL for an uploaded image, resized to the given variant when the
+ * server can serve one (older uploads fall back to the original file).
+ */
+export const imageUrl = (path: string | null | undefined, variant?: ImageVariant): string | undefined => {
+  if (!path) return undefined;
+
+  const match = variant ? path.match(MEDIA_URL_PATTERN) : null;
+  if (match) {
+    return `${API_BASE_URL}/api/v1/media/${variant}/${match[1]}.webp`;
+  }
+  return `${API_BASE_URL}${path}`;
+};
@@ -0,0 +1,17 @@
+import { Page } from '../types/pagination';
+
+/**
+ * Follow next_cursor until the last page, for callers that need the whole list.
+ */
+export const fetchAllPages = async <T>(
+  fetchPage: (cursor: string | null) => Promise<Page<T>>
+): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await fetchPage(cursor);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+};